@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+from Corrector.Models.Subtitle import *
+from Corrector.Utils.FileUtils import ENCODING_SAMPLE_SIZE, FALLBACK_ENCODING, detect_encoding, read_text_file
+import codecs                                               # UTF-8 BOM
+import mmap                                                 # file bytes without a read copy
+
+
+HEADER_LINES_DATA_PATTERN = rb"\d+\r?\n(\d{2}):(\d{2}):(\d{2}),(\d{3}) --> (\d{2}):(\d{2}):(\d{2}),(\d{3})(?=\r?\n|\Z)"
+# Found from the line feed ahead of them, not consumed by the previous header : faster than from a line start
+HEADER_DATA_REGEX = re.compile(rb"\n" + HEADER_LINES_DATA_PATTERN)
+HEADER_LINES_DATA_REGEX = re.compile(HEADER_LINES_DATA_PATTERN)
+LINE_END_DATA = os.linesep.encode()
+LONE_CARRIAGE_RETURN_DATA_REGEX = re.compile(rb"\r(?!\n)")
+OTHER_LINE_END_DATA_REGEX = re.compile(rb"\r(?!\n)|" + (rb"\r\n" if LINE_END_DATA == b"\n" else rb"(?<!\r)\n"))
+
+
+class MappedSubtitle(Subtitle):
+    """
+    A Subtitle parsed from a memory-mapped UTF-8 file, keeping the file bytes of its block.
+    An untouched subtitle saves these bytes as they are, without encoding its lines again.
+    """
+
+    __slots__ = ("source", "source_header", "source_lines")
+
+    # region Static methods
+
+    @staticmethod
+    def subtitles_from_file(path):
+        """Parses a subtitles file as subtitles_from_stream would. UTF-8 files are memory-mapped :
+        subtitle blocks are found in the bytes, then each block is decoded on its own.
+        Other encodings, and old Mac line endings, are streamed.
+        The encoding is only guessed from the first mapped bytes : files with invalid UTF-8 further are streamed in
+        cp1252.
+
+        :param path: string, the subtitles file path
+        :return: list of Subtitle, MappedSubtitle for memory-mapped files
+        """
+        def read_stream(text_file):
+            return list(Subtitle.subtitles_from_stream(text_file))
+
+        with open(path, 'rb') as srt_file:
+            if os.fstat(srt_file.fileno()).st_size == 0:
+                return []
+
+            with mmap.mmap(srt_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                encoding = detect_encoding(data[:ENCODING_SAMPLE_SIZE])
+                if encoding == 'utf-8-sig':
+                    try:
+                        subtitles = MappedSubtitle.subtitles_from_data(data)
+                        if subtitles is not None:
+                            return subtitles
+                    except UnicodeDecodeError:
+                        encoding = FALLBACK_ENCODING
+
+        return read_text_file(path, read_stream, encoding)
+
+    @staticmethod
+    def subtitles_from_data(data):
+        """Parses the bytes of a UTF-8 subtitles file, with or without BOM.
+
+        :param data: bytes or mmap
+        :return: list of MappedSubtitle, or None for old Mac line endings, to be streamed
+        """
+        has_lone_carriage_return, same_line_ends = MappedSubtitle.get_line_ends(data)
+        if has_lone_carriage_return:
+            return None
+
+        bom_size = len(codecs.BOM_UTF8) if data[:len(codecs.BOM_UTF8)] == codecs.BOM_UTF8 else 0
+        headers = HEADER_DATA_REGEX.finditer(data)
+        header = HEADER_LINES_DATA_REGEX.match(data, bom_size)
+        start = bom_size
+
+        if header is None:
+            header = next(headers, None)
+            start = header.start() + 1 if header else len(data)
+
+        if start > 0 and "ÿþ" in data[:start].decode('utf-8-sig'):
+            raise ValueError("Unsupported encoding")
+
+        # Blocks are built as headers are found, without keeping every match alive
+        subtitles = []
+        for next_header in headers:
+            end = next_header.start() + 1
+            subtitles.append(MappedSubtitle(data[start:end], header, same_line_ends))
+            header, start = next_header, end
+
+        if header is not None:
+            subtitles.append(MappedSubtitle(data[start:], header, same_line_ends))
+
+        return subtitles
+
+    @staticmethod
+    def get_line_ends(data):
+        """Line endings of the given bytes, found in a single scan.
+
+        :param data: bytes or mmap
+        :return: tuple of bool, True if there is a lone \\r, and True if there are only system line endings
+        """
+        match = OTHER_LINE_END_DATA_REGEX.search(data)
+        if match is None:
+            return False, True
+
+        if match.group() == b"\r":
+            return True, False
+
+        # The scan goes on from the first other line ending, for a lone \r only
+        return LONE_CARRIAGE_RETURN_DATA_REGEX.search(data, match.end()) is not None, False
+
+    # endregion Static methods
+
+    def __init__(self, source, header, same_line_ends):
+        """
+        :param source: bytes, the subtitle block, from its number to the next subtitle number
+        :param header: the HEADER_LINES_DATA_PATTERN match of its number and time code lines
+        :param same_line_ends: bool, True if the file only has system line endings
+        """
+        text = source.decode('utf-8')
+        rows = (text if same_line_ends and LINE_END_DATA == b"\n" else text.replace("\r\n", "\n")).split("\n")
+        lines = [row + "\n" for row in rows[2:-1] if row]
+        if rows[-1] and len(rows) > 2:
+            lines.append(rows[-1])
+
+        # As milliseconds_from_match, the values are checked below
+        values = list(map(int, header.groups()))
+        self.number = rows[0] + "\n"
+        self.start = ((values[0] * 60 + values[1]) * 60 + values[2]) * 1000 + values[3]
+        self.end = ((values[4] * 60 + values[5]) * 60 + values[6]) * 1000 + values[7]
+        self.lines = lines
+
+        # Saved as read : a single empty line, at the end, and no minutes or seconds above 59
+        is_canonical = same_line_ends and source.find(LINE_END_DATA * 2) == len(source) - 2 * len(LINE_END_DATA) and \
+            max(values[1], values[2], values[5], values[6]) < 60
+
+        self.source = source if is_canonical else None
+        self.source_header = (self.number, self.start, self.end)
+        self.source_lines = lines[:]
+
+    def is_untouched(self):
+        """True if the subtitle can be saved as the file bytes it was parsed from.
+
+        :return: boolean
+        """
+        return self.source is not None and (self.number, self.start, self.end) == self.source_header and \
+            self.lines == self.source_lines
+
+    def to_data(self):
+        if self.is_untouched():
+            return self.source
+
+        return super().to_data()
@@ -18,6 +18,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from Corrector.Utils.StringsUtils import *
+import bisect
+
+
+INDEX_REGEX = re.compile(r"^\d+$")
+TIME_CODE_REGEX = re.compile(r"^(\d{2}):(\d{2}):(\d{2}),(\d{3}) --> (\d{2}):(\d{2}):(\d{2}),(\d{3})$")
+EMPTY_LINE_REGEX = re.compile(r"^$")
 
 
 class Subtitle:
@@ -25,6 +31,8 @@ class Subtitle:
     Mainly an array of strings, with a time code
     """
 
+    __slots__ = ("number", "start", "end", "lines")
+
     # region Static methods
 
     @staticmethod
@@ -38,7 +46,7 @@ class Subtitle:
         if not lines or index >= len(lines):
             return False
 
-        if not re.match(r"^\d+$", lines[index]):
+        if not INDEX_REGEX.match(lines[index]):
             return False
 
         return Subtitle.is_time_code(lines[index + 1])
@@ -50,7 +58,7 @@ class Subtitle:
         :param text: string, the string to test.
         :return: boolean
         """
-        return re.match(r"^\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}$", text)
+        return TIME_CODE_REGEX.match(text)
 
     @staticmethod
     def is_text_line(lines, index):
@@ -73,40 +81,142 @@ class Subtitle:
 
     @staticmethod
     def subtitles_from_lines(lines):
-        subtitles = []
-        index = 0
+        """Parses every subtitle of the given file strings.
 
-        while index < len(lines):
-            if Subtitle.is_index(lines, index):
+        :param lines: file strings
+        :return: list of Subtitle
+        """
+        return list(Subtitle.subtitles_from_stream(lines))
+
+    @staticmethod
+    def subtitles_from_stream(stream):
+        """Parses subtitles one line at a time, yielding each subtitle as soon as its block ends.
 
-                found_number = lines[index]
-                index += 1
+        :param stream: iterable of strings, as an opened file
+        :return: generator of Subtitle
+        """
+        number, time_code_match, found_lines = None, None, []
+        previous = None
 
-                found_time_code = lines[index]
-                index += 1
+        for line in stream:
+            match = TIME_CODE_REGEX.match(line) if previous is not None and INDEX_REGEX.match(previous) else None
 
-                found_lines = []
-                while index < len(lines) and not Subtitle.is_index(lines, index):
-                    if not re.match(r"^$", lines[index]):
-                        found_lines.append(lines[index])
-                    index += 1
+            if match:
+                if time_code_match:
+                    yield Subtitle(number, Subtitle.milliseconds_from_match(time_code_match), found_lines)
 
-                subtitles.append(Subtitle(found_number, found_time_code, found_lines))
+                number, time_code_match, found_lines = previous, match, []
+                previous = None
             else:
-                if "ÿþ" in lines[index]:
-                    raise ValueError("Unsupported encoding")
+                Subtitle.add_stream_line(previous, time_code_match, found_lines)
+                previous = line
+
+        Subtitle.add_stream_line(previous, time_code_match, found_lines)
+
+        if time_code_match:
+            yield Subtitle(number, Subtitle.milliseconds_from_match(time_code_match), found_lines)
+
+    @staticmethod
+    def add_stream_line(line, time_code_match, found_lines):
+        """Adds a line read by subtitles_from_stream to the current subtitle, if there is one.
+
+        :param line: string, the line to add, or None
+        :param time_code_match: the current subtitle time code match, None before the first subtitle
+        :param found_lines: list of string, the current subtitle lines
+        """
+        if line is None:
+            return
+
+        if time_code_match is None:
+            if "ÿþ" in line:
+                raise ValueError("Unsupported encoding")
+        elif not EMPTY_LINE_REGEX.match(line):
+            found_lines.append(line)
+
+        return
+
+    @staticmethod
+    def milliseconds_from_match(match):
+        """Start and end of a TIME_CODE_REGEX match.
+
+        :param match: the time code match
+        :return: tuple of int, start and end in milliseconds
+        """
+        values = list(map(int, match.groups()))
+        start = ((values[0] * 60 + values[1]) * 60 + values[2]) * 1000 + values[3]
+        end = ((values[4] * 60 + values[5]) * 60 + values[6]) * 1000 + values[7]
+        return start, end
+
+    @staticmethod
+    def time_from_milliseconds(milliseconds):
+        """Formats milliseconds as "00:01:02,003"
+
+        :param milliseconds: int
+        :return: string
+        """
+        seconds, milliseconds = divmod(milliseconds, 1000)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return "%02d:%02d:%02d,%03d" % (hours, minutes, seconds, milliseconds)
+
+    @staticmethod
+    def time_index(subtitles):
+        """Sorted index of the given subtitles, to find the ones displayed at a given time.
+
+        :param subtitles: list of Subtitle
+        :return: tuple (list of starts, list of Subtitle sorted by start, the longest duration)
+        """
+        sorted_subtitles = sorted(subtitles)
+        starts = [subtitle.start for subtitle in sorted_subtitles]
+        longest_duration = max([subtitle.end - subtitle.start for subtitle in sorted_subtitles] + [0])
+        return starts, sorted_subtitles, longest_duration
 
-                index += 1
+    @staticmethod
+    def find_in_time_index(time_index, subtitle, tolerance=None):
+        """Indexed subtitles with the same time code as the given one, or overlapping it.
+
+        :param time_index: tuple, built by time_index
+        :param subtitle: Subtitle, the one to find
+        :param tolerance: int, overlapping tolerance in milliseconds, None to match exact time codes only
+        :return: list of Subtitle
+        """
+        starts, sorted_subtitles, longest_duration = time_index
+        result = []
+
+        if tolerance is None:
+            i = bisect.bisect_left(starts, subtitle.start)
+            while i < len(starts) and starts[i] == subtitle.start:
+                if sorted_subtitles[i].end == subtitle.end:
+                    result.append(sorted_subtitles[i])
+                i += 1
+            return result
 
-        return subtitles
+        i = bisect.bisect_left(starts, subtitle.end + tolerance) - 1
+        while i >= 0 and starts[i] + longest_duration + tolerance > subtitle.start:
+            if sorted_subtitles[i].overlaps(subtitle, tolerance):
+                result.append(sorted_subtitles[i])
+            i -= 1
+
+        return result[::-1]
 
     # endregion Static methods
 
     def __init__(self, number, time_code, lines):
+        """
+        :param number: string, the subtitle number line
+        :param time_code: string "00:01:02,003 --> 00:01:05,000", tuple of int (start, end) in milliseconds, or None
+        :param lines: list of string
+        """
         self.number = number
-        self.time_code = time_code
+        self.start = None
+        self.end = None
         self.lines = lines
 
+        if isinstance(time_code, tuple):
+            self.start, self.end = time_code
+        elif time_code is not None:
+            self.set_time_code(time_code)
+
     # region Setter/getter
 
     def get_number(self):
@@ -116,10 +226,29 @@ class Subtitle:
         self.number = number
 
     def get_time_code(self):
-        return self.time_code
+        if self.start is None:
+            return None
+
+        return Subtitle.time_from_milliseconds(self.start) + " --> " + Subtitle.time_from_milliseconds(self.end) + "\n"
 
     def set_time_code(self, time_code):
-        self.time_code = time_code
+        match = TIME_CODE_REGEX.match(time_code)
+        if not match:
+            raise ValueError("Wrong time code : " + time_code.replace("\n", ""))
+
+        self.start, self.end = Subtitle.milliseconds_from_match(match)
+
+    def get_start(self):
+        return self.start
+
+    def set_start(self, start):
+        self.start = start
+
+    def get_end(self):
+        return self.end
+
+    def set_end(self, end):
+        self.end = end
 
     def get_lines(self):
         return self.lines
@@ -129,15 +258,39 @@ class Subtitle:
 
     # endregion Setter/getter
 
+    def has_same_time_code(self, subtitle):
+        """True if both subtitles start and end at the same time.
+
+        :param subtitle: Subtitle, the one to compare
+        :return: boolean
+        """
+        return self.start == subtitle.start and self.end == subtitle.end
+
+    def overlaps(self, subtitle, tolerance=0):
+        """True if both subtitles are displayed at the same time.
+
+        :param subtitle: Subtitle, the one to compare
+        :param tolerance: int, milliseconds added around both subtitles
+        :return: boolean
+        """
+        return self.start < subtitle.end + tolerance and subtitle.start < self.end + tolerance
+
     def to_lines(self):
-        result = [self.number, self.time_code]
+        result = [self.number, self.get_time_code()]
         result += self.lines
         return result
 
+    def to_data(self):
+        """The subtitle block, as saved by write_file_data : UTF-8, system line endings, and a trailing empty line.
+
+        :return: bytes
+        """
+        return "".join(self.to_lines() + ["\n"]).replace("\n", os.linesep).encode('utf-8')
+
     def pretty_print(self):
         result = force_string_size(self.number.replace("\n", ""), 5)
         result += self.number.replace("\n", "") + " : "
-        result += self.time_code.replace("\n", "") + " "
+        result += self.get_time_code().replace("\n", "") + " "
 
         pretty_printed_array = []
         for line in self.lines:
@@ -145,3 +298,10 @@ class Subtitle:
 
         result += str(pretty_printed_array)
         return result
+
+    # region Inherited methods
+
+    def __lt__(self, other):
+        return (self.start, self.end) < (other.start, other.end)
+
+    # endregion Inherited methods
@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from Corrector.Models.Subtitle import Subtitle
+from array import array
+
+
+class SubtitleTrack:
+    """
+    A whole subtitles file, stored column-wise : numbers, starts and ends in integer arrays,
+    every line in a single text buffer, cut by offsets arrays. Cues are read through SubtitleCue views.
+    """
+
+    __slots__ = ("numbers", "starts", "ends", "text", "line_ends", "cue_line_ends")
+
+    # region Static methods
+
+    @staticmethod
+    def from_subtitles(subtitles):
+        """Packs the given subtitles.
+
+        :param subtitles: iterable of Subtitle, with time codes
+        :return: SubtitleTrack
+        """
+        track = SubtitleTrack()
+        text_parts = []
+        text_size = 0
+
+        for subtitle in subtitles:
+            track.numbers.append(int(subtitle.number))
+            track.starts.append(subtitle.start)
+            track.ends.append(subtitle.end)
+
+            for line in subtitle.lines:
+                text_parts.append(line)
+                text_size += len(line)
+                track.line_ends.append(text_size)
+
+            track.cue_line_ends.append(len(track.line_ends))
+
+        track.text = "".join(text_parts)
+        return track
+
+    @staticmethod
+    def from_stream(stream):
+        """Parses subtitles one line at a time, packing each subtitle as soon as its block ends.
+
+        :param stream: iterable of strings, as an opened file
+        :return: SubtitleTrack
+        """
+        return SubtitleTrack.from_subtitles(Subtitle.subtitles_from_stream(stream))
+
+    # endregion Static methods
+
+    def __init__(self):
+        self.numbers = array('l')
+        self.starts = array('l')
+        self.ends = array('l')
+        self.text = ""
+        self.line_ends = array('l')
+        self.cue_line_ends = array('l')
+
+    def get_lines(self, index):
+        """Lines of a cue, sliced from the text buffer.
+
+        :param index: int, the cue index
+        :return: list of string
+        """
+        first_line = self.cue_line_ends[index - 1] if index > 0 else 0
+        lines = []
+
+        for line_index in range(first_line, self.cue_line_ends[index]):
+            line_start = self.line_ends[line_index - 1] if line_index > 0 else 0
+            lines.append(self.text[line_start:self.line_ends[line_index]])
+
+        return lines
+
+    def to_subtitles(self):
+        """
+        :return: list of Subtitle
+        """
+        return [cue.to_subtitle() for cue in self]
+
+    # region Inherited methods
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.numbers)
+
+        if not 0 <= index < len(self.numbers):
+            raise IndexError("Cue index out of range : " + str(index))
+
+        return SubtitleCue(self, index)
+
+    def __iter__(self):
+        for index in range(0, len(self.numbers)):
+            yield SubtitleCue(self, index)
+
+    # endregion Inherited methods
+
+
+class SubtitleCue:
+    """
+    Read-only view of a SubtitleTrack cue, with the Subtitle getters
+    """
+
+    __slots__ = ("track", "index")
+
+    def __init__(self, track, index):
+        """
+        :param track: SubtitleTrack
+        :param index: int, the cue index
+        """
+        self.track = track
+        self.index = index
+
+    # region Setter/getter
+
+    @property
+    def number(self):
+        return str(self.track.numbers[self.index]) + "\n"
+
+    @property
+    def start(self):
+        return self.track.starts[self.index]
+
+    @property
+    def end(self):
+        return self.track.ends[self.index]
+
+    @property
+    def lines(self):
+        return self.track.get_lines(self.index)
+
+    def get_number(self):
+        return self.number
+
+    def get_time_code(self):
+        return Subtitle.time_from_milliseconds(self.start) + " --> " + Subtitle.time_from_milliseconds(self.end) + "\n"
+
+    def get_start(self):
+        return self.start
+
+    def get_end(self):
+        return self.end
+
+    def get_lines(self):
+        return self.lines
+
+    # endregion Setter/getter
+
+    def to_subtitle(self):
+        """
+        :return: Subtitle, an editable copy
+        """
+        return Subtitle(self.number, (self.start, self.end), self.lines)
+
+    def to_lines(self):
+        return [self.number, self.get_time_code()] + self.lines
+
+    # region Inherited methods
+
+    def __lt__(self, other):
+        return (self.start, self.end) < (other.start, other.end)
+
+    # endregion Inherited methods
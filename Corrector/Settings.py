@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import configparser          # config.ini parsing
+import os                    # config.ini lookup
+
+
+CONFIG_FILE_NAME = "config.ini"
+PROJECT_DIRECTORY = os.path.dirname(os.path.abspath(__file__)) + '/../'
+
+
+class Settings:
+    """config.ini parameters, read on first access, instead of at import.
+    Without an explicit path, config.ini is looked up in the current directory, then in the project directory.
+    Missing files, sections or keys give the default values : the correction engine runs without any config.ini.
+    """
+
+    def __init__(self, path=None):
+        """
+        :param path: string, the config.ini path, or None to look it up
+        """
+        self.path = path
+        self.sections = None
+
+    def load(self):
+        """Reads config.ini, on the first call only.
+
+        :return: dict, section name to dict of string values
+        """
+        if self.sections is None:
+            config = configparser.ConfigParser()
+            config.read(self.get_path(), encoding='utf-8')
+            self.sections = {section: dict(config[section]) for section in config.sections()}
+
+        return self.sections
+
+    def get_path(self):
+        """
+        :return: string, the config.ini path
+        """
+        if self.path is not None:
+            return self.path
+
+        if os.path.isfile(CONFIG_FILE_NAME):
+            return CONFIG_FILE_NAME
+
+        return PROJECT_DIRECTORY + CONFIG_FILE_NAME
+
+    def get(self, key, default="", section="PARAMETERS"):
+        """
+        :param key: string
+        :param default: string, returned for a missing key
+        :param section: string, PARAMETERS or DEPENDENCIES
+        :return: string
+        """
+        return self.load().get(section, {}).get(key, default)
+
+    def get_bool(self, key, default=False, section="PARAMETERS"):
+        """
+        :return: bool, True for a "true" value
+        """
+        return self.get(key, "true" if default else "false", section) == "true"
+
+    def get_int(self, key, default=0, section="PARAMETERS"):
+        """
+        :return: int, the default for a missing or empty value
+        """
+        value = self.get(key, "", section)
+        return int(value) if value else default
@@ -21,17 +21,31 @@ import hashlib               # get MD5 hash of a file
 import shutil                # copy backup files
 import fnmatch               # recursive research in folders
 import os                    # system calls (open directories)
+import sys                   # Python version
 import io                    # file encoding
 import re                    # regex
+import json                  # cache manifests
+import pickle                # StringsMaps snapshot
+import tempfile              # atomic writes
+import codecs                # encoding detection
+
+
+ENCODING_SAMPLE_SIZE = 8192
+FALLBACK_ENCODING = 'cp1252'
 
 
 def clean_space_in_filename(file_path):
     """Rename a file replacing spaces with underscore.
 
     :param file_path: string
+    :return: string, the new file path
     """
     new_path = re.sub(r"(\s)(?=[^/]*$)", r"_", file_path)
-    os.rename(file_path, new_path)
+
+    if new_path != file_path:
+        os.rename(file_path, new_path)
+
+    return new_path
 
 
 def get_file_text(path, mode_lines):
@@ -41,15 +55,77 @@ def get_file_text(path, mode_lines):
     :param mode_lines: bool, mode lines or not
     :return: string
     """
-    srt_file = open(path, 'r', encoding='utf-8-sig')
-    
     if mode_lines:
-        srt_content = srt_file.readlines()
-    else:
-        srt_content = srt_file.read()
+        return read_text_file(path, lambda srt_file: srt_file.readlines())
+
+    return read_text_file(path, lambda srt_file: srt_file.read())
+
+
+def open_file(path, encoding=None):
+    """Opens a file, to be read line by line, in the given encoding, or its detected one.
+
+    :param path: string, the root path.
+    :param encoding: string, or None to detect it
+    :return: file object
+    """
+    encoding = encoding or detect_file_encoding(path)
+    return open(path, 'r', encoding=encoding, errors='replace' if encoding == FALLBACK_ENCODING else 'strict')
 
-    srt_file.close()
-    return srt_content
+
+def read_text_file(path, read, encoding=None):
+    """Reads a file opened in its detected encoding. The encoding is only guessed from the first bytes :
+    a file with undecodable bytes further is read again in cp1252, undecodable bytes replaced.
+
+    :param path: string, the file path.
+    :param read: function, reading the opened file object
+    :param encoding: string, the already detected encoding, or None to detect it
+    :return: the read function result
+    """
+    try:
+        with open_file(path, encoding) as text_file:
+            return read(text_file)
+    except UnicodeDecodeError:
+        with open_file(path, FALLBACK_ENCODING) as text_file:
+            return read(text_file)
+
+
+def detect_file_encoding(path, sample_size=ENCODING_SAMPLE_SIZE):
+    """Guesses a text file encoding from its first bytes : BOM, UTF-16 zero bytes, then UTF-8 validity.
+
+    :param path: string, the file path.
+    :param sample_size: int, the bytes count to check.
+    :return: string, utf-8-sig, utf-16, utf-16-le, utf-16-be or cp1252
+    """
+    with open(path, 'rb') as source:
+        sample = source.read(sample_size)
+
+    return detect_encoding(sample, sample_size)
+
+
+def detect_encoding(sample, sample_size=ENCODING_SAMPLE_SIZE):
+    """Guesses a text encoding from the first bytes of a file, as detect_file_encoding.
+
+    :param sample: bytes, the first sample_size bytes of the file, or all of them for a smaller file.
+    :param sample_size: int, the bytes count read.
+    :return: string, utf-8-sig, utf-16, utf-16-le, utf-16-be or cp1252
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith(codecs.BOM_UTF16_LE) or sample.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16'
+
+    # Mostly ASCII text, without BOM
+    if len(sample) >= 2 and sample[1::2].count(0) > len(sample) // 4:
+        return 'utf-16-le'
+    if len(sample) >= 2 and sample[0::2].count(0) > len(sample) // 4:
+        return 'utf-16-be'
+
+    try:
+        # A multi-bytes char may be cut at the end of the sample
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=len(sample) < sample_size)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
 
 
 def get_bak_file_name(path):
@@ -73,11 +149,48 @@ def get_files_with_type(file_list, file_type):
     for file in fnmatch.filter(file_list, '*.' + file_type):
         srt_list.append(file)
 
-    srt_list = [file for file in srt_list if (file[-17:-4] != "(before STAC)")]
-    srt_list = [file for file in srt_list if (file[-20:-4] != "(Avant SRAH 2.3)")]
+    srt_list = [file for file in srt_list if not is_backup_file(file)]
     return srt_list
 
 
+def is_backup_file(path):
+    """Checks backup file suffixes, from this script or the old SRAH one.
+
+    :param path: string, the file path, with a 3 chars extension.
+    :return: bool
+    """
+    return path[-17:-4] == "(before STAC)" or path[-20:-4] == "(Avant SRAH 2.3)"
+
+
+def walk_files_with_type(root, depth, file_type):
+    """Yields files with the given type (except backups) in the given path, while listing it.
+    Directory entries types are reused, so only symbolic links and unknown types need an extra stat call.
+
+    :param root: string, the root path.
+    :param depth: int, the recursive depth.
+    :param file_type: string, the file_type suffix
+    :return: generator of string
+    """
+    if sys.version_info < (3, 6):
+        # No scandir before Python 3.5, and its iterators can't be closed before Python 3.6
+        yield from get_files_with_type(get_all_files(root, depth), file_type)
+        return
+
+    suffix = os.path.normcase("." + file_type)
+
+    # Closes the directory handle even when the generator isn't consumed until the end
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_file():
+                if os.path.normcase(entry.name).endswith(suffix) and not is_backup_file(entry.path):
+                    yield entry.path
+            elif entry.is_dir() and depth > 0:
+                try:
+                    yield from walk_files_with_type(entry.path, depth - 1, file_type)
+                except PermissionError:
+                    print("Warning : can't open '" + entry.name + "' directory, permission denied")
+
+
 def get_all_files(root, depth):
     """Return all files in the given path
 
@@ -114,19 +227,45 @@ def backup_file(path):
 
 
 def write_file(path, lines):
-    """Save file
+    """Save file, in UTF-8 with BOM and system line endings, unless it already has this exact content.
 
     :param path: string, the target file path.
     :param lines: list of string, file content
-    :return:
+    :return: bool, False if the file was left untouched
     """
-    srt_file = open(path, 'w', encoding='utf-8-sig')
-    
-    for line in lines:
-        srt_file.write(line)
-        
-    srt_file.close()
-    return
+    content = "".join(lines).replace("\n", os.linesep)
+    return write_file_data(path, content.encode('utf-8-sig') if content else b"")
+
+
+def write_file_data(path, data):
+    """Save file bytes, unless it already has this exact content.
+    The content is written and synced to disk in a temporary file first, then moved over the target :
+    an interrupted write or a crash never leaves a truncated file.
+
+    :param path: string, the target file path.
+    :param data: bytes, file content
+    :return: bool, False if the file was left untouched
+    """
+    if os.path.isfile(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as srt_file:
+            if srt_file.read() == data:
+                return False
+
+    file_descriptor, temp_path = tempfile.mkstemp(suffix=".temp", prefix=".", dir=os.path.dirname(path) or ".")
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            temp_file.write(data)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        if os.path.isfile(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return True
 
 
 def get_md5(file):
@@ -144,20 +283,122 @@ def get_md5(file):
     return md5.digest()
 
 
+def load_json_file(path, default):
+    """Reads a JSON file, if any.
+
+    :param path: string, the JSON file path.
+    :param default: value returned for a missing or corrupted file
+    :return: the JSON content
+    """
+    if not os.path.isfile(path):
+        return default
+
+    try:
+        with open(path, 'r', encoding='utf-8') as json_file:
+            return json.load(json_file)
+    except ValueError:
+        print("Warning : ignoring corrupted file '" + path + "'")
+        return default
+
+
+def save_json_file(path, content):
+    """Save JSON file
+
+    :param path: string, the target file path.
+    :param content: JSON serializable value
+    """
+    with open(path, 'w', encoding='utf-8') as json_file:
+        json.dump(content, json_file, indent=1, sort_keys=True)
+
+    return
+
+
+def load_pickle_file(path, default):
+    """Reads a pickle file, if any.
+
+    :param path: string, the pickle file path.
+    :param default: value returned for a missing or corrupted file
+    :return: the unpickled content
+    """
+    if not os.path.isfile(path):
+        return default
+
+    try:
+        with open(path, 'rb') as pickle_file:
+            return pickle.load(pickle_file)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, ValueError):
+        print("Warning : ignoring corrupted file '" + path + "'")
+        return default
+
+
+def save_pickle_file(path, content):
+    """Save pickle file, through a temporary file moved over the target.
+
+    :param path: string, the target file path.
+    :param content: picklable value
+    """
+    file_descriptor, temp_path = tempfile.mkstemp(suffix=".temp", prefix=".", dir=os.path.dirname(path) or ".")
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as temp_file:
+            pickle.dump(content, temp_file, pickle.HIGHEST_PROTOCOL)
+        if os.path.isfile(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    return
+
+
+def read_json_lines_file(path):
+    """Reads a JSON lines file, one value per line, if any.
+
+    :param path: string, the JSONL file path.
+    :return: list
+    """
+    if not os.path.isfile(path):
+        return []
+
+    with open(path, 'r', encoding='utf-8') as json_file:
+        return [json.loads(line) for line in json_file if line.strip()]
+
+
+def append_json_lines_file(path, values):
+    """Appends values at the end of a JSON lines file, one per line.
+
+    :param path: string, the JSONL file path.
+    :param values: list of JSON serializable values
+    """
+    with open(path, 'a', encoding='utf-8') as json_file:
+        for value in values:
+            json_file.write(json.dumps(value, ensure_ascii=False, sort_keys=True) + "\n")
+
+    return
+
+
 def ansi_to_utf8(source_path):
-    """Changes data encoding.
+    """Changes data encoding to UTF-8, from the detected one, chunk by chunk.
+    A file with undecodable bytes past the detection sample is converted again from cp1252, as read_text_file reads it.
+    Bytes undecodable in cp1252 too are replaced by the \uFFFD char, never dropped.
 
     :param: string, the source file path.
-    :param: string, the target file path.
     """
-    temp_file_name = source_path + "_utf8.temp"
+    file_descriptor, temp_path = tempfile.mkstemp(suffix=".temp", prefix=".", dir=os.path.dirname(source_path) or ".")
+    os.close(file_descriptor)
 
-    with io.open(source_path, encoding='cp1252', errors='ignore') as source:
-        with io.open(temp_file_name, mode='w', encoding='utf-8-sig') as target:
+    def copy_to_temp_file(source):
+        with io.open(temp_path, mode='w', encoding='utf-8-sig') as target:
             shutil.copyfileobj(source, target)
 
-    os.remove(source_path)
-    os.rename(temp_file_name, source_path)
+    try:
+        read_text_file(source_path, copy_to_temp_file)
+        shutil.copymode(source_path, temp_path)
+        os.replace(temp_path, source_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
 
     return
 
@@ -17,26 +17,38 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import configparser
 import re
 import csv
-import subprocess
 import os
-from Corrector.Utils.FileUtils import ansi_to_utf8
-
-config = configparser.ConfigParser()
-config.read('config.ini', encoding='utf-8')
-
-conf_ms_word_2010_path = config["DEPENDENCIES"]['ms_word_2010_path']
-conf_libreoffice6_writer_path = config["DEPENDENCIES"]['libreoffice6_writer_path']
-conf_fix_sdh_tags = config["PARAMETERS"]['fix_sdh_tags'] == "true"
-conf_is_unittest_exec = config["PARAMETERS"]['is_unittest_exec'] == "true"
-conf_fix_3d_doubles = config["PARAMETERS"]['fix_3d_doubles'] == "true"
-conf_auto_skip_everything = config["PARAMETERS"]['auto_skip_everything'] == "true"
+import atexit
+import bisect
+import collections
+import hashlib
+import json
+import time
+from Corrector.Utils.FileUtils import ansi_to_utf8, get_md5, load_pickle_file, save_pickle_file
+
+conf_ms_word_2010_path = ""
+conf_libreoffice6_writer_path = ""
+conf_fix_sdh_tags = False
+conf_is_unittest_exec = False
+conf_fix_3d_doubles = False
+conf_auto_skip_everything = False
+conf_profile_fixers = False
+conf_line_cache_size = 0
+conf_queue_decisions = False
+conf_csv_flush_size = 1
+conf_strings_maps_snapshot = False
 
 
 STRINGS_MAPS_DIRECTORY = os.path.dirname(os.path.abspath(__file__)) + '/../../Resources/StringsMaps/'
 LETTERS_MAPS_DIRECTORY = STRINGS_MAPS_DIRECTORY + 'LettersMaps/'
+CACHE_DIRECTORY = os.path.join(os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or
+                               os.path.join(os.path.expanduser('~'), '.cache'), 'sub-titles-auto-correct')
+# One snapshot per StringsMaps directory : several copies of the project never overwrite each other's snapshot
+STRINGS_MAPS_SNAPSHOT_PATH = os.path.join(CACHE_DIRECTORY, 'strings_maps.' + hashlib.md5(
+    os.path.abspath(STRINGS_MAPS_DIRECTORY).encode('utf-8')).hexdigest()[:8] + '.pickle')
+STRINGS_MAPS_SNAPSHOT_VERSION = 1
 # noinspection SpellCheckingInspection
 LOWER_CASE = r"[a-zàâäçéèêëîïôöùûü]"
 # noinspection SpellCheckingInspection
@@ -50,7 +62,31 @@ START_WITH_QUOTES = r"^((?:<i>|-\s*)*)\"(.*?)"
 ENDS_WITH_QUOTES = r"(.*?)\"((?:</i>|\s)*)$"
 SDH_CHARS = r"[\w\s,'()\.!\?\[\]\/-]{2,}"
 ENDS_WITHOUT_ENDING_SENTENCE_REGEX = r".*[a-zA-Z]$"
+MISSPELLS_BLOCK_SIZE = 16
+LETTERS_SPACE_BLOCK_SIZE = 16
+LETTERS_SPACE_FILES = [("_space_upp_plural", True, True), ("_space_upp", True, False), ("_space", False, False),
+                       ("_space_plural", False, True)]
+DIALOG_CHARACTER_REGEX = r"^((?:<i>\s*|\"\s*)*)((?:-(?!\s*-)\s*)?)((?:<i>)?)(" + SDH_CHARS + \
+                         r"(?:(?<!\d):|:(?!\d\d\b))\s*)"
+SDH_START_TAG_REGEX = r"^((?:<i>|\"|\s))*(-?\s*)[\[(][A-ZÉÈÀÙÇÊÂÛÎÏÜ\s'\"-]+[\])] *(.*?)$"
+SDH_END_TAG_REGEX = r"^(.*?)[\[(][A-ZÉÈÀÙÇÊÂÛÎÏÜ\s'\"-]+[\])](\s*$)"
+REGEX_CACHE = {}
+REGEX_CACHE_STATS = {"hits": 0, "misses": 0}
 FILE_CACHE = {}
+MISSPELLS_CACHE = {}
+TRUSTED_WORDS_CACHE = {}
+LETTERS_SPACE_CACHE = {}
+SINGLE_LINE_FIXERS_CACHE = {}
+CAPITAL_I_LEXICON_CACHE = {}
+FIXERS_STATS = {}
+LINE_CACHE = collections.OrderedDict()
+LINE_CACHE_STATS = {"hits": 0, "misses": 0, "bypassed": 0}
+PROMPT_STATS = {"count": 0}
+STRINGS_MAPS_STATE = {"version": 0}
+STRINGS_MAPS_SNAPSHOT_STATE = {"used": False}
+DECISION_CONTEXT = {"file": None, "cue": None, "language": None}
+DECISIONS = []
+CSV_PENDING_ROWS = {}
 
 SHELL_COLOR_HEADER = '\033[95m'
 SHELL_COLOR_OK_BLUE = '\033[94m'
@@ -62,9 +98,64 @@ SHELL_COLOR_BOLD = '\033[1m'
 SHELL_COLOR_UNDERLINE = '\033[4m'
 
 
+# region Settings
+
+
+def apply_settings(settings):
+    """Reads the StringsUtils parameters from config.ini. Until then, every parameter keeps its default value.
+
+    :param settings: Settings
+    """
+    global conf_ms_word_2010_path, conf_libreoffice6_writer_path, conf_fix_sdh_tags, conf_is_unittest_exec, \
+        conf_fix_3d_doubles, conf_auto_skip_everything, conf_profile_fixers, conf_line_cache_size, \
+        conf_queue_decisions, conf_csv_flush_size, conf_strings_maps_snapshot
+
+    conf_ms_word_2010_path = settings.get('ms_word_2010_path', "", "DEPENDENCIES")
+    conf_libreoffice6_writer_path = settings.get('libreoffice6_writer_path', "", "DEPENDENCIES")
+    conf_fix_sdh_tags = settings.get_bool('fix_sdh_tags')
+    conf_is_unittest_exec = settings.get_bool('is_unittest_exec')
+    conf_fix_3d_doubles = settings.get_bool('fix_3d_doubles')
+    conf_auto_skip_everything = settings.get_bool('auto_skip_everything')
+    conf_profile_fixers = settings.get_bool('profile_fixers')
+    conf_line_cache_size = settings.get_int('line_cache_size', 0)
+    conf_queue_decisions = settings.get_bool('queue_decisions')
+    conf_csv_flush_size = settings.get_int('csv_flush_size', 1)
+    conf_strings_maps_snapshot = settings.get_bool('strings_maps_snapshot')
+    return
+
+
+# endregion Settings
+
 # region Utils
 
 
+def get_regex(pattern):
+    """Compiled regex, from the module registry.
+    Every pattern is compiled once, whatever the size of the re module internal cache.
+
+    :param pattern: string, the regex pattern
+    :return: compiled regex
+    """
+    regex = REGEX_CACHE.get(pattern)
+
+    if regex is None:
+        REGEX_CACHE_STATS["misses"] += 1
+        regex = re.compile(pattern)
+        REGEX_CACHE[pattern] = regex
+    else:
+        REGEX_CACHE_STATS["hits"] += 1
+
+    return regex
+
+
+def get_regex_cache_stats():
+    """Regex registry usage.
+
+    :return: dict, with hits, misses and size
+    """
+    return {"hits": REGEX_CACHE_STATS["hits"], "misses": REGEX_CACHE_STATS["misses"], "size": len(REGEX_CACHE)}
+
+
 def find_words_with_char(string, char, language):
     """getting words with asked char, in given string.
 
@@ -77,18 +168,16 @@ def find_words_with_char(string, char, language):
 
     if char in string:
         # Filtering everything but alphabetical chars
-        string = re.sub(r"(\b[^" + char + r"\s]+\b)", "", string)
-        string = re.sub(r"\W", " ", string)
+        string = get_regex(r"(\b[^" + char + r"\s]+\b)").sub("", string)
+        string = get_regex(r"\W").sub(" ", string)
         result = string.split()
 
         # Filtering non-matching words
         result = [value for value in result if char in value]
 
         # Filtering trusted words
-        csv_file = LETTERS_MAPS_DIRECTORY + char + '_trusted.csv'
-        for word in get_csv_words_with_language(csv_file, language):
-            result = [value for value in result if value != word]
-            result = [value for value in result if value != (word[:1] + word[:1])]
+        trusted_words = get_trusted_words_with_language(LETTERS_MAPS_DIRECTORY + char + '_trusted.csv', language)
+        result = [value for value in result if value not in trusted_words]
 
     return result
 
@@ -112,7 +201,7 @@ def print_single_letters(string):
     :param string: the string to check.
     :return: string
     """
-    if re.search(r"\b[b-zB-HJ-Z]\b", string):
+    if get_regex(r"\b[b-zB-HJ-Z]\b").search(string):
         print(string)
 
     return
@@ -128,17 +217,25 @@ def remove_space_from_word(string, word, check_uppercase, check_plural):
     :param check_plural: boolean, check even with an "s" at the end
     :return:
     """
-    if check_uppercase:
-        regex = r"\b([" + word[:1].upper() + word[:1] + "])" + word[1:]
-    else:
-        regex = r"\b(" + word[:1] + ")" + word[1:]
+    regex = get_remove_space_regex(word, check_uppercase, check_plural, True)
+    return get_regex(regex).sub(r"\1" + word[1:].replace(" ", ""), string)
 
-    if check_plural:
-        regex += r"(?=s?\b)"
-    else:
-        regex += r"\b"
 
-    return re.sub(r"" + regex, r"\1" + word[1:].replace(" ", ""), string)
+def get_remove_space_regex(word, check_uppercase, check_plural, is_capturing):
+    """remove_space_from_word regex.
+
+    :param word: string, the word to fix.
+    :param check_uppercase: boolean, check uppercase on the first letter
+    :param check_plural: boolean, check even with an "s" at the end
+    :param is_capturing: boolean, capture the first letter in group 1
+    :return: string
+    """
+    first_letter = "[" + word[:1].upper() + word[:1] + "]" if check_uppercase else word[:1]
+
+    if is_capturing:
+        first_letter = "(" + first_letter + ")"
+
+    return r"\b" + first_letter + word[1:] + (r"(?=s?\b)" if check_plural else r"\b")
 
 
 def get_csv_words_with_language(csv_file_path, language):
@@ -148,7 +245,7 @@ def get_csv_words_with_language(csv_file_path, language):
     :param language: current language correction
     :return: list of strings, or empty list
     """
-    localized_csv_path = re.sub(r"\.csv$", "." + language + ".csv", csv_file_path)
+    localized_csv_path = get_regex(r"\.csv$").sub("." + language + ".csv", csv_file_path)
 
     result_list = []
     result_list += get_csv_words(csv_file_path)
@@ -168,6 +265,9 @@ def get_csv_words(csv_file_path):
     if csv_file_path in FILE_CACHE:
         return FILE_CACHE[csv_file_path]
 
+    if load_strings_maps_on_first_use() and csv_file_path in FILE_CACHE:
+        return FILE_CACHE[csv_file_path]
+
     if os.path.isfile(csv_file_path):
         with open(csv_file_path, encoding='utf-8-sig', newline='') as csv_file:
             csv_file_reader = csv.reader(csv_file, delimiter=':', quotechar='|')
@@ -178,6 +278,88 @@ def get_csv_words(csv_file_path):
     return result_list
 
 
+def get_cache_state(sources, cached_sources, cached_sizes):
+    """State of a cache built from CSV lists of FILE_CACHE, given the lists and their sizes when it was built.
+    Lists are only appended to while cached, and replaced when their file is reloaded.
+
+    :param sources: list of lists, the current CSV lists
+    :param cached_sources: list of lists, the CSV lists the cache was built from
+    :param cached_sizes: list of int, their sizes when the cache was built
+    :return: string, "unchanged", "extended" when words were only appended since, or "rebuilt" when a list was reloaded
+    """
+    if any(source is not cached_source or len(source) < cached_size
+           for source, cached_source, cached_size in zip(sources, cached_sources, cached_sizes)):
+        return "rebuilt"
+
+    if [len(source) for source in sources] != cached_sizes:
+        return "extended"
+
+    return "unchanged"
+
+
+def get_trusted_words_with_language(csv_file_path, language):
+    """Trusted words set, from regular and localized csv content.
+    Every word comes with its doubled first letter variant ("Il" gives "Il" and "II").
+    The set is rebuilt only when one of its CSV files is reloaded or extended.
+
+    :param csv_file_path: source path
+    :param language: current language correction
+    :return: frozenset of strings
+    """
+    localized_csv_path = get_regex(r"\.csv$").sub("." + language + ".csv", csv_file_path)
+    sources = [get_csv_words(csv_file_path), get_csv_words(localized_csv_path)]
+    cache_key = (csv_file_path, language)
+
+    if cache_key in TRUSTED_WORDS_CACHE:
+        cached_sources, cached_sizes, trusted_words = TRUSTED_WORDS_CACHE[cache_key]
+        if get_cache_state(sources, cached_sources, cached_sizes) == "unchanged":
+            return trusted_words
+
+    words = sources[0] + sources[1]
+    trusted_words = frozenset(words + [word[:1] + word[:1] for word in words])
+
+    TRUSTED_WORDS_CACHE[cache_key] = (sources, [len(source) for source in sources], trusted_words)
+    return trusted_words
+
+
+def get_capital_i_lexicon(language):
+    """Trusted I and l words index, for fix_capital_i_to_l : every word starting with I is mapped to "I" if it is a
+    trusted I word, to "l" if its l version is a trusted l word. Trusted I words win.
+    Words appended to the cached CSV lists since the last call are indexed incrementally.
+
+    :param language: current language correction
+    :return: dict, word starting with I to "I" or "l"
+    """
+    sources = [get_csv_words(LETTERS_MAPS_DIRECTORY + "l_trusted.csv"),
+               get_csv_words(LETTERS_MAPS_DIRECTORY + "l_trusted." + language + ".csv"),
+               get_csv_words(LETTERS_MAPS_DIRECTORY + "I_trusted.csv"),
+               get_csv_words(LETTERS_MAPS_DIRECTORY + "I_trusted." + language + ".csv")]
+    cache_key = (LETTERS_MAPS_DIRECTORY, language)
+    sizes = [0, 0, 0, 0]
+    lexicon = {}
+
+    if cache_key in CAPITAL_I_LEXICON_CACHE:
+        cached_sources, cached_sizes, cached_lexicon = CAPITAL_I_LEXICON_CACHE[cache_key]
+        cache_state = get_cache_state(sources, cached_sources, cached_sizes)
+        if cache_state == "unchanged":
+            return cached_lexicon
+        if cache_state == "extended":
+            sizes = cached_sizes
+            lexicon = cached_lexicon
+
+    for words, size in zip(sources[:2], sizes[:2]):
+        for word in words[size:]:
+            if word.startswith("l"):
+                lexicon.setdefault("I" + word[1:], "l")
+
+    for words, size in zip(sources[2:], sizes[2:]):
+        for word in words[size:]:
+            lexicon[word] = "I"
+
+    CAPITAL_I_LEXICON_CACHE[cache_key] = (sources, [len(source) for source in sources], lexicon)
+    return lexicon
+
+
 def get_csv_words_map_with_language(csv_file_path, language):
     """Safe file word list, gets regular and localized csv content
 
@@ -185,7 +367,7 @@ def get_csv_words_map_with_language(csv_file_path, language):
     :param language: current language correction
     :return: list of strings arrays, or empty list
     """
-    localized_csv_path = re.sub(r"\.csv$", "." + language + ".csv", csv_file_path)
+    localized_csv_path = get_regex(r"\.csv$").sub("." + language + ".csv", csv_file_path)
 
     result_list = []
     result_list += get_csv_words_map(csv_file_path)
@@ -205,6 +387,9 @@ def get_csv_words_map(csv_file_path):
     if csv_file_path in FILE_CACHE:
         return FILE_CACHE[csv_file_path]
 
+    if load_strings_maps_on_first_use() and csv_file_path in FILE_CACHE:
+        return FILE_CACHE[csv_file_path]
+
     if os.path.isfile(csv_file_path):
         with open(csv_file_path, encoding="utf-8-sig", newline='') as csv_file:
             csv_file_reader = csv.reader(csv_file, delimiter=':', quotechar='|')
@@ -215,24 +400,289 @@ def get_csv_words_map(csv_file_path):
     return result_list
 
 
+def get_misspells_engine(csv_file_path, language):
+    """Precompiled misspells map, rebuilt only when one of its CSV files is reloaded or extended.
+
+    The engine is a tuple (regex, blocks) :
+       *  regex   : a single alternation of every misspell, rejecting clean strings in one scan
+       *  blocks  : ordered list of (block regex, [(misspell regex, replacement), ...])
+
+    :param csv_file_path: source path
+    :param language: current language correction
+    :return: tuple
+    """
+    localized_csv_path = get_regex(r"\.csv$").sub("." + language + ".csv", csv_file_path)
+    sources = [get_csv_words_map(csv_file_path), get_csv_words_map(localized_csv_path)]
+    cache_key = (csv_file_path, language)
+
+    if cache_key in MISSPELLS_CACHE:
+        cached_sources, cached_sizes, engine = MISSPELLS_CACHE[cache_key]
+        if get_cache_state(sources, cached_sources, cached_sizes) == "unchanged":
+            return engine
+
+    errors = sources[0] + sources[1]
+    regexes = [r"\b" + error[0] + r"\b" for error in errors]
+    rules = [(re.compile(regex), error[1]) for regex, error in zip(regexes, errors)]
+
+    engine = build_block_engine(regexes, rules, MISSPELLS_BLOCK_SIZE)
+    MISSPELLS_CACHE[cache_key] = (sources, [len(source) for source in sources], engine)
+    return engine
+
+
+def build_block_engine(regexes, rules, block_size):
+    """Engine of get_misspells_engine and get_letter_space_engine : a regex rejecting clean strings in one scan, and
+    the rules split in blocks, each with a regex matching any of its rules.
+
+    :param regexes: list of string, the regex matching each rule
+    :param rules: list of (compiled regex, replacement), in the same order
+    :param block_size: int, the number of rules per block
+    :return: tuple (regex, blocks), regex is None without any rule
+    """
+    blocks = []
+    for i in range(0, len(regexes), block_size):
+        block_regexes = regexes[i:i + block_size]
+        blocks.append((re.compile("|".join("(?:" + regex + ")" for regex in block_regexes)), rules[i:i + block_size]))
+
+    regex = re.compile("|".join("(?:" + regex + ")" for regex in regexes)) if regexes else None
+
+    return regex, blocks
+
+
+def get_letter_space_engine(letter, language):
+    """Precompiled letter followed by space rules, rebuilt only when one of its CSV files is reloaded or extended.
+    Same structure as get_misspells_engine : rules of the _space_upp_plural, _space_upp, _space and _space_plural
+    files are applied in this order, skipping blocks without any match.
+
+    :param letter: string, the letter to check.
+    :param language: current language correction
+    :return: tuple
+    """
+    cache_key = (LETTERS_MAPS_DIRECTORY + letter, language)
+
+    if cache_key in LETTERS_SPACE_CACHE:
+        csv_file_paths, cached_sources, cached_sizes, engine = LETTERS_SPACE_CACHE[cache_key]
+        sources = [get_csv_words(csv_file_path) for csv_file_path in csv_file_paths]
+        if get_cache_state(sources, cached_sources, cached_sizes) == "unchanged":
+            return engine
+
+    csv_file_paths = []
+    regexes = []
+    rules = []
+
+    for suffix, check_uppercase, check_plural in LETTERS_SPACE_FILES:
+        for csv_file_path in [LETTERS_MAPS_DIRECTORY + letter + suffix + ".csv",
+                              LETTERS_MAPS_DIRECTORY + letter + suffix + "." + language + ".csv"]:
+            csv_file_paths.append(csv_file_path)
+            for word in get_csv_words(csv_file_path):
+                regexes.append(get_remove_space_regex(word, check_uppercase, check_plural, False))
+                rules.append((re.compile(get_remove_space_regex(word, check_uppercase, check_plural, True)),
+                              r"\1" + word[1:].replace(" ", "")))
+
+    engine = build_block_engine(regexes, rules, LETTERS_SPACE_BLOCK_SIZE)
+
+    sources = [get_csv_words(csv_file_path) for csv_file_path in csv_file_paths]
+    LETTERS_SPACE_CACHE[cache_key] = (csv_file_paths, sources, [len(source) for source in sources], engine)
+    return engine
+
+
+def preload_strings_maps(languages=("fr", "eng", "ger")):
+    """Loads every StringsMaps CSV file in cache, and builds the misspells engines of the given languages.
+
+    :param languages: list of languages to prepare
+    """
+    if not load_strings_maps_on_first_use():
+        parse_strings_maps()
+
+    for language in languages:
+        get_misspells_engine(STRINGS_MAPS_DIRECTORY + 'common_misspells.csv', language)
+
+    return
+
+
+def parse_strings_maps():
+    """Loads every StringsMaps CSV file in cache, already cached files are kept."""
+    for directory in [STRINGS_MAPS_DIRECTORY, LETTERS_MAPS_DIRECTORY]:
+        for csv_file_name in sorted(os.listdir(directory)):
+            if csv_file_name.startswith("common_misspells"):
+                get_csv_words_map(directory + csv_file_name)
+            elif csv_file_name.endswith(".csv"):
+                get_csv_words(directory + csv_file_name)
+
+    return
+
+
+def load_strings_maps_on_first_use():
+    """With strings_maps_snapshot, fills the StringsMaps caches on the first CSV file read of the process :
+    parsed CSV files and trusted words sets come from the snapshot file, rebuilt whenever a CSV file changed.
+
+    :return: bool, True if this call filled the caches
+    """
+    if not conf_strings_maps_snapshot or STRINGS_MAPS_SNAPSHOT_STATE["used"]:
+        return False
+
+    STRINGS_MAPS_SNAPSHOT_STATE["used"] = True
+    fingerprint = get_strings_maps_stat_fingerprint()
+
+    if not load_strings_maps_snapshot(fingerprint):
+        parse_strings_maps()
+        save_strings_maps_snapshot(fingerprint)
+
+    return True
+
+
+def get_strings_maps_stat_fingerprint():
+    """Cheap StringsMaps signature, from every CSV file path, size and modification time.
+
+    :return: list
+    """
+    fingerprint = [STRINGS_MAPS_SNAPSHOT_VERSION]
+
+    for directory in [STRINGS_MAPS_DIRECTORY, LETTERS_MAPS_DIRECTORY]:
+        for csv_file_name in sorted(os.listdir(directory)):
+            if csv_file_name.endswith(".csv"):
+                stat = os.stat(directory + csv_file_name)
+                fingerprint.append([directory + csv_file_name, stat.st_size, stat.st_mtime_ns])
+
+    return fingerprint
+
+
+def load_strings_maps_snapshot(fingerprint):
+    """Fills the StringsMaps caches from the snapshot file, if it was built from the same CSV files.
+    Already cached files are kept.
+
+    :param fingerprint: list, the current get_strings_maps_stat_fingerprint
+    :return: bool, False if the snapshot is missing or outdated
+    """
+    snapshot = load_pickle_file(STRINGS_MAPS_SNAPSHOT_PATH, None)
+
+    if not isinstance(snapshot, dict) or snapshot.get("fingerprint") != fingerprint:
+        return False
+
+    for csv_file_path, words in snapshot["files"].items():
+        FILE_CACHE.setdefault(csv_file_path, words)
+
+    for cache_key, trusted_words in snapshot["trusted_words"].items():
+        TRUSTED_WORDS_CACHE.setdefault(cache_key, trusted_words)
+
+    return True
+
+
+def save_strings_maps_snapshot(fingerprint, languages=("fr", "eng", "ger")):
+    """Writes the parsed CSV files, and the trusted words sets of the given languages, in the snapshot file.
+    Nothing is written while learned words are waiting for their flush.
+    Compiled regex can't be stored : pickle compiles them again on load, so engines stay built on first use.
+
+    :param fingerprint: list, the current get_strings_maps_stat_fingerprint
+    :param languages: list of languages to prepare
+    """
+    for csv_file_name in sorted(os.listdir(LETTERS_MAPS_DIRECTORY)):
+        if get_regex(r"_trusted(\.\w+)?\.csv$").search(csv_file_name):
+            for language in languages:
+                get_trusted_words_with_language(LETTERS_MAPS_DIRECTORY + csv_file_name.split(".")[0] + ".csv",
+                                                language)
+
+    if CSV_PENDING_ROWS:
+        return
+
+    snapshot = {"fingerprint": fingerprint,
+                "files": {csv_file_path: words for csv_file_path, words in FILE_CACHE.items()
+                          if csv_file_path.startswith(STRINGS_MAPS_DIRECTORY)},
+                "trusted_words": {cache_key: trusted_words for cache_key, trusted_words in TRUSTED_WORDS_CACHE.items()
+                                  if cache_key[0].startswith(STRINGS_MAPS_DIRECTORY)}}
+
+    try:
+        os.makedirs(os.path.dirname(STRINGS_MAPS_SNAPSHOT_PATH), exist_ok=True)
+        save_pickle_file(STRINGS_MAPS_SNAPSHOT_PATH, snapshot)
+    except OSError:
+        print("Warning : can't write StringsMaps snapshot '" + STRINGS_MAPS_SNAPSHOT_PATH + "'")
+
+    return
+
+
+def get_strings_maps_fingerprint():
+    """Hash of every StringsMaps CSV file content : any dictionary change gives another fingerprint.
+
+    :return: string, hexadecimal
+    """
+    md5 = hashlib.md5()
+
+    for directory in [STRINGS_MAPS_DIRECTORY, LETTERS_MAPS_DIRECTORY]:
+        for csv_file_name in sorted(os.listdir(directory)):
+            if csv_file_name.endswith(".csv"):
+                md5.update(csv_file_name.encode('utf-8'))
+                md5.update(get_md5(directory + csv_file_name))
+
+    return md5.hexdigest()
+
+
 def put_csv_word(csv_file_path, key, value):
-    """Concat line at the end of CSV file.
+    """Concat line at the end of the cached CSV content, and of the CSV file with the next flush.
+    Already known lines are ignored.
 
     :param csv_file_path: source path
     :param key: can't be null
     :param value: None for single column CSV
     """
-    FILE_CACHE.pop(csv_file_path, None)
+    if not value:
+        row = [key]
+        cached_content = get_csv_words(csv_file_path)
+        cached_line = key
+    else:
+        row = [key, value]
+        cached_content = get_csv_words_map(csv_file_path)
+        cached_line = row
+
+    if cached_line in cached_content:
+        return
+
+    cached_content.append(cached_line)
+    STRINGS_MAPS_STATE["version"] += 1
+    CSV_PENDING_ROWS.setdefault(csv_file_path, []).append(row)
+
+    if sum(len(rows) for rows in CSV_PENDING_ROWS.values()) >= conf_csv_flush_size:
+        flush_csv_words()
 
-    with open(csv_file_path, 'a', encoding='utf-8-sig', newline='') as csv_file:
-        writer = csv.writer(csv_file, delimiter=':', quotechar='|', quoting=csv.QUOTE_MINIMAL)
-        if not value:
-            writer.writerow([key])
-        else:
-            writer.writerow([key, value])
     return
 
 
+def flush_csv_words():
+    """Writes pending put_csv_word lines at the end of their CSV files, in the order they were learned,
+    as the cached content : misspells are applied in this order."""
+    for csv_file_path, rows in CSV_PENDING_ROWS.items():
+        with open(csv_file_path, 'a', encoding='utf-8-sig', newline='') as csv_file:
+            writer = csv.writer(csv_file, delimiter=':', quotechar='|', quoting=csv.QUOTE_MINIMAL)
+            writer.writerows(rows)
+
+    CSV_PENDING_ROWS.clear()
+    return
+
+
+atexit.register(flush_csv_words)
+
+
+def prompt_user(message, skipped_answer, decision=None):
+    """Prompts the user, unless every prompt is skipped, or queued for a later review.
+    Every call is counted, even skipped ones : a line reaching a prompt is never memoized.
+
+    :param message: string, the prompt
+    :param skipped_answer: string, the answer when every prompt is skipped or queued
+    :param decision: dict, with kind, line, candidate and offset, None if it can't be queued
+    :return: string, the answer
+    """
+    PROMPT_STATS["count"] += 1
+
+    if conf_queue_decisions and decision is not None:
+        queued_decision = dict(DECISION_CONTEXT)
+        queued_decision.update(decision)
+        DECISIONS.append(queued_decision)
+        return skipped_answer
+
+    if conf_auto_skip_everything:
+        return skipped_answer
+
+    return input(message)
+
+
 def ask_for_correction(string, array, trusted_file_path, language):
     """Prompt for a correction.
     :q  - Ignore current line
@@ -250,34 +700,55 @@ def ask_for_correction(string, array, trusted_file_path, language):
 
     for word in array:
 
-        if conf_auto_skip_everything:
-            prompt = ":q"
-        else:
-            prompt = input("Found " + SHELL_COLOR_WARNING + word + SHELL_COLOR_END + " : ")
-
-        if prompt == ":q":
-            print("Skipped...")
-        elif prompt == ":x":
-            trusted_file_path = LETTERS_MAPS_DIRECTORY + re.sub(r"\.csv$", "." + language + ".csv", trusted_file_path)
-            put_csv_word(trusted_file_path, word, None)
-        elif prompt == ":x!":
-            trusted_file_path = LETTERS_MAPS_DIRECTORY + trusted_file_path
-            put_csv_word(trusted_file_path, word, None)
-        else:
-            string = string.replace(word, prompt)
-            prompt_should_register = input("    Register? : ")
-
-            if prompt_should_register == ":x":
-                common_misspells_file_path = STRINGS_MAPS_DIRECTORY + "common_misspells." + language + ".csv"
-                put_csv_word(common_misspells_file_path, word, prompt)
-            elif prompt_should_register == ":x!":
-                common_misspells_file_path = STRINGS_MAPS_DIRECTORY + "common_misspells.csv"
-                put_csv_word(common_misspells_file_path, word, prompt)
+        decision = {"kind": "word", "line": string, "candidate": word, "offset": string.find(word),
+                    "trusted_file": trusted_file_path}
+        prompt = prompt_user("Found " + SHELL_COLOR_WARNING + word + SHELL_COLOR_END + " : ", ":q", decision)
+
+        prompt_should_register = ""
+        if prompt not in [":q", ":x", ":x!"]:
+            prompt_should_register = prompt_user("    Register? : ", "")
+
+        string = apply_word_answer(string, word, prompt, prompt_should_register, trusted_file_path, language)
+
+    return string
+
+
+def apply_word_answer(string, word, prompt, prompt_should_register, trusted_file_path, language):
+    """Applies an ask_for_correction answer.
+
+    :param string: the string to fix
+    :param word: the word found
+    :param prompt: string, :q, :x, :x! or the replacement
+    :param prompt_should_register: string, :x or :x! to register the replacement
+    :param trusted_file_path: path to trusted csv
+    :param language: current language
+    :return: fixed string
+    """
+    if prompt == ":q":
+        print("Skipped...")
+    elif prompt == ":x":
+        localized_trusted_file_path = get_regex(r"\.csv$").sub("." + language + ".csv", trusted_file_path)
+        trusted_file_path = LETTERS_MAPS_DIRECTORY + localized_trusted_file_path
+        put_csv_word(trusted_file_path, word, None)
+    elif prompt == ":x!":
+        trusted_file_path = LETTERS_MAPS_DIRECTORY + trusted_file_path
+        put_csv_word(trusted_file_path, word, None)
+    else:
+        string = string.replace(word, prompt)
+
+        if prompt_should_register == ":x":
+            common_misspells_file_path = STRINGS_MAPS_DIRECTORY + "common_misspells." + language + ".csv"
+            put_csv_word(common_misspells_file_path, word, prompt)
+        elif prompt_should_register == ":x!":
+            common_misspells_file_path = STRINGS_MAPS_DIRECTORY + "common_misspells.csv"
+            put_csv_word(common_misspells_file_path, word, prompt)
 
     return string
 
 
 def launch_ms_word_spell_check(path, language):
+    import subprocess            # deferred, only needed by the spell check launchers
+
     command_line = ""
 
     if os.path.isfile(conf_ms_word_2010_path):
@@ -302,6 +773,8 @@ def launch_ms_word_spell_check(path, language):
 
 
 def launch_libreoffice_6_writer_spell_check(path, language):
+    import subprocess            # deferred, only needed by the spell check launchers
+
     command_line = ""
 
     if os.path.isfile(conf_libreoffice6_writer_path):
@@ -344,12 +817,111 @@ def remove_all_uppercase_words(array):
     :param array: the array to fix.
     :return: array
     """
-    return [word for word in array if not re.match(r"^(" + UPPER_CASE + r"){3,}$", word)]
+    return [word for word in array if not get_regex(r"^(" + UPPER_CASE + r"){3,}$").match(word)]
 
 
 # endregion Utils
 
 
+# region Profiling
+
+
+def run_fixer(fixer, value, *args, name=None):
+    """Calls the given fixer, recording its wall time, calls and changes count when profiling is enabled.
+
+    :param fixer: the fix function, taking the value first
+    :param value: the string, or the list of strings, to fix
+    :param args: other fixer parameters
+    :param name: string, the report entry, the fixer name by default
+    :return: the fixer result
+    """
+    if not conf_profile_fixers:
+        return fixer(value, *args)
+
+    # Multi-lines fixers may edit the given list itself
+    previous_value = list(value) if isinstance(value, list) else value
+
+    start = time.perf_counter()
+    result = fixer(value, *args)
+    duration = time.perf_counter() - start
+
+    stats = FIXERS_STATS.setdefault(name or fixer.__name__, [0, 0, 0.0])
+    stats[0] += 1
+    stats[1] += result != previous_value
+    stats[2] += duration
+
+    return result
+
+
+def count_skipped_fixer_calls(fixer, count, name=None):
+    """Records calls of a fixer skipped by fix_track gates, when profiling is enabled : skipped lines are counted as
+    unchanged calls, so the report has the same calls with and without gates.
+
+    :param fixer: the fix function
+    :param count: int, the number of skipped lines
+    :param name: string, the report entry, the fixer name by default
+    """
+    if not conf_profile_fixers or count <= 0:
+        return
+
+    stats = FIXERS_STATS.setdefault(name or fixer.__name__, [0, 0, 0.0])
+    stats[0] += count
+
+    return
+
+
+def merge_fixers_stats(fixers_stats):
+    """Adds stats recorded elsewhere, by a worker process, to the current run ones.
+
+    :param fixers_stats: dict, fixer name to calls, changes count and seconds
+    """
+    for name, (calls, changed, seconds) in fixers_stats.items():
+        stats = FIXERS_STATS.setdefault(name, [0, 0, 0.0])
+        stats[0] += calls
+        stats[1] += changed
+        stats[2] += seconds
+
+    return
+
+
+def get_fixers_report():
+    """Fixers stats of the whole run, the most expensive first.
+
+    :return: list of dict, with name, calls, changed and seconds
+    """
+    report = [{"name": name, "calls": calls, "changed": changed, "seconds": seconds}
+              for name, (calls, changed, seconds) in FIXERS_STATS.items()]
+
+    return sorted(report, key=lambda entry: (-entry["seconds"], entry["name"]))
+
+
+def print_fixers_report():
+    """Prints the fixers stats of the whole run, the most expensive first.
+    Every line is counted : the line memo is disabled while fixers are profiled."""
+    print(SHELL_COLOR_BOLD + "Fixers" + SHELL_COLOR_END)
+    if conf_line_cache_size > 0:
+        print("Line cache disabled while profiling : every line runs every fixer")
+    for entry in get_fixers_report():
+        print("%-45s %9.3fs %9d calls %9d changed" % (entry["name"], entry["seconds"], entry["calls"],
+                                                       entry["changed"]))
+
+    return
+
+
+def export_fixers_report(path):
+    """Saves the fixers report as JSON.
+
+    :param path: string, the JSON file path
+    """
+    with open(path, 'w', encoding='utf-8') as report_file:
+        json.dump(get_fixers_report(), report_file, indent=2)
+
+    return
+
+
+# endregion Profiling
+
+
 # region Single line
 
 
@@ -359,15 +931,13 @@ def fix_accentuated_capital_a(string):
     :param string: the string to check.
     :return: string
     """
-    matches = list(re.finditer(r"\bA\b(?!-t-)", string))
+    matches = list(get_regex(r"\bA\b(?!-t-)").finditer(string))
     for i in range(0, len(matches)):
         match = matches[i]
         colour_string = string[:match.start()] + SHELL_COLOR_WARNING + "A" + SHELL_COLOR_END + string[match.end():]
 
-        if conf_auto_skip_everything:
-            prompt = ":q"
-        else:
-            prompt = input("Found A in \"" + colour_string.replace("\n", "") + "\" : ")
+        decision = {"kind": "capital_a", "line": string, "candidate": "A", "offset": match.start()}
+        prompt = prompt_user("Found A in \"" + colour_string.replace("\n", "") + "\" : ", ":q", decision)
 
         if prompt == ":x":
             string = colour_string.replace(SHELL_COLOR_WARNING + "A" + SHELL_COLOR_END, "À")
@@ -381,10 +951,10 @@ def fix_acronyms(string):
     :param string: the string to fix.
     :return: string
     """
-    string = re.sub(r"(?<=\b" + UPPER_CASE + r"\.)(\s*)(?=\w\.)", "", string)
+    string = get_regex(r"(?<=\b" + UPPER_CASE + r"\.)(\s*)(?=\w\.)").sub("", string)
 
     if not conf_is_unittest_exec:
-        if re.search(r"\w\.\w\.", string):
+        if get_regex(r"\w\.\w\.").search(string):
             print("Found acronym : " + string.replace("\n", ""))
 
     return string
@@ -396,20 +966,16 @@ def fix_zero_to_o(string):
     :param string: the string to fix.
     :return: string
     """
-    while re.search(r"" + LOWER_CASE + "0", string):
-        string = re.sub(r"(?<=" + LOWER_CASE + r")0", "o", string)
-
-    while re.search(r"" + UPPER_CASE + "0" + LOWER_CASE, string):
-        string = re.sub(r"(?<=" + UPPER_CASE + r")0(?=" + LOWER_CASE + r")", "o", string)
-
-    while re.search(r"" + LOWER_CASE + r"\s0" + LOWER_CASE, string):
-        string = re.sub(r"(?<=" + LOWER_CASE + r"\s)0(?=" + LOWER_CASE + r")", "o", string)
+    if "0" not in string:
+        return string
 
-    while re.search(r",\s0" + LOWER_CASE, string):
-        string = re.sub(r"(?<=,\s)0(?=" + LOWER_CASE + r")", "o", string)
+    # Every zero of a run following a lowercase letter
+    string = get_regex(r"(?<=" + LOWER_CASE + r")0+").sub(lambda match: "o" * len(match.group()), string)
 
-    while re.search(r"'0" + LOWER_CASE, string):
-        string = re.sub(r"(?<=')0(?=" + LOWER_CASE + r")", "o", string)
+    string = get_regex(r"(?<=" + UPPER_CASE + r")0(?=" + LOWER_CASE + r")").sub("o", string)
+    string = get_regex(r"(?<=" + LOWER_CASE + r"\s)0(?=" + LOWER_CASE + r")").sub("o", string)
+    string = get_regex(r"(?<=,\s)0(?=" + LOWER_CASE + r")").sub("o", string)
+    string = get_regex(r"(?<=')0(?=" + LOWER_CASE + r")").sub("o", string)
 
     if "0" in string:
         print(SHELL_COLOR_WARNING + "Zero in : " + string[:-1] + SHELL_COLOR_END)
@@ -425,56 +991,42 @@ def fix_capital_i_to_l(string, language):
     :param language: current language correction
     :return: string
     """
-    while re.search(r"" + LOWER_CASE + "I", string):
-        string = re.sub(r"(?<=" + LOWER_CASE + r")I", "l", string)
-
-    while re.search(r"" + UPPER_CASE + "I" + LOWER_CASE, string):
-        string = re.sub(r"(?<=" + UPPER_CASE + r")I(?=" + LOWER_CASE + r")", "l", string)
+    # Every I of a run following a lowercase letter,
+    # then every I preceded by an uppercase letter (I included) in a run followed by a lowercase letter
+    string = get_regex(r"(?<=" + LOWER_CASE + r")I+").sub(lambda match: "l" * len(match.group()), string)
+    string = get_regex(r"(?<=" + UPPER_CASE + r")I+(?=" + LOWER_CASE + r")").sub(lambda match: "l" * len(match.group()),
+                                                                                  string)
 
     # Prompt if comma or dot
 
-    matches = list(re.finditer(r"\bI.*?\b", string))
+    matches = list(get_regex(r"\bI.*?\b").finditer(string))
     prompt_results = []
 
     if len(matches) > 0:
 
         # Get fixable matches
 
+        lexicon = get_capital_i_lexicon(language)
+
         for i in range(0, len(matches)):
             result = matches[i]
+            trusted_letter = lexicon.get(string[result.start():result.end()])
 
-            trusted_capital_i_words = get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + "I_trusted.csv", language)
-            trusted_l_words = get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + "l_trusted.csv", language)
-
-            if string[result.start():result.end()] in trusted_capital_i_words:
+            if trusted_letter == "I":
                 prompt_results.append(False)
-            elif "l" + string[result.start() + 1:result.end()] in trusted_l_words:
+            elif trusted_letter == "l":
                 prompt_results.append(True)
-            elif conf_auto_skip_everything:
-                prompt_results.append(False)
             else:
-                prompt = input("Found _I in : " + string[:result.start()] +
-                               SHELL_COLOR_WARNING + string[result.start():result.start() + 1] + SHELL_COLOR_END +
-                               string[result.start() + 1:].replace("\n", "") + " : ")
-
-                if prompt == ":x!":
-                    prompt_results.append(False)
-                    put_csv_word(LETTERS_MAPS_DIRECTORY + "I_trusted.csv",
-                                 string[result.start():result.end()], None)
-                elif prompt == ":x":
-                    prompt_results.append(False)
-                    put_csv_word(LETTERS_MAPS_DIRECTORY + "I_trusted." + language + ".csv",
-                                 string[result.start():result.end()], None)
-                elif prompt == ":q!":
-                    prompt_results.append(True)
-                    put_csv_word(LETTERS_MAPS_DIRECTORY + "l_trusted.csv",
-                                 "l" + string[result.start() + 1:result.end()], None)
-                elif prompt == ":q":
-                    prompt_results.append(True)
-                    put_csv_word(LETTERS_MAPS_DIRECTORY + "l_trusted." + language + ".csv",
-                                 "l" + string[result.start() + 1:result.end()], None)
-                else:
-                    prompt_results.append(False)
+                decision = {"kind": "capital_i", "line": string, "candidate": string[result.start():result.end()],
+                            "offset": result.start()}
+                prompt = prompt_user("Found _I in : " + string[:result.start()] +
+                                     SHELL_COLOR_WARNING + string[result.start():result.start() + 1] + SHELL_COLOR_END +
+                                     string[result.start() + 1:].replace("\n", "") + " : ", "", decision)
+
+                prompt_results.append(apply_capital_i_answer(string[result.start():result.end()], prompt, language))
+                if prompt in [":x!", ":x", ":q!", ":q"]:
+                    # The answer is trusted for the next matches
+                    lexicon = get_capital_i_lexicon(language)
 
         # Fix matches
 
@@ -485,6 +1037,26 @@ def fix_capital_i_to_l(string, language):
     return string
 
 
+def apply_capital_i_answer(word, prompt, language):
+    """Registers a fix_capital_i_to_l answer.
+
+    :param word: the word starting with I
+    :param prompt: string, :x! or :x to trust the I, :q! or :q to switch it with l
+    :param language: current language correction
+    :return: bool, True if I has to be switched with l
+    """
+    if prompt == ":x!":
+        put_csv_word(LETTERS_MAPS_DIRECTORY + "I_trusted.csv", word, None)
+    elif prompt == ":x":
+        put_csv_word(LETTERS_MAPS_DIRECTORY + "I_trusted." + language + ".csv", word, None)
+    elif prompt == ":q!":
+        put_csv_word(LETTERS_MAPS_DIRECTORY + "l_trusted.csv", "l" + word[1:], None)
+    elif prompt == ":q":
+        put_csv_word(LETTERS_MAPS_DIRECTORY + "l_trusted." + language + ".csv", "l" + word[1:], None)
+
+    return prompt in [":q!", ":q"]
+
+
 def fix_colon(string, language):
     """Fixes spaces around colon.
 
@@ -493,13 +1065,13 @@ def fix_colon(string, language):
     :return: string
     """
     if language == "fr":
-        string = re.sub(r"(?<=\w):(?=\w)", " : ", string)
-        string = re.sub(r"(?<=\w):", " :", string)
+        string = get_regex(r"(?<=\w):(?=\w)").sub(" : ", string)
+        string = get_regex(r"(?<=\w):").sub(" :", string)
     elif language == "eng":
         string = string.replace(" :", ":")
 
-    string = re.sub(r":(?=\w)", ": ", string)
-    string = re.sub(r"(?<=\d)\s*:\s*(?=\d)", ":", string)
+    string = get_regex(r":(?=\w)").sub(": ", string)
+    string = get_regex(r"(?<=\d)\s*:\s*(?=\d)").sub(":", string)
 
     return string
 
@@ -525,15 +1097,22 @@ def fix_common_errors(string):
 
 
 def fix_common_misspells(string, language):
-    """Hardcoded fixes of many errors
+    """Hardcoded fixes of many errors.
+    Misspells are applied in the CSV order, a block being skipped when none of its misspells matches.
 
     :param string: the string to fix.
     :param language: current language correction
     :return: string
     """
-    for error in get_csv_words_map_with_language(STRINGS_MAPS_DIRECTORY + 'common_misspells.csv', language):
-        regex = r"\b" + error[0] + r"\b"
-        string = re.sub(r"" + regex, error[1], string)
+    regex, blocks = get_misspells_engine(STRINGS_MAPS_DIRECTORY + 'common_misspells.csv', language)
+
+    if not regex or not regex.search(string):
+        return string
+
+    for block_regex, rules in blocks:
+        if block_regex.search(string):
+            for rule_regex, replacement in rules:
+                string = rule_regex.sub(replacement, string)
 
     return string
 
@@ -546,9 +1125,9 @@ def fix_degree_symbol(string):
     """
 
     if "°" in string:
-        string = re.sub(r"(?<=\d)\s*°", "°", string)
-        string = re.sub(r"(?<=\d)\s*°\s*(?=[FCK]\b)", "°", string)
-        string = re.sub(r"(?<=\b[nN])\s*°\s*(?=\d)", "°", string)
+        string = get_regex(r"(?<=\d)\s*°").sub("°", string)
+        string = get_regex(r"(?<=\d)\s*°\s*(?=[FCK]\b)").sub("°", string)
+        string = get_regex(r"(?<=\b[nN])\s*°\s*(?=\d)").sub("°", string)
 
     return string
 
@@ -568,7 +1147,7 @@ def fix_dialog_hyphen(string):
     :param string: the string to fix.
     :return: string
     """
-    res = re.sub(r"^(\s*|\"|<i>)-(?!\s|-)", r"\1- ", string)
+    res = get_regex(r"^(\s*|\"|<i>)-(?!\s|-)").sub(r"\1- ", string)
     return res
 
 
@@ -581,14 +1160,14 @@ def fix_punctuation_errors(string):
     string = string.replace(". . .", "...")
     string = string.replace(".. .", "...")
     string = string.replace(". ..", "...")
-    string = re.sub(r"\.\s*\"$", ".\"", string)
+    string = get_regex(r"\.\s*\"$").sub(".\"", string)
 
     if "..." in string:
-        string = re.sub(r"\.\.\.(?=\w)", "... ", string)
-        string = re.sub(r"\.\.\.\.+", "...", string)
+        string = get_regex(r"\.\.\.(?=\w)").sub("... ", string)
+        string = get_regex(r"\.\.\.\.+").sub("...", string)
 
     if "--" in string:
-        string = re.sub(r"(?<!^)\s*--", " --", string)
+        string = get_regex(r"(?<!^)\s*--").sub(" --", string)
 
     return string
 
@@ -605,13 +1184,13 @@ def fix_quotes(line, language):
     line = line.replace("‘", "'")
     line = line.replace("’", "'")
 
-    if re.search("\s'", line):
+    if get_regex("\s'").search(line):
         for word in get_csv_words_with_language(STRINGS_MAPS_DIRECTORY + 'quote_word_trusted.csv', language):
-            line = re.sub(r"\s'" + word + r"\b", "'" + word, line)
+            line = get_regex(r"\s'" + word + r"\b").sub("'" + word, line)
 
-    if re.search("'\s", line):
+    if get_regex("'\s").search(line):
         for word in get_csv_words_with_language(STRINGS_MAPS_DIRECTORY + 'word_quote_trusted.csv', language):
-            line = re.sub(r"\b" + word + r"'\s", word + "'", line)
+            line = get_regex(r"\b" + word + r"'\s").sub(word + "'", line)
 
     return line
 
@@ -626,12 +1205,12 @@ def fix_punctuation_spaces(string, language):
     if "?" in string or "!" in string:
 
         if language == "fr":
-            string = re.sub(r"(?<![?!\s])([?!])", r" \1", string)  # Space before
+            string = get_regex(r"(?<![?!\s])([?!])").sub(r" \1", string)  # Space before
         elif language == "eng":
-            string = re.sub(r"\s*([?!])", r"\1", string)  # Space before
+            string = get_regex(r"\s*([?!])").sub(r"\1", string)  # Space before
 
-        string = re.sub(r"([?!])(?=[\w('-])", r"\1 ", string)  # Space after
-        string = re.sub(r"(?<=[?!])\s+(?=[!?])", "", string)  # Space between
+        string = get_regex(r"([?!])(?=[\w('-])").sub(r"\1 ", string)  # Space after
+        string = get_regex(r"(?<=[?!])\s+(?=[!?])").sub("", string)  # Space between
 
     return string
 
@@ -645,32 +1224,28 @@ def fix_letter_followed_by_space(line, letter, language):
     :return: string
     """
     if (letter + " ") in line:
-        for word in get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + letter + '_space_upp_plural.csv', language):
-            line = remove_space_from_word(line, word, True, True)
-
-        for word in get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + letter + '_space_upp.csv', language):
-            line = remove_space_from_word(line, word, True, False)
-
-        for word in get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + letter + '_space.csv', language):
-            line = remove_space_from_word(line, word, False, False)
+        regex, blocks = get_letter_space_engine(letter, language)
 
-        for word in get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + letter + '_space_plural.csv', language):
-            line = remove_space_from_word(line, word, False, True)
+        if regex is not None and regex.search(line):
+            for block_regex, block_rules in blocks:
+                if block_regex.search(line):
+                    for rule_regex, replacement in block_rules:
+                        line = rule_regex.sub(replacement, line)
 
     if letter + " " in line:
         line_to_print = line.replace("\n", "")
         to_check = line.replace("\n", "")
-        to_check = re.sub(r"\b(\w*[^" + letter + r")\s])\b", "", to_check)
+        to_check = get_regex(r"\b(\w*[^" + letter + r")\s])\b").sub("", to_check)
 
         for word in get_csv_words_with_language(LETTERS_MAPS_DIRECTORY + letter + '_space_trusted.csv', language):
-            to_check = re.sub(r"\b([" + word[:1] + word[:1].upper() + r"]" + word[1:] + r")\b", "", to_check)
+            trusted_regex = r"\b([" + word[:1] + word[:1].upper() + r"]" + word[1:] + r")\b"
+            to_check = get_regex(trusted_regex).sub("", to_check)
 
         # Print colored char
         if not conf_is_unittest_exec:
             if letter + " " in to_check:
-                line_to_print = re.sub(r"(\w*" + letter + r")(?=\s)",
-                                       SHELL_COLOR_WARNING + r"\1" + SHELL_COLOR_END,
-                                       line_to_print)
+                colored_letter = SHELL_COLOR_WARNING + r"\1" + SHELL_COLOR_END
+                line_to_print = get_regex(r"(\w*" + letter + r")(?=\s)").sub(colored_letter, line_to_print)
                 print("Unknown " + letter + "_ : " + line_to_print)
 
     return line
@@ -682,16 +1257,16 @@ def fix_italic_tag_errors(string):
     :param string: the string to fix.
     :return: string
     """
-    string = re.sub(r"<i>\s+", " <i>", string)
-    string = re.sub(r"\s+</i>", "</i> ", string)
+    string = get_regex(r"<i>\s+").sub(" <i>", string)
+    string = get_regex(r"\s+</i>").sub("</i> ", string)
     string = string.replace("</i>-<i>", "-")
     string = string.replace("<i>-</i>", "-")
-    string = re.sub(r"\s*</i>\s*$", "</i>\n", string)
-    string = re.sub(r"^\s*<i>\s*", "<i>", string)
-    string = re.sub(r"\s*\"\s*</i>$", "\"</i>", string)
-    string = re.sub(r"<i>\s*\"\s*", "<i>\"", string)
-    string = re.sub(r"</i>(\s?)<i>", r"\1", string)
-    string = re.sub(r"<i>(\s?)</i>", r"\1", string)
+    string = get_regex(r"\s*</i>\s*$").sub("</i>\n", string)
+    string = get_regex(r"^\s*<i>\s*").sub("<i>", string)
+    string = get_regex(r"\s*\"\s*</i>$").sub("\"</i>", string)
+    string = get_regex(r"<i>\s*\"\s*").sub("<i>\"", string)
+    string = get_regex(r"</i>(\s?)<i>").sub(r"\1", string)
+    string = get_regex(r"<i>(\s?)</i>").sub(r"\1", string)
 
     return string
 
@@ -702,27 +1277,26 @@ def fix_numbers(string):
     :param string: the string to fix.
     :return: string
     """
-    if not re.search(r"\d", string):
+    if not get_regex(r"\d").search(string):
         return string
 
-    string = re.sub(r"(?<=\d)\s(?=[\s\d])", "", string)
+    string = get_regex(r"(?<=\d)\s(?=[\s\d])").sub("", string)
 
     for word in get_csv_words(STRINGS_MAPS_DIRECTORY + 'number_succeeded_by_space_trusted.csv'):
-        suffix = r"\b)" if re.match(r"\w+", word) else ")"
-        string = re.sub(r"(?<=\d)\s*(?=" + word + suffix, "", string)
+        suffix = r"\b)" if get_regex(r"\w+").match(word) else ")"
+        string = get_regex(r"(?<=\d)\s*(?=" + word + suffix).sub("", string)
 
-    string = re.sub(r"(?<=\d)\s*([hH])\s*(?=\d)", r"\1", string)
+    string = get_regex(r"(?<=\d)\s*([hH])\s*(?=\d)").sub(r"\1", string)
 
     if not conf_is_unittest_exec:
-        if re.search(r"\d\d\d\d\d", string):
+        if get_regex(r"\d\d\d\d\d").search(string):
             print("Big number : " + string.replace("\n", ""))
 
-    while re.search(r"\b\d+\d\d\d\d\b", string):
-        string = re.sub(r"\b(\d+\d)(\d\d\d)\b", r"\1 \2", string)
+    string = get_regex(r"\b\d{5,}\b").sub(lambda match: group_thousands(match.group()), string)
 
     # Prompt if comma or dot
 
-    matches = list(re.finditer(r"(?<=\d)[.,]\s*(?=(?!000)\d)", string))
+    matches = list(get_regex(r"(?<=\d)[.,]\s*(?=(?!000)\d)").finditer(string))
     prompt_results = []
 
     if len(matches) > 0:
@@ -732,12 +1306,11 @@ def fix_numbers(string):
         for i in range(0, len(matches)):
             result = matches[i]
 
-            if conf_auto_skip_everything:
-                prompt = ":q"
-            else:
-                prompt = input("Found number space in : " + string[:result.start() - 1] +
-                               SHELL_COLOR_WARNING + string[result.start() - 1:result.end() + 1] + SHELL_COLOR_END +
-                               string[result.end() + 1:].replace("\n", "") + " : ")
+            decision = {"kind": "number", "line": string, "candidate": string[result.start():result.end()],
+                        "offset": result.start()}
+            prompt = prompt_user("Found number space in : " + string[:result.start() - 1] +
+                                 SHELL_COLOR_WARNING + string[result.start() - 1:result.end() + 1] + SHELL_COLOR_END +
+                                 string[result.end() + 1:].replace("\n", "") + " : ", ":q", decision)
 
             prompt_results.append(prompt == ":x")
 
@@ -757,29 +1330,67 @@ def fix_l_to_capital_i(string):
     :param string: the string to fix.
     :return: string
     """
-    while re.search(UPPER_CASE + r"l+" + UPPER_CASE, string):
-        string = re.sub(r"(?<=" + UPPER_CASE + r")l(?=l*" + UPPER_CASE + r")", "I", string)
+    if "l" not in string:
+        return string
+
+    string = get_regex(r"(?<=" + UPPER_CASE + r")l+(?=" + UPPER_CASE + r")").sub(lambda match: "I" * len(match.group()),
+                                                                                  string)
 
-    regex_l_before_uppercase = r"l(?=" + UPPER_CASE + r"{2})"
-    while re.search(regex_l_before_uppercase, string):
-        string = re.sub(regex_l_before_uppercase, "I", string)
+    # Every fixed l can make the previous (or next) one fixable : fixing from the right (or left) settles it at once
+    if get_regex(r"l(?=" + UPPER_CASE + r"{2})").search(string):
+        string = fix_l_between_uppercase(string, True)
 
-    regex_l_after_two_uppercase = r"(?<=" + UPPER_CASE + r"{2})l"
-    while re.search(regex_l_after_two_uppercase, string):
-        string = re.sub(regex_l_after_two_uppercase, "I", string)
+    if get_regex(r"(?<=" + UPPER_CASE + r"{2})l").search(string):
+        string = fix_l_between_uppercase(string, False)
 
-    string = re.sub(r"\bl(?=" + LOWER_CASE_CONSONNANT + r"{2}|n|m)", "I", string)
+    string = get_regex(r"\bl(?=" + LOWER_CASE_CONSONNANT + r"{2}|n|m)").sub("I", string)
 
-    roman_numbers_matches = [(m.start(0), m.end(0)) for m in re.finditer(r"\b[MLDCVXIl]{3,}\b", string)]
+    roman_numbers_matches = [(m.start(0), m.end(0)) for m in get_regex(r"\b[MLDCVXIl]{3,}\b").finditer(string)]
     for match in roman_numbers_matches:
         string = string[:match[0]] + string[match[0]:match[1]].replace("l", "I") + string[match[1]:]
 
     return string
 
 
+def fix_l_between_uppercase(string, is_followed):
+    """Switches with I every l followed (or preceded) by two uppercase letters, I switched just before included.
+
+    :param string: the string to fix.
+    :param is_followed: boolean, True to check the two next chars, False to check the two previous ones.
+    :return: string
+    """
+    chars = list(string)
+    upper_case_regex = get_regex(UPPER_CASE)
+    indexes = reversed(range(0, len(chars) - 2)) if is_followed else range(2, len(chars))
+    step = 1 if is_followed else -1
+
+    for i in indexes:
+        if chars[i] == "l" and upper_case_regex.match(chars[i + step]) and upper_case_regex.match(chars[i + 2 * step]):
+            chars[i] = "I"
+
+    return "".join(chars)
+
+
+def group_thousands(digits):
+    """Splits digits by groups of three, from the right, until the first group is four digits long or less.
+
+    :param digits: string, the number to split.
+    :return: string
+    """
+    first_group_size = len(digits)
+    while first_group_size > 4:
+        first_group_size -= 3
+
+    result = digits[:first_group_size]
+    for i in range(first_group_size, len(digits), 3):
+        result += " " + digits[i:i + 3]
+
+    return result
+
+
 def warn_weird_char(string):
     if not conf_is_unittest_exec:
-        if re.search("[^a-zA-Z0-9éèàùçÇêâÊÉÈÀÂîïÎôÔûœÛ.,:\" </>'!?-]", string[:-1]):
+        if get_regex("[^a-zA-Z0-9éèàùçÇêâÊÉÈÀÂîïÎôÔûœÛ.,:\" </>'!?-]").search(string[:-1]):
             print(SHELL_COLOR_WARNING + "Weird char in : " + string[:-1] + SHELL_COLOR_END)
 
 
@@ -823,7 +1434,7 @@ def fix_empty_lines(strings):
     filtered_strings = []
 
     for string in strings:
-        if not re.match(r"^(?:\s|<i>)*-?(?:\s|</i>)*$", string):
+        if not get_regex(r"^(?:\s|<i>)*-?(?:\s|</i>)*$").match(string):
             filtered_strings.append(string)
 
     return filtered_strings
@@ -851,8 +1462,8 @@ def fix_redundant_italic_tag(strings):
             strings[i] = strings[i] + "</i>"
 
     for i in range(0, len(strings)):
-        strings[i] = re.sub(r"<i>(\s*)</i>", r"\1", strings[i])
-        strings[i] = re.sub(r"</i>(\s*)<i>", r"\1", strings[i])
+        strings[i] = get_regex(r"<i>(\s*)</i>").sub(r"\1", strings[i])
+        strings[i] = get_regex(r"</i>(\s*)<i>").sub(r"\1", strings[i])
 
     for i in range(0, len(strings) - 1):
         if strings[i].endswith("</i>\n") and strings[i + 1].startswith("<i>"):
@@ -871,15 +1482,15 @@ def fix_useless_dialog_hyphen(strings):
     if len(strings) == 0:
         return strings
 
-    if re.match(START_WITH_HYPHEN_REGEX, strings[0]):
+    if get_regex(START_WITH_HYPHEN_REGEX).match(strings[0]):
 
         has_other_hyphen = False
         for i in range(1, len(strings)):
-            if re.match(START_WITH_HYPHEN_REGEX, strings[i]):
+            if get_regex(START_WITH_HYPHEN_REGEX).match(strings[i]):
                 has_other_hyphen = True
 
         if not has_other_hyphen:
-            strings[0] = re.sub(START_WITH_HYPHEN_REGEX, r"\1\2", strings[0])
+            strings[0] = get_regex(START_WITH_HYPHEN_REGEX).sub(r"\1\2", strings[0])
 
     return strings
 
@@ -894,12 +1505,12 @@ def fix_missing_dialog_hyphen(strings):
     last_dialog_subtitle_index = -1
 
     for i in reversed(range(0, len(strings))):
-        if re.match(START_WITH_HYPHEN_REGEX, strings[i]):
+        if get_regex(START_WITH_HYPHEN_REGEX).match(strings[i]):
             last_dialog_subtitle_index = i
             break
 
     for i in range(0, last_dialog_subtitle_index):
-        if not re.match(START_WITH_HYPHEN_REGEX, strings[i]):
+        if not get_regex(START_WITH_HYPHEN_REGEX).match(strings[i]):
             strings[i] = "- " + strings[i]
             break
 
@@ -917,7 +1528,7 @@ def fix_double_quotes_errors(strings):
 
     quotes_count = 0
     for i in range(0, len(strings)):
-        quotes_count += len(re.findall(r"\"", strings[i]))
+        quotes_count += len(get_regex(r"\"").findall(strings[i]))
 
     if quotes_count == 0:
         return strings
@@ -928,16 +1539,16 @@ def fix_double_quotes_errors(strings):
     double_quote_pending = False
     for i in range(0, len(strings)):
 
-        if re.match(START_WITH_QUOTES, strings[i]):
+        if get_regex(START_WITH_QUOTES).match(strings[i]):
             double_quote_pending = True
 
-        current_quote_count += len(re.findall(r"\"", strings[i]))
+        current_quote_count += len(get_regex(r"\"").findall(strings[i]))
         if (current_quote_count % 2) == 0:
             double_quote_pending = False
 
         if double_quote_pending:
-            if (i + 1) == len(strings) or re.match(START_WITH_HYPHEN_REGEX, strings[i + 1]):
-                strings[i] = re.sub(SENTENCE_REGEX, r'\1\2"\3', strings[i])
+            if (i + 1) == len(strings) or get_regex(START_WITH_HYPHEN_REGEX).match(strings[i + 1]):
+                strings[i] = get_regex(SENTENCE_REGEX).sub(r'\1\2"\3', strings[i])
                 double_quote_pending = False
 
     # Preceeded fixes
@@ -946,23 +1557,23 @@ def fix_double_quotes_errors(strings):
     double_quote_pending = False
     for i in reversed(range(0, len(strings))):
 
-        if re.match(ENDS_WITH_QUOTES, strings[i]):
+        if get_regex(ENDS_WITH_QUOTES).match(strings[i]):
             double_quote_pending = True
 
-        current_quote_count += len(re.findall(r"\"", strings[i]))
+        current_quote_count += len(get_regex(r"\"").findall(strings[i]))
         if (current_quote_count % 2) == 0:
             double_quote_pending = False
 
         if double_quote_pending:
-            if i == 0 or re.match(START_WITH_HYPHEN_REGEX, strings[i]):
-                strings[i] = re.sub(SENTENCE_REGEX, r'\1"\2\3', strings[i])
+            if i == 0 or get_regex(START_WITH_HYPHEN_REGEX).match(strings[i]):
+                strings[i] = get_regex(SENTENCE_REGEX).sub(r'\1"\2\3', strings[i])
                 double_quote_pending = False
 
     # One-line fixes
 
     for i in range(0, len(strings)):
-        if not (re.match(START_WITH_QUOTES, strings[i]) and re.match(ENDS_WITH_QUOTES, strings[i])):
-            strings[i] = re.sub(r'"([\w\s]+)([,.])"', r'"\1"\2', strings[i])
+        if not (get_regex(START_WITH_QUOTES).match(strings[i]) and get_regex(ENDS_WITH_QUOTES).match(strings[i])):
+            strings[i] = get_regex(r'"([\w\s]+)([,.])"').sub(r'"\1"\2', strings[i])
 
     return strings
 
@@ -975,39 +1586,41 @@ def fix_sdh_tags(strings):
     """
     # Character dialogs
 
-    dialog_character_regex = r"^((?:<i>\s*|\"\s*)*)((?:-(?!\s*-)\s*)?)((?:<i>)?)(" + SDH_CHARS + r"(?:(?<!\d):|:(?!\d\d\b))\s*)"
-
     is_dialog = len(strings) > 1
     for i in range(0, len(strings)):
-        if not re.match(START_WITH_HYPHEN_REGEX, strings[i]) and not re.match(dialog_character_regex, strings[i]):
+        if not get_regex(START_WITH_HYPHEN_REGEX).match(strings[i]) \
+                and not get_regex(DIALOG_CHARACTER_REGEX).match(strings[i]):
             is_dialog = False
 
     for i in range(0, len(strings)):
-        strings[i] = re.sub(dialog_character_regex, r"\1- \3" if is_dialog or i > 0 else r"\1\2\3", strings[i])
-        strings[i] = re.sub(r"^((?:<i>|\"|\s))*(-?\s*)[\[(][A-ZÉÈÀÙÇÊÂÛÎÏÜ\s'\"-]+[\])] *(.*?)$", r"\1\2\3", strings[i])
-        strings[i] = re.sub(r"^(.*?)[\[(][A-ZÉÈÀÙÇÊÂÛÎÏÜ\s'\"-]+[\])](\s*$)", r"\1\2", strings[i])
+        strings[i] = get_regex(DIALOG_CHARACTER_REGEX).sub(r"\1- \3" if is_dialog or i > 0 else r"\1\2\3", strings[i])
+        strings[i] = get_regex(SDH_START_TAG_REGEX).sub(r"\1\2\3", strings[i])
+        strings[i] = get_regex(SDH_END_TAG_REGEX).sub(r"\1\2", strings[i])
 
     # Music tags
 
+    music_start_regex = get_regex(r"^(?:<i>)?\s*-?(?:<i>)?\s*\?")
+    music_end_regex = get_regex(r".*?\?\s*(?:</i>)?\s*$")
+
     for i in range(0, len(strings)):
-        if re.match(r"^(?:<i>)?\s*-?(?:<i>)?\s*\?", strings[i]) and re.match(r".*?\?\s*(?:</i>)?\s*$", strings[i]):
+        if music_start_regex.match(strings[i]) and music_end_regex.match(strings[i]):
             strings[i] = "\n"
 
     if len(strings) > 0:
-        if re.match(r"^(?:<i>)?\s*-?(?:<i>)?\s*\?", strings[0]) and re.match(r".*?\?\s*(?:</i>)?\s*$", strings[len(strings) - 1]):
+        if music_start_regex.match(strings[0]) and music_end_regex.match(strings[len(strings) - 1]):
             strings = ["\n"]
 
     # Sound tags
 
     for i in range(0, len(strings)):
-        strings[i] = re.sub(r"\[" + SDH_CHARS + r"\] *", "", strings[i])
+        strings[i] = get_regex(r"\[" + SDH_CHARS + r"\] *").sub("", strings[i])
 
     test_string = ""
     for i in range(0, len(strings)):
         test_string += strings[i]
 
     test_string.replace("\n", "")
-    if re.match(r"^(?:<i>)?[\[(]" + SDH_CHARS + r"[\])](?:</i>)?$", test_string):
+    if get_regex(r"^(?:<i>)?[\[(]" + SDH_CHARS + r"[\])](?:</i>)?$").match(test_string):
         strings = [""]
 
     return strings
@@ -1024,21 +1637,21 @@ def fix_multi_line_errors(lines):
     """
 
     if conf_fix_3d_doubles:
-        lines = fix_3d_doubles(lines)
+        lines = run_fixer(fix_3d_doubles, lines)
 
-    lines = fix_double_quotes_errors(lines)
+    lines = run_fixer(fix_double_quotes_errors, lines)
 
     if conf_fix_sdh_tags:
-        lines = fix_sdh_tags(lines)
+        lines = run_fixer(fix_sdh_tags, lines)
 
     if len(lines) > 1:
-        lines = fix_empty_lines(lines)
-        lines = fix_redundant_italic_tag(lines)
-        lines = fix_missing_dialog_hyphen(lines)
-        lines = fix_useless_dialog_hyphen(lines)
-        lines = fix_double_quotes_errors(lines)
+        lines = run_fixer(fix_empty_lines, lines)
+        lines = run_fixer(fix_redundant_italic_tag, lines)
+        lines = run_fixer(fix_missing_dialog_hyphen, lines)
+        lines = run_fixer(fix_useless_dialog_hyphen, lines)
+        lines = run_fixer(fix_double_quotes_errors, lines)
 
-    lines = fix_useless_dialog_hyphen(lines)
+    lines = run_fixer(fix_useless_dialog_hyphen, lines)
 
     is_closed = False
     if len(lines) > 0 and lines[0].startswith("<i>"):
@@ -1051,34 +1664,247 @@ def fix_multi_line_errors(lines):
 
 
 def fix_single_line_errors(string, language):
+    """Every fixes defined here, memoized when line_cache_size is set, unless fixers are profiled.
+    Lines reaching a prompt are always fixed again, so are lines fixed with other StringsMaps.
+
+    :param string: the string to fix.
+    :param language: current language correction
+    :return: string
+    """
+    if not is_line_cache_enabled():
+        return apply_single_line_fixes(string, language)
+
+    key = get_line_cache_key(string, language)
+    result = get_cached_line(key)
+
+    if result is not None:
+        return result
+
+    prompts_count = PROMPT_STATS["count"]
+    result = apply_single_line_fixes(string, language)
+    cache_line(key, result, PROMPT_STATS["count"] != prompts_count)
+
+    return result
+
+
+def is_line_cache_enabled():
+    """True if fixed lines are memoized : never while fixers are profiled, as a memoized line runs no fixer.
+
+    :return: boolean
+    """
+    return conf_line_cache_size > 0 and not conf_profile_fixers
+
+
+def get_line_cache_key(string, language):
+    """Line memo key : the line is fixed again with other StringsMaps.
+
+    :param string: the string to fix.
+    :param language: current language correction
+    :return: tuple
+    """
+    return string, language, STRINGS_MAPS_STATE["version"]
+
+
+def get_cached_line(key):
+    """Fixed line from the line memo, counted as a hit.
+
+    :param key: tuple, from get_line_cache_key
+    :return: string, or None when the line is not memoized
+    """
+    result = LINE_CACHE.get(key)
+
+    if result is not None:
+        LINE_CACHE_STATS["hits"] += 1
+        LINE_CACHE.move_to_end(key)
+
+    return result
+
+
+def cache_line(key, result, is_prompted):
+    """Memoizes a fixed line, unless it reached a prompt, dropping the least recently used line when full.
+
+    :param key: tuple, from get_line_cache_key
+    :param result: string, the fixed line
+    :param is_prompted: boolean, True when fixing the line reached a prompt
+    """
+    if is_prompted:
+        LINE_CACHE_STATS["bypassed"] += 1
+        return
+
+    LINE_CACHE_STATS["misses"] += 1
+    LINE_CACHE[key] = result
+    if len(LINE_CACHE) > conf_line_cache_size:
+        LINE_CACHE.popitem(last=False)
+
+    return
+
+
+def get_line_cache_stats():
+    """Line memo usage.
+
+    :return: dict, with hits, misses, bypassed (lines reaching a prompt), size and hit rate
+    """
+    calls = LINE_CACHE_STATS["hits"] + LINE_CACHE_STATS["misses"] + LINE_CACHE_STATS["bypassed"]
+
+    return {"hits": LINE_CACHE_STATS["hits"], "misses": LINE_CACHE_STATS["misses"],
+            "bypassed": LINE_CACHE_STATS["bypassed"], "size": len(LINE_CACHE),
+            "hit_rate": LINE_CACHE_STATS["hits"] / calls if calls else 0.0}
+
+
+def apply_single_line_fixes(string, language):
     """Every fixes defined here.
 
     :param string: the string to fix.
     :param language: current language correction
     :return: string
     """
+    for fixer, args, name, gate in get_single_line_fixers(language):
+        string = run_fixer(fixer, string, *args, name=name)
+
+    warn_weird_char(string)
+    return string
+
+
+def get_single_line_fixers(language):
+    """Ordered fixers of apply_single_line_fixes, as tuples (fixer, args, name, gate).
+    The gate is a regex matching every line the fixer can change or print something about, or a function returning
+    it, or None for every line. Gates have neither lookaround nor anchor : they match a line the same way in a whole
+    track buffer.
+
+    :param language: current language correction
+    :return: list of tuples
+    """
+    if language in SINGLE_LINE_FIXERS_CACHE:
+        return SINGLE_LINE_FIXERS_CACHE[language]
+
+    fixers = []
 
     if language == "fr":
-        string = fix_accentuated_capital_a(string)
-
-    string = fix_common_errors(string)
-    string = fix_punctuation_errors(string)
-    string = fix_numbers(string)
-    string = fix_italic_tag_errors(string)
-    string = fix_colon(string, language)
-    string = fix_capital_i_to_l(string, language)
-    string = fix_zero_to_o(string)
-    string = fix_l_to_capital_i(string)
-    string = fix_acronyms(string)
-    string = fix_common_misspells(string, language)
+        fixers.append((fix_accentuated_capital_a, (), None, get_regex(r"A")))
+
+    fixers += [(fix_common_errors, (), None, get_regex(r"- \\|[’”“–]| [)\]]|[(\[] ")),
+               (fix_punctuation_errors, (), None, get_regex(r"\.|--")),
+               (fix_numbers, (), None, get_regex(r"\d")),
+               (fix_italic_tag_errors, (), None, get_regex(r"</?i>")),
+               (fix_colon, (language,), None, get_regex(r":")),
+               (fix_capital_i_to_l, (language,), None, get_regex(r"I")),
+               (fix_zero_to_o, (), None, get_regex(r"0")),
+               (fix_l_to_capital_i, (), None, get_regex(r"l")),
+               (fix_acronyms, (), None, get_regex(r"\.")),
+               (fix_common_misspells, (language,), None, get_misspells_gate)]
 
     for letter in ["f", "A", "C", "G", "W", "Z", "V", "W", "Y", "Z"]:
-        string = fix_letter_followed_by_space(string, letter, language)
+        fixers.append((fix_letter_followed_by_space, (letter, language),
+                       "fix_letter_followed_by_space(" + letter + ")", get_regex(re.escape(letter + " "))))
 
-    string = fix_quotes(string, language)
-    string = fix_punctuation_spaces(string, language)
-    string = fix_degree_symbol(string)
-    string = fix_dialog_hyphen(string)
+    fixers += [(fix_quotes, (language,), None, get_regex(r"''|[‘’]|\s'|'\s")),
+               (fix_punctuation_spaces, (language,), None, get_regex(r"[?!]")),
+               (fix_degree_symbol, (), None, get_regex(r"°")),
+               (fix_dialog_hyphen, (), None, get_regex(r"-"))]
 
-    warn_weird_char(string)
-    return string
+    SINGLE_LINE_FIXERS_CACHE[language] = fixers
+    return fixers
+
+
+def get_misspells_gate(language):
+    """fix_common_misspells gate : its engine regex, unless a learned misspell has a lookaround or an anchor.
+
+    :param language: current language correction
+    :return: compiled regex, or None to check every line
+    """
+    regex = get_misspells_engine(STRINGS_MAPS_DIRECTORY + 'common_misspells.csv', language)[0]
+
+    if regex is None:
+        return get_regex(r"(?!)")
+
+    if "(?" in regex.pattern.replace("(?:", "") or "^" in regex.pattern or "$" in regex.pattern:
+        return None
+
+    return regex
+
+
+def get_gated_lines(gate, lines):
+    """Lines matching a gate, found in a single scan of the whole track buffer.
+
+    :param gate: compiled regex, without lookaround nor anchor
+    :param lines: list of string
+    :return: list of int, the indexes of the matching lines
+    """
+    starts = []
+    position = 0
+    for line in lines:
+        starts.append(position)
+        position += len(line) + 1
+
+    buffer = "\n".join(lines)
+    indexes = []
+    match = gate.search(buffer)
+
+    while match is not None:
+        index = bisect.bisect_right(starts, match.start()) - 1
+        indexes.append(index)
+        if index + 1 >= len(starts):
+            break
+        match = gate.search(buffer, starts[index + 1])
+
+    return indexes
+
+
+def fix_track(subtitles, language):
+    """Every single line fixes, on every line of a track at once.
+    Lines are the same as with fix_single_line_errors on each line, as long as no answer is learned meanwhile
+    (auto_skip_everything or queue_decisions) : prompts come fixer by fixer, instead of line by line.
+    Each fixer only runs on the lines matching its gate.
+
+    :param subtitles: list of Subtitle, fixed in place
+    :param language: current language correction
+    """
+    lines = []
+    cues = []
+
+    for subtitle in subtitles:
+        lines += subtitle.get_lines()
+        cues += [subtitle.get_number().strip()] * len(subtitle.get_lines())
+
+    keys = [get_line_cache_key(line, language) for line in lines]
+    fixed_lines = [None] * len(lines)
+    pending_indexes = []
+
+    is_cached = is_line_cache_enabled()
+    for index, key in enumerate(keys):
+        if is_cached:
+            fixed_lines[index] = get_cached_line(key)
+        if fixed_lines[index] is None:
+            pending_indexes.append(index)
+
+    pending_lines = [lines[index] for index in pending_indexes]
+    prompted_lines = set()
+
+    for fixer, args, name, gate in get_single_line_fixers(language):
+        if callable(gate):
+            gate = gate(language)
+
+        gated_indexes = get_gated_lines(gate, pending_lines) if gate is not None else range(0, len(pending_lines))
+        count_skipped_fixer_calls(fixer, len(pending_lines) - len(gated_indexes), name=name)
+
+        for index in gated_indexes:
+            DECISION_CONTEXT["cue"] = cues[pending_indexes[index]]
+            prompts_count = PROMPT_STATS["count"]
+            pending_lines[index] = run_fixer(fixer, pending_lines[index], *args, name=name)
+            if PROMPT_STATS["count"] != prompts_count:
+                prompted_lines.add(index)
+
+    for index, line in enumerate(pending_lines):
+        warn_weird_char(line)
+        fixed_lines[pending_indexes[index]] = line
+
+        if is_cached:
+            cache_line(keys[pending_indexes[index]], line, index in prompted_lines)
+
+    position = 0
+    for subtitle in subtitles:
+        lines_count = len(subtitle.get_lines())
+        subtitle.set_lines(fixed_lines[position:position + lines_count])
+        position += lines_count
+
+    return
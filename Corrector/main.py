@@ -19,22 +19,56 @@
 
 __version__ = "0.2.0"
 
-from tkinter import Menu, Listbox, END, Label, Tk           # GUI, needs python3-tk package on Linux
 import locale                                               # get current system language
-from tkinter.filedialog import LoadFileDialog
+import codecs                                               # UTF-8 BOM
+import collections                                          # pending writes
+import concurrent.futures                                   # parallel correction
+import contextlib                                           # workers output capture
 import datetime
+import hashlib                                              # result cache keys
+import io                                                   # workers output capture
 from Corrector.Models.Subtitle import *
+from Corrector.Models.MappedSubtitle import MappedSubtitle
 from Corrector.Utils.FileUtils import *
 from Corrector.Utils.StringsUtils import *
-
-
-config = configparser.ConfigParser()
-config.read('config.ini', encoding='utf-8')
-
-conf_root_path = config["PARAMETERS"]['root_path']
+from Corrector.Utils import StringsUtils
+from Corrector.Settings import Settings
+
+
+conf_root_path = ""
+conf_parallel_workers = 0
+conf_forced_subtitles_tolerance = None
+conf_profile_fixers_report = ""
+conf_result_cache = False
+conf_pipeline_depth = 0
+
+RESULT_CACHE_FILE_NAME = ".stac_cache.json"
+DECISIONS_FILE_NAME = ".stac_decisions.jsonl"
+
+
+def configure(settings):
+    """Reads the main and StringsUtils parameters from config.ini.
+
+    :param settings: Settings
+    """
+    global conf_root_path, conf_parallel_workers, conf_forced_subtitles_tolerance, conf_profile_fixers_report, \
+        conf_result_cache, conf_pipeline_depth
+
+    conf_root_path = settings.get('root_path')
+    conf_parallel_workers = settings.get_int('parallel_workers', 0)
+    conf_forced_subtitles_tolerance = None
+    if settings.get_bool('forced_subtitles_overlap'):
+        conf_forced_subtitles_tolerance = settings.get_int('forced_subtitles_tolerance', 0)
+    conf_profile_fixers_report = settings.get('profile_fixers_report')
+    conf_result_cache = settings.get_bool('result_cache')
+    conf_pipeline_depth = settings.get_int('pipeline_depth', 0)
+    StringsUtils.apply_settings(settings)
+    return
 
 
 def build_menus(root):
+    from tkinter import Menu             # GUI, needs python3-tk package on Linux
+
     main_menu = Menu(root, tearoff=0)
     file_menu = Menu(main_menu, tearoff=0)
     file_menu.add_command(label=translate("Exit"), command=root.quit)
@@ -44,6 +78,8 @@ def build_menus(root):
 
 
 def build_main_panel(root, path):
+    from tkinter import Listbox, END, Label
+
     listbox = Listbox(root)
     listbox.pack()
 
@@ -56,6 +92,8 @@ def build_main_panel(root, path):
 
 
 def build_and_launch_interface():
+    from tkinter import Tk
+
     root = Tk()
     build_menus(root)
     build_main_panel(root, "C:/")
@@ -64,6 +102,8 @@ def build_and_launch_interface():
 
 
 def open_files(root):
+    from tkinter.filedialog import LoadFileDialog
+
     LoadFileDialog.files_select_event(root, None)
     return
 
@@ -100,97 +140,460 @@ def translate(string):
 # backup_file(file)
 
 
-start = datetime.datetime.now()
+def correct_subtitle_lines(subtitle):
+    """Multi lines fixes of a subtitle, warning about subtitles still longer than two lines.
+
+    :param subtitle: Subtitle, fixed in place
+    """
+    DECISION_CONTEXT["cue"] = subtitle.get_number().strip()
+    corrected_lines = fix_multi_line_errors(subtitle.lines)
+    subtitle.set_lines(corrected_lines)
+
+    if len(subtitle.get_lines()) > 2:
+        print("Wrong subtitle size : " + str(subtitle.get_lines()))
+
+    return
+
+
+def correct_subtitles(subtitles, forced_subtitles, language):
+    """Fixes every subtitle lines, and copies {\\an8} tags from the forced subtitles.
+
+    :param subtitles: list of Subtitle, fixed in place
+    :param forced_subtitles: list of Subtitle, forced subtitles of the same movie
+    :param language: current language correction
+    """
+    forced_index = Subtitle.time_index([forced_subtitle for forced_subtitle in forced_subtitles
+                                        if len(forced_subtitle.lines) > 0
+                                        and forced_subtitle.lines[0].startswith("{\\an8}")])
+
+    # Without any learned answer, the whole track is fixed at once, after every multi lines fix
+    is_track_fixed = StringsUtils.conf_auto_skip_everything or StringsUtils.conf_queue_decisions
+    if is_track_fixed:
+        for subtitle in subtitles:
+            correct_subtitle_lines(subtitle)
+        fix_track(subtitles, language)
+
+    for subtitle in subtitles:
+
+        if not is_track_fixed:
+            correct_subtitle_lines(subtitle)
+
+        DECISION_CONTEXT["cue"] = subtitle.get_number().strip()
+        corrected_lines = []
+        for line in subtitle.get_lines():
+
+            if not is_track_fixed:
+                line = fix_single_line_errors(line, language)
+            array = find_words_with_char(line, "I", language)
+            array = remove_all_uppercase_words(array)
+            line = ask_for_correction(line, array, "I_trusted.csv", language)
+
+            pretty_number = subtitle.get_number().replace("\n", "")
+            pretty_line = line.replace("\n", "")
+
+            if "£" in line:
+                print(SHELL_COLOR_FAIL + "Found £ at " + pretty_number + SHELL_COLOR_END + " : " + pretty_line)
+
+            corrected_lines.append(line)
+
+        if len(corrected_lines) > 0 and not corrected_lines[0].startswith("{\\an8}"):
+            if Subtitle.find_in_time_index(forced_index, subtitle, conf_forced_subtitles_tolerance):
+                corrected_lines[0] = "{\\an8}" + corrected_lines[0]
+
+        subtitle.set_lines(corrected_lines)
+
+    return
+
+
+def get_saved_subtitles(subtitles):
+    """Subtitles to save, without empty and duplicated subtitles.
+
+    :param subtitles: list of Subtitle
+    :return: generator of Subtitle
+    """
+    previous = None
+
+    for subtitle in subtitles:
+        if len(subtitle.lines) == 1 and re.match(r"^\s*\n*$", subtitle.lines[0]):
+            print("Empty subtitle found")
+        elif previous and previous.has_same_time_code(subtitle):
+            print("Duplicate found")
+        elif len(subtitle.lines) > 0:
+            yield subtitle
+
+        previous = subtitle
+
+
+def subtitles_to_lines(subtitles):
+    """Subtitles file content, without empty and duplicated subtitles.
+
+    :param subtitles: list of Subtitle
+    :return: list of string
+    """
+    new_lines = []
+
+    for subtitle in get_saved_subtitles(subtitles):
+        new_lines += subtitle.to_lines()
+        new_lines.append("\n")
+
+    return new_lines
+
+
+def subtitles_to_data(subtitles):
+    """Subtitles file bytes, without empty and duplicated subtitles, as write_file would save subtitles_to_lines.
+    Untouched memory-mapped subtitles are copied from the file bytes they were parsed from.
+
+    :param subtitles: list of Subtitle
+    :return: bytes
+    """
+    data = b"".join(subtitle.to_data() for subtitle in get_saved_subtitles(subtitles))
+    return codecs.BOM_UTF8 + data if data else b""
+
+
+def read_subtitles(file):
+    """Parses the given subtitles file, memory-mapped when in UTF-8.
 
-files = get_files_with_type(get_all_files(conf_root_path, 0), "srt")
-for file in files:
-    clean_space_in_filename(file)
+    :param file: string, the subtitles file path
+    :return: list of Subtitle
+    """
+    return MappedSubtitle.subtitles_from_file(file)
 
-prompt = input("script ou libre ? ")
 
-files = get_files_with_type(get_all_files(conf_root_path, 0), "srt")
-for file in files:
-    # backup_file(file)
-    lines = get_file_text(file, True)
-    print(SHELL_COLOR_BOLD + file + " (" + str(len(lines)) + " lines)" + SHELL_COLOR_END)
+def correct_file(file, read=read_subtitles, write=write_file_data):
+    """Parses, fixes and saves the given subtitles file.
+
+    :param file: string, the subtitles file path
+    :param read: function, reading the subtitles of a file path
+    :param write: function, saving the bytes of a file path
+    :return: string, the result summary
+    """
+    print(SHELL_COLOR_BOLD + file + SHELL_COLOR_END)
     current_language = get_file_language(file)
+    DECISION_CONTEXT.update({"file": file, "cue": None, "language": current_language})
+
+    try:
+        subtitles = read(file)
+
+        forced_subtitles = []
+        if "[fre]" in file:
+            forced_file = file.replace("[fre]", "[mis]")
+            if os.path.exists(forced_file):
+                forced_subtitles = read_subtitles(forced_file)
+
+        correct_subtitles(subtitles, forced_subtitles, current_language)
+        write(file, subtitles_to_data(subtitles))
+
+    except ValueError as err:
+        print(SHELL_COLOR_FAIL + "Parsing error : " + str(err) + SHELL_COLOR_END)
+        return "Parsing error : " + str(err)
+
+    return str(len(subtitles)) + " subtitles"
+
+
+def correct_files_pipelined(files, depth):
+    """Fixes every given file in order, as a serial run, while threads read and parse the next files,
+    and save the fixed ones. At most depth files are read ahead, and at most depth fixed files wait for their write.
+    A forced subtitles file is only read once its own pending write is done.
+    A failed write replaces the result summary of its file, and the run keeps going.
+
+    :param files: list of string, the subtitles file paths
+    :param depth: int, the read-ahead and write-behind queues size
+    :return: dict, file path to its result summary
+    """
+    results = {}
+    read_futures = {}
+    write_futures = collections.OrderedDict()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=depth) as reader, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=1) as writer:
+
+        def queue_write(path, data):
+            write_futures[path] = writer.submit(write_file_data, path, data)
+
+        def wait_write(path):
+            try:
+                write_futures.pop(path).result()
+            except OSError as err:
+                print(SHELL_COLOR_FAIL + "Writing error : " + path + " : " + str(err) + SHELL_COLOR_END)
+                results[path] = "Writing error : " + str(err)
+
+        for index, file in enumerate(files):
+            for next_file in files[index:index + depth + 1]:
+                if next_file not in read_futures and next_file not in results:
+                    read_futures[next_file] = reader.submit(read_subtitles, next_file)
+
+            forced_file = file.replace("[fre]", "[mis]")
+            if "[fre]" in file and forced_file in write_futures:
+                wait_write(forced_file)
+
+            read_future = read_futures.pop(file)
+            results[file] = correct_file(file, lambda path: read_future.result(), queue_write)
+
+            while len(write_futures) > depth:
+                wait_write(next(iter(write_futures)))
+
+        for path in list(write_futures):
+            wait_write(path)
+
+    return results
+
+
+def get_correction_context(is_parallel=False):
+    """Everything but the file itself that changes a correction result : version, config flags and StringsMaps.
+    Skipping or queuing prompts changes the result too : such files are corrected again in interactive runs.
+
+    :param is_parallel: bool, True for files corrected by correct_files_in_parallel, whose workers skip every prompt
+    :return: string
+    """
+    flags = [__version__, StringsUtils.conf_fix_sdh_tags, StringsUtils.conf_fix_3d_doubles,
+             conf_forced_subtitles_tolerance, StringsUtils.conf_auto_skip_everything or is_parallel,
+             StringsUtils.conf_queue_decisions]
+
+    return get_strings_maps_fingerprint() + ":" + ":".join(str(flag) for flag in flags)
+
+
+def get_result_cache_paths(file):
+    """The file and its forced subtitles file, if any : both change its correction result.
+
+    :param file: string, the subtitles file path
+    :return: list of string
+    """
+    forced_file = file.replace("[fre]", "[mis]")
+    if "[fre]" in file and os.path.exists(forced_file):
+        return [file, forced_file]
+
+    return [file]
+
+
+def get_result_cache_stat(file):
+    """Sizes and modification times of the file and its forced subtitles file, if any.
+
+    :param file: string, the subtitles file path
+    :return: list of list of int
+    """
+    stats = [os.stat(path) for path in get_result_cache_paths(file)]
+    return [[stat.st_size, stat.st_mtime_ns] for stat in stats]
+
+
+def get_result_cache_key(file, context):
+    """Hash of the file content, its forced subtitles file content, if any, and the correction context.
+
+    :param file: string, the subtitles file path
+    :param context: string, from get_correction_context
+    :return: string, hexadecimal
+    """
+    md5 = hashlib.md5(context.encode('utf-8'))
+
+    for path in get_result_cache_paths(file):
+        md5.update(get_md5(path))
+
+    return md5.hexdigest()
+
+
+def get_result_cache_entry(file, context):
+    """
+    :param file: string, the subtitles file path
+    :param context: string, from get_correction_context
+    :return: dict, with the context, the key from get_result_cache_key and the stat from get_result_cache_stat
+    """
+    return {"context": context, "key": get_result_cache_key(file, context), "stat": get_result_cache_stat(file)}
+
+
+def is_cached_file(file, result_cache, context):
+    """True if the file was already corrected in the same context by a previous run.
+    Files are only hashed when their size or modification time changed, or their forced subtitles file one.
+    The stat of a file found unchanged by its hash is refreshed in place.
+
+    :param file: string, the subtitles file path
+    :param result_cache: dict, file path to its get_result_cache_entry after its last correction
+    :param context: string, from get_correction_context
+    :return: boolean
+    """
+    entry = result_cache.get(file)
+    if not isinstance(entry, dict):
+        return False
+
+    stat = get_result_cache_stat(file)
+    if entry["stat"] == stat:
+        return entry["context"] == context
+
+    if entry["key"] != get_result_cache_key(file, context):
+        return False
+
+    entry["stat"] = stat
+    return True
+
+
+def filter_cached_files(files, result_cache, context):
+    """Files to correct, skipping those already corrected in the same context by a previous run.
+
+    :param files: list of string, the subtitles file paths
+    :param result_cache: dict, file path to its get_result_cache_entry after its last correction
+    :param context: string, from get_correction_context
+    :return: list of string
+    """
+    files_to_correct = [file for file in files if not is_cached_file(file, result_cache, context)]
+
+    if len(files_to_correct) < len(files):
+        print(str(len(files) - len(files_to_correct)) + " files already corrected, skipped")
+
+    return files_to_correct
+
+
+def update_result_cache(result_cache, files, results, context):
+    """Registers corrected files, once every correction is done : a forced subtitles file may have changed since.
+
+    :param result_cache: dict, file path to its get_result_cache_entry, updated in place
+    :param files: list of string, every subtitles file path, others are dropped from the cache
+    :param results: dict, file path to its correction summary, for files corrected in this run
+    :param context: string, from get_correction_context, before the corrections
+    """
+    kept_files = set(files)
+    for file in list(result_cache):
+        if file not in kept_files:
+            del result_cache[file]
+
+    for file, result in results.items():
+        if result.startswith("Parsing error") or result.startswith("Writing error"):
+            result_cache.pop(file, None)
+        else:
+            result_cache[file] = get_result_cache_entry(file, context)
+
+    return
+
+
+def init_worker(settings):
+    """Worker process initializer, run once per process : nothing can be prompted, and StringsMaps are loaded.
+    Misspells engines are only built for the languages met by this worker.
+
+    :param settings: Settings, already loaded by the main process
+    """
+    configure(settings)
+    StringsUtils.conf_auto_skip_everything = True
+
+    if not FILE_CACHE:
+        preload_strings_maps(languages=())
+
+    return
+
+
+def correct_file_in_worker(file):
+    """Worker process entry point, in a process set up by init_worker.
+
+    :param file: string, the subtitles file path
+    :return: tuple, the result summary, the fixers stats, the queued decisions and the printed output of this file
+    """
+    # Printed with the summary : outputs of concurrent workers would interleave
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = correct_file(file)
+
+    fixers_stats = dict(FIXERS_STATS)
+    FIXERS_STATS.clear()
+    decisions = list(DECISIONS)
+    del DECISIONS[:]
+
+    return result, fixers_stats, decisions, output.getvalue()
+
+
+def get_parallel_waves(files):
+    """Splits files in two waves, so every forced subtitles file is read in the same state as in a serial run.
+
+    :param files: list of string, the subtitles file paths, in the serial order
+    :return: tuple of lists of string
+    """
+    second_wave = set()
+
+    for index, file in enumerate(files):
+        forced_file = file.replace("[fre]", "[mis]")
+        if "[fre]" in file and forced_file in files:
+            second_wave.add(file if files.index(forced_file) < index else forced_file)
+
+    return [file for file in files if file not in second_wave], [file for file in files if file in second_wave]
 
-    if prompt.startswith("scri"):
 
-        try:
-            subtitles = Subtitle.subtitles_from_lines(lines)
-        # except ValueError as err:
-        #     #vprint(shell_color_fail + "Parsing error : " + str(err) + shell_color_end)
-        #     backup_file(file)
-        #     utf8_to_ansi(get_bak_file_name(file), file)
-        #     lines = get_file_text(file, True)
-        #     subtitles = Subtitle.subtitles_from_lines(lines)
+def correct_files_in_parallel(files, workers, settings):
+    """Fixes every given file in a process pool, without any prompt, then prints a summary,
+    with the output of each file correction. Output files are the same as a serial run with auto_skip_everything.
 
-            forced_subtitles = []
-            if "[fre]" in file:
-                forced_file = file.replace("[fre]", "[mis]")
-                if os.path.exists(forced_file):
-                    forced_lines = get_file_text(forced_file, True)
-                    forced_subtitles = Subtitle.subtitles_from_lines(forced_lines)
+    :param files: list of string, the subtitles file paths
+    :param workers: int, the process count, 0 to use every core
+    :param settings: Settings, passed to every worker
+    :return: dict, file path to its result summary
+    """
+    results = {}
+    outputs = {}
 
-            for subtitle in subtitles:
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers or None, initializer=init_worker,
+                                                initargs=(settings,)) as executor:
+        for wave in get_parallel_waves(files):
+            worker_results = executor.map(correct_file_in_worker, wave)
+            for file, (result, fixers_stats, decisions, output) in zip(wave, worker_results):
+                results[file] = result
+                outputs[file] = output
+                merge_fixers_stats(fixers_stats)
+                DECISIONS.extend(decisions)
 
-                corrected_lines = fix_multi_line_errors(subtitle.lines)
-                subtitle.set_lines(corrected_lines)
+    print(SHELL_COLOR_BOLD + "Summary" + SHELL_COLOR_END)
+    for file in files:
+        print(force_string_size(results[file], 20) + " " + file)
+        print(outputs[file], end="")
 
-                if len(subtitle.get_lines()) > 2:
-                    print("Wrong subtitle size : " + str(subtitle.get_lines()))
+    return results
 
-                corrected_lines = []
-                for line in subtitle.get_lines():
 
-                    line = fix_single_line_errors(line, current_language)
-                    array = find_words_with_char(line, "I", current_language)
-                    array = remove_all_uppercase_words(array)
-                    line = ask_for_correction(line, array, "I_trusted.csv", current_language)
+if __name__ == "__main__":
 
-                    pretty_number = subtitle.get_number().replace("\n", "")
-                    pretty_line = line.replace("\n", "")
+    start = datetime.datetime.now()
+    settings = Settings()
+    configure(settings)
 
-                    if "£" in line:
-                        print(SHELL_COLOR_FAIL + "Found £ at " + pretty_number + SHELL_COLOR_END + " : " + pretty_line)
+    # Renamed paths may already be listed, kept once in listing order
+    renamed_files = [clean_space_in_filename(file) for file in list(walk_files_with_type(conf_root_path, 0, "srt"))]
+    files = list(collections.OrderedDict.fromkeys(renamed_files))
 
-                    corrected_lines.append(line)
+    prompt = input("script, parallèle ou libre ? ")
 
-                for forced_subtitle in forced_subtitles:
-                    if subtitle.time_code == forced_subtitle.time_code:
-                        if len(forced_subtitle.lines) > 0 and len(corrected_lines) > 0:
-                            if forced_subtitle.lines[0].startswith("{\\an8}"):
-                                if not corrected_lines[0].startswith("{\\an8}"):
-                                    corrected_lines[0] = "{\\an8}" + corrected_lines[0]
+    all_files = files
+    results = {}
+    use_result_cache = conf_result_cache and prompt.startswith(("para", "scri"))
 
-                subtitle.set_lines(corrected_lines)
+    if use_result_cache:
+        result_cache_path = os.path.join(conf_root_path, RESULT_CACHE_FILE_NAME)
+        result_cache = load_json_file(result_cache_path, {})
+        correction_context = get_correction_context(prompt.startswith("para"))
+        files = filter_cached_files(files, result_cache, correction_context)
 
-            # Save file
+    if prompt.startswith("para"):
+        results = correct_files_in_parallel(files, conf_parallel_workers, settings)
+    elif prompt.startswith("scri") and conf_pipeline_depth > 0:
+        results = correct_files_pipelined(files, conf_pipeline_depth)
 
-            new_lines = []
-            previous = "-1"
+    for file in files:
+        # backup_file(file)
 
-            for subtitle in subtitles:
-                if len(subtitle.lines) == 1 and re.match(r"^\s*\n*$", subtitle.lines[0]):
-                    print("Empty subtitle found")
-                elif previous == subtitle.get_time_code():
-                    print("Duplicate found")
-                elif len(subtitle.lines) > 0:
-                    new_lines += subtitle.to_lines()
-                    new_lines.append("\n")
+        if prompt.startswith("scri") and conf_pipeline_depth <= 0:
+            results[file] = correct_file(file)
+        elif prompt.startswith("wor"):
+            launch_ms_word_spell_check(file, get_file_language(file))
+        elif prompt.startswith("lib"):
+            launch_libreoffice_6_writer_spell_check(file, get_file_language(file))
 
-                previous = subtitle.get_time_code()
+    if use_result_cache:
+        update_result_cache(result_cache, all_files, results, correction_context)
+        save_json_file(result_cache_path, result_cache)
 
-            write_file(file, new_lines)
+    if DECISIONS:
+        append_json_lines_file(os.path.join(conf_root_path, DECISIONS_FILE_NAME), DECISIONS)
+        print(str(len(DECISIONS)) + " decisions queued, to review with : python -m Corrector.review")
 
-        except ValueError as err:
-            print(SHELL_COLOR_FAIL + "Parsing error : " + str(err) + SHELL_COLOR_END)
+    if is_line_cache_enabled() and prompt.startswith("scri"):
+        print("Line cache : " + str(get_line_cache_stats()))
 
-    elif prompt.startswith("wor"):
-        launch_ms_word_spell_check(file, current_language)
-    elif prompt.startswith("lib"):
-        launch_libreoffice_6_writer_spell_check(file, current_language)
+    if StringsUtils.conf_profile_fixers:
+        print_fixers_report()
+        if conf_profile_fixers_report:
+            export_fixers_report(conf_profile_fixers_report)
 
-end = datetime.datetime.now()
-print(end - start)
+    end = datetime.datetime.now()
+    print(end - start)
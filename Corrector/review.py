@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Reviews the decisions queued by a queue_decisions run, then applies every answer, one pass per file.
+
+python -m Corrector.review [decisions_file]
+"""
+
+import os
+import re
+import sys
+from Corrector.Models.Subtitle import Subtitle
+from Corrector.Utils.FileUtils import read_text_file, write_file, read_json_lines_file, append_json_lines_file
+from Corrector.Utils.StringsUtils import get_regex, apply_word_answer, apply_capital_i_answer, apply_settings, \
+    SHELL_COLOR_BOLD, SHELL_COLOR_WARNING, SHELL_COLOR_END
+from Corrector.Settings import Settings
+
+DECISIONS_FILE_NAME = ".stac_decisions.jsonl"
+ANSWERS_HELP = {"word": ":q ignore, :x / :x! trust (language / every language), or the replacement",
+                "capital_a": ":x switch with À, :q ignore",
+                "capital_i": ":x / :x! trust the I (language / every language), :q / :q! switch with l",
+                "number": ":x remove the space, :q ignore"}
+
+
+def ask_decision(decision):
+    """Prompts the answer of a queued decision. An empty answer keeps it queued.
+
+    :param decision: dict, with file, cue, language, kind, line, candidate and offset
+    :return: tuple of string, the answer and the register answer of a replacement
+    """
+    line = decision["line"].replace("\n", "")
+    offset = decision["offset"]
+    candidate = decision["candidate"]
+
+    print(SHELL_COLOR_BOLD + decision["file"] + " #" + str(decision["cue"]) + SHELL_COLOR_END + " : " +
+          line[:offset] + SHELL_COLOR_WARNING + candidate + SHELL_COLOR_END + line[offset + len(candidate):])
+    answer = input("    " + ANSWERS_HELP[decision["kind"]] + " : ")
+
+    register_answer = ""
+    if decision["kind"] == "word" and answer not in ["", ":q", ":x", ":x!"]:
+        register_answer = input("    Register? : ")
+
+    return answer, register_answer
+
+
+def locate_candidate(lines, decision):
+    """Finds the decision candidate in the corrected cue lines, the closest to its offset when queued.
+
+    :param lines: list of string, the corrected cue lines
+    :param decision: dict
+    :return: tuple of int, the line index and the candidate offset, or None
+    """
+    candidate = decision["candidate"]
+    is_word_char = get_regex(r"\w").match
+    regex = (r"\b" if is_word_char(candidate[:1]) else "") + re.escape(candidate) + \
+        (r"\b" if is_word_char(candidate[-1:]) else "")
+    located = None
+
+    for index, line in enumerate(lines):
+        for match in get_regex(regex).finditer(line):
+            distance = abs(match.start() - decision["offset"]) + (0 if line == decision["line"] else 1)
+            if located is None or distance < located[0]:
+                located = (distance, index, match.start())
+
+    return located and located[1:]
+
+
+def apply_decision(line, offset, decision, answer, register_answer):
+    """Applies an answer on the corrected line, and registers trusted words or misspells.
+
+    :param line: string, the corrected line, empty if the candidate was not found
+    :param offset: int, the candidate offset in this line
+    :param decision: dict
+    :param answer: string
+    :param register_answer: string
+    :return: string, the fixed line
+    """
+    candidate = decision["candidate"]
+
+    if decision["kind"] == "word":
+        line = apply_word_answer(line, candidate, answer, register_answer, decision["trusted_file"],
+                                 decision["language"])
+    elif decision["kind"] == "capital_i":
+        if apply_capital_i_answer(candidate, answer, decision["language"]) and line:
+            line = line[:offset] + "l" + line[offset + 1:]
+    elif decision["kind"] == "capital_a" and answer == ":x" and line:
+        line = line[:offset] + "À" + line[offset + 1:]
+    elif decision["kind"] == "number" and answer == ":x" and line:
+        line = line[:offset + 1] + line[offset + len(candidate):]
+
+    return line
+
+
+def review_file(file, answered_decisions):
+    """Applies every answer of a file, then saves it.
+
+    :param file: string, the subtitles file path
+    :param answered_decisions: list of tuple, decision, answer and register answer
+    """
+    subtitles = read_text_file(file, lambda srt_file: list(Subtitle.subtitles_from_stream(srt_file)))
+    subtitles_by_cue = {subtitle.get_number().strip(): subtitle for subtitle in subtitles}
+
+    for decision, answer, register_answer in answered_decisions:
+        subtitle = subtitles_by_cue.get(decision["cue"])
+        located = locate_candidate(subtitle.get_lines(), decision) if subtitle else None
+
+        if located is None:
+            print(SHELL_COLOR_WARNING + decision["candidate"] + " not found in " + file + " #" + str(decision["cue"]) +
+                  ", only registering the answer" + SHELL_COLOR_END)
+            apply_decision("", 0, decision, answer, register_answer)
+        else:
+            lines = subtitle.get_lines()
+            lines[located[0]] = apply_decision(lines[located[0]], located[1], decision, answer, register_answer)
+
+    lines = []
+    for subtitle in subtitles:
+        lines += subtitle.to_lines()
+        lines.append("\n")
+    write_file(file, lines)
+
+    return
+
+
+def review(decisions_path):
+    """Asks every queued decision, applies the answers file by file, and keeps unanswered decisions queued.
+
+    :param decisions_path: string, the JSONL decisions file path
+    """
+    decisions = read_json_lines_file(decisions_path)
+
+    if not decisions:
+        print("No decision queued in " + decisions_path)
+        return
+
+    answered_decisions = {}
+    pending_decisions = []
+
+    for decision in decisions:
+        answer, register_answer = ask_decision(decision)
+        if answer:
+            answered_decisions.setdefault(decision["file"], []).append((decision, answer, register_answer))
+        else:
+            pending_decisions.append(decision)
+
+    for file in answered_decisions:
+        if os.path.isfile(file):
+            review_file(file, answered_decisions[file])
+        else:
+            print(SHELL_COLOR_WARNING + "Missing file : " + file + SHELL_COLOR_END)
+
+    os.remove(decisions_path)
+    if pending_decisions:
+        append_json_lines_file(decisions_path, pending_decisions)
+
+    print(str(len(decisions) - len(pending_decisions)) + " decisions applied, " + str(len(pending_decisions)) +
+          " still queued")
+    return
+
+
+if __name__ == "__main__":
+    settings = Settings()
+    apply_settings(settings)
+    review(sys.argv[1] if len(sys.argv) > 1 else os.path.join(settings.get('root_path'), DECISIONS_FILE_NAME))
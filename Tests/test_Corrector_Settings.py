@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Corrector import Settings
+
+
+class TestSettings(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.ini")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get(self):
+        with open(self.path, 'w', encoding='utf-8') as config_file:
+            config_file.write("[DEPENDENCIES]\nms_word_2010_path = Winword.exe\n\n"
+                              "[PARAMETERS]\nfix_sdh_tags = true\nline_cache_size = 10\npipeline_depth =\n")
+
+        settings = Settings.Settings(self.path)
+        self.assertIsNone(settings.sections)
+        self.assertEqual(settings.get('ms_word_2010_path', "", "DEPENDENCIES"), "Winword.exe")
+        self.assertTrue(settings.get_bool('fix_sdh_tags'))
+        self.assertFalse(settings.get_bool('fix_3d_doubles'))
+        self.assertEqual(settings.get_int('line_cache_size'), 10)
+        self.assertEqual(settings.get_int('csv_flush_size', 1), 1)
+        self.assertEqual(settings.get_int('pipeline_depth', 4), 4)
+
+    def test_get_missing_file(self):
+        settings = Settings.Settings(self.path)
+        self.assertEqual(settings.get('root_path'), "")
+        self.assertTrue(settings.get_bool('result_cache', True))
+        self.assertEqual(settings.sections, {})
+
+    def test_get_path(self):
+        self.assertEqual(Settings.Settings(self.path).get_path(), self.path)
+
+        with patch.object(Settings, 'CONFIG_FILE_NAME', "missing.ini"):
+            self.assertEqual(Settings.Settings().get_path(), Settings.PROJECT_DIRECTORY + "missing.ini")
@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Corrector import main
+from Corrector.Utils import StringsUtils
+from Corrector.Settings import Settings
+
+FILES = {"movie[mis].srt": "1\n00:00:01,000 --> 00:00:02,000\n{\\an8}JOHN : 0h !\n\n",
+         "movie[fre].srt": "1\n00:00:01,000 --> 00:00:02,000\nIl a dit 3 , 5 A Paris\n\n"
+                           "2\n00:00:03,000 --> 00:00:04,000\n-Ia vie. . .\n\n",
+         "show[eng].srt": "1\n00:00:01,000 --> 00:00:02,000\nWhat ?  l'm here\n\n"}
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_files(self, name):
+        directory = os.path.join(self.directory.name, name)
+        os.mkdir(directory)
+
+        for file_name in FILES:
+            with open(os.path.join(directory, file_name), 'w', encoding='utf-8-sig') as srt_file:
+                srt_file.write(FILES[file_name])
+
+        return [os.path.join(directory, file_name) for file_name in FILES]
+
+    def read_files(self, files):
+        contents = []
+
+        for file in files:
+            with open(file, 'rb') as srt_file:
+                contents.append(srt_file.read())
+
+        return contents
+
+    def test_correct_files_pipelined(self):
+        serial_files = self.write_files("serial")
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True), patch('builtins.print'):
+            serial_results = {file: main.correct_file(file) for file in serial_files}
+
+            for depth in [1, 2, 5]:
+                files = self.write_files("pipelined" + str(depth))
+                results = main.correct_files_pipelined(files, depth)
+
+                self.assertEqual(self.read_files(files), self.read_files(serial_files))
+                self.assertEqual(list(results.values()), list(serial_results.values()))
+
+    def test_correct_files_pipelined_write_error(self):
+        files = self.write_files("write_error")
+        contents = self.read_files(files)
+        write_file_data = main.write_file_data
+
+        def failing_write(path, data):
+            if path == files[0]:
+                raise OSError("disk full")
+            write_file_data(path, data)
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True), patch('builtins.print'), \
+                patch.object(main, 'write_file_data', failing_write):
+            results = main.correct_files_pipelined(files, 2)
+
+        self.assertEqual(results[files[0]], "Writing error : disk full")
+        self.assertEqual(self.read_files(files)[0], contents[0])
+        self.assertTrue(results[files[2]].endswith(" subtitles"))
+        self.assertNotEqual(self.read_files(files)[2], contents[2])
+
+    def test_correct_files_in_parallel(self):
+        serial_files = self.write_files("serial")
+        files = self.write_files("parallel")
+        settings = Settings(os.path.join(self.directory.name, "missing.ini"))
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True), patch('builtins.print'):
+            serial_results = {file: main.correct_file(file) for file in serial_files}
+
+        # print is not patched : forked workers would inherit the mock
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = main.correct_files_in_parallel(files, 2, settings)
+
+        self.assertEqual(self.read_files(files), self.read_files(serial_files))
+        self.assertEqual([results[file] for file in files], list(serial_results.values()))
+
+        summary = output.getvalue().split(main.SHELL_COLOR_BOLD + "Summary" + main.SHELL_COLOR_END + "\n")[1]
+        self.assertTrue(summary.startswith(results[files[0]].ljust(20) + " " + files[0] + "\n" +
+                                           main.SHELL_COLOR_BOLD + files[0] + main.SHELL_COLOR_END + "\n"), summary)
+
+    def test_get_parallel_waves(self):
+        files = self.write_files("waves")
+        first_wave, second_wave = main.get_parallel_waves(files)
+
+        self.assertEqual(sorted(first_wave + second_wave), sorted(files))
+        for file in files:
+            if "[fre]" in file:
+                self.assertIn(file.replace("[fre]", "[mis]"), first_wave)
+                self.assertIn(file, second_wave)
+
+    def test_get_correction_context(self):
+        context = main.get_correction_context()
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True):
+            self.assertNotEqual(main.get_correction_context(), context)
+            self.assertEqual(main.get_correction_context(True), main.get_correction_context())
+        with patch.object(StringsUtils, 'conf_queue_decisions', True):
+            self.assertNotEqual(main.get_correction_context(), context)
+        self.assertEqual(main.get_correction_context(), context)
+        self.assertNotEqual(main.get_correction_context(True), context)
+
+    def test_result_cache_parallel_then_interactive(self):
+        files = self.write_files("parallel_cache")
+        settings = Settings(os.path.join(self.directory.name, "missing.ini"))
+        result_cache = {}
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', False):
+            parallel_context = main.get_correction_context(True)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = main.correct_files_in_parallel(files, 2, settings)
+            main.update_result_cache(result_cache, files, results, parallel_context)
+
+            # Prompts skipped by the workers are asked by the next interactive run
+            with patch('builtins.print'):
+                self.assertEqual(main.filter_cached_files(files, result_cache, main.get_correction_context()), files)
+                self.assertEqual(main.filter_cached_files(files, result_cache, main.get_correction_context(True)), [])
+
+    def test_filter_cached_files(self):
+        files = self.write_files("cache")
+        results = {file: "1 subtitles" for file in files}
+        result_cache = {}
+        main.update_result_cache(result_cache, files, results, "context")
+
+        with patch('builtins.print'), patch.object(main, 'get_md5', side_effect=AssertionError):
+            self.assertEqual(main.filter_cached_files(files, result_cache, "context"), [])
+        with patch('builtins.print'):
+            self.assertEqual(main.filter_cached_files(files, result_cache, "other context"), files)
+
+        os.utime(files[1], (0, 0))
+        with patch('builtins.print'):
+            self.assertEqual(main.filter_cached_files(files, result_cache, "context"), [])
+        self.assertEqual(result_cache[files[1]]["stat"], main.get_result_cache_stat(files[1]))
+
+        with open(files[0], 'a', encoding='utf-8') as srt_file:
+            srt_file.write("\n")
+        with patch('builtins.print'):
+            self.assertEqual(main.filter_cached_files(files, result_cache, "context"), files[:2])
+
+    def test_update_result_cache(self):
+        files = self.write_files("cache")
+        result_cache = {"deleted.srt": {}}
+
+        main.update_result_cache(result_cache, files, {file: "1 subtitles" for file in files}, "context")
+        self.assertEqual(sorted(result_cache), sorted(files))
+        self.assertEqual(result_cache[files[0]], main.get_result_cache_entry(files[0], "context"))
+        self.assertEqual(len(result_cache[files[1]]["stat"]), 2)
+
+        main.update_result_cache(result_cache, files[1:], {files[1]: "Parsing error : wrong file"}, "context")
+        self.assertEqual(list(result_cache), [files[2]])
+
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from Corrector import review
+from Corrector.Utils import FileUtils
+from Corrector.Utils import StringsUtils
+
+SRT_TEXT = "1\n00:00:01,000 --> 00:00:02,000\nAIbert est A Paris\n\n" \
+           "2\n00:00:03,000 --> 00:00:04,000\nIl a 1, 5\n\n"
+
+
+class TestReview(unittest.TestCase):
+
+    def test_locate_candidate(self):
+        decision = {"line": "Il a 1, 5 A Il\n", "candidate": "Il", "offset": 12}
+        self.assertEqual(review.locate_candidate(["Ils\n", "- Il a 1, 5 A Il\n"], decision), (1, 14))
+        self.assertEqual(review.locate_candidate(["Il a 1, 5 A Il\n"], decision), (0, 12))
+        self.assertIsNone(review.locate_candidate(["Ils\n"], decision))
+
+        decision = {"line": "Il a 1, 5 A Il\n", "candidate": ", ", "offset": 6}
+        self.assertEqual(review.locate_candidate(["- Il a 1, 5 A Il\n"], decision), (0, 8))
+
+    def test_apply_decision(self):
+        decision = {"kind": "number", "candidate": ", ", "language": "fr"}
+        self.assertEqual(review.apply_decision("Il a 1, 5\n", 6, decision, ":x", ""), "Il a 1,5\n")
+        self.assertEqual(review.apply_decision("Il a 1, 5\n", 6, decision, ":q", ""), "Il a 1, 5\n")
+
+        decision = {"kind": "capital_a", "candidate": "A", "language": "fr"}
+        self.assertEqual(review.apply_decision("A bientôt\n", 0, decision, ":x", ""), "À bientôt\n")
+
+        decision = {"kind": "capital_i", "candidate": "Ia", "language": "fr"}
+        with patch.object(review, 'apply_capital_i_answer', return_value=True):
+            self.assertEqual(review.apply_decision("Ia vie\n", 0, decision, ":q", ""), "la vie\n")
+            self.assertEqual(review.apply_decision("", 0, decision, ":q", ""), "")
+
+        decision = {"kind": "word", "candidate": "AIbert", "language": "fr", "trusted_file": "I_trusted.csv"}
+        self.assertEqual(review.apply_decision("AIbert\n", 0, decision, "Albert", ""), "Albert\n")
+
+    def test_review(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(StringsUtils, 'LETTERS_MAPS_DIRECTORY', directory + os.sep), \
+                patch.dict(StringsUtils.FILE_CACHE, clear=True), \
+                patch.dict(StringsUtils.CSV_PENDING_ROWS, clear=True), \
+                patch('builtins.input', side_effect=[":x", ":x", ""]), patch('builtins.print'):
+            srt_path = os.path.join(directory, "movie[fre].srt")
+            decisions_path = os.path.join(directory, review.DECISIONS_FILE_NAME)
+            with open(srt_path, 'w', encoding='utf-8-sig') as srt_file:
+                srt_file.write(SRT_TEXT)
+
+            context = {"file": srt_path, "language": "fr", "line": "AIbert est A Paris\n"}
+            decisions = [dict(context, cue="1", kind="word", candidate="AIbert", offset=0,
+                              trusted_file="I_trusted.csv"),
+                         dict(context, cue="1", kind="capital_a", candidate="A", offset=11),
+                         dict(context, cue="2", kind="number", line="Il a 1, 5\n", candidate=", ", offset=6)]
+            FileUtils.append_json_lines_file(decisions_path, decisions)
+
+            review.review(decisions_path)
+            StringsUtils.flush_csv_words()
+
+            with open(srt_path, encoding='utf-8-sig') as srt_file:
+                self.assertEqual(srt_file.read(), SRT_TEXT.replace(" A ", " À "))
+            with open(os.path.join(directory, "I_trusted.fr.csv"), encoding='utf-8-sig') as csv_file:
+                self.assertEqual(csv_file.read(), "AIbert\n")
+            self.assertEqual(FileUtils.read_json_lines_file(decisions_path), decisions[2:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+
+import codecs
+import os
+import tempfile
+import unittest
+from Corrector.Models.MappedSubtitle import *
+from Corrector.Utils.FileUtils import ENCODING_SAMPLE_SIZE
+from Tests.test_Models_Subtitle import SRT_SUBTITLES
+
+SRT_DATA = "".join(SRT_SUBTITLES).replace("\n", os.linesep).encode('utf-8')
+
+
+class TestMappedSubtitle(unittest.TestCase):
+
+    def test_subtitles_from_data(self):
+        expected = [subtitle.to_lines() for subtitle in Subtitle.subtitles_from_lines(SRT_SUBTITLES)]
+
+        for data in [SRT_DATA, codecs.BOM_UTF8 + SRT_DATA, b"Preamble\n\n" + SRT_DATA.replace(b"\r\n", b"\n")]:
+            subtitles = MappedSubtitle.subtitles_from_data(data)
+            self.assertEqual([subtitle.to_lines() for subtitle in subtitles], expected)
+
+        self.assertEqual(MappedSubtitle.subtitles_from_data(b""), [])
+        self.assertRaises(ValueError, MappedSubtitle.subtitles_from_data, "ÿþ\n".encode('utf-8') + SRT_DATA)
+
+    def test_get_line_ends(self):
+        other_line_end = b"\r\n" if os.linesep == "\n" else b"\n"
+
+        self.assertEqual(MappedSubtitle.get_line_ends(SRT_DATA), (False, True))
+        self.assertEqual(MappedSubtitle.get_line_ends(SRT_DATA + other_line_end), (False, False))
+        self.assertEqual(MappedSubtitle.get_line_ends(SRT_DATA + other_line_end + b"\r"), (True, False))
+        self.assertEqual(MappedSubtitle.get_line_ends(b"\r" + SRT_DATA), (True, False))
+        self.assertIsNone(MappedSubtitle.subtitles_from_data(SRT_DATA + b"\r"))
+
+    def test_is_untouched(self):
+        subtitles = MappedSubtitle.subtitles_from_data(SRT_DATA)
+
+        self.assertTrue(all(subtitle.is_untouched() for subtitle in subtitles))
+        self.assertEqual(b"".join(subtitle.to_data() for subtitle in subtitles), SRT_DATA)
+
+        subtitles[0].get_lines()[0] = "Fixed.\n"
+        subtitles[1].set_number("3\n")
+        subtitles[2].set_end(145000)
+        self.assertFalse(any(subtitle.is_untouched() for subtitle in subtitles))
+        self.assertEqual(subtitles[0].to_data(), Subtitle.to_data(subtitles[0]))
+
+    def test_is_untouched_not_canonical(self):
+        not_canonical = ["1\n00:02:17,440 --> 00:02:20,375\nLine.\n\n\n",
+                         "1\n00:02:17,440 --> 00:02:20,375\n\nLine.\n\n",
+                         "1\n00:02:17,440 --> 00:62:20,375\nLine.\n\n",
+                         "1\n00:02:17,440 --> 00:02:20,375\nLine."]
+
+        for text in not_canonical:
+            subtitle = MappedSubtitle.subtitles_from_data(text.replace("\n", os.linesep).encode('utf-8'))[0]
+            self.assertFalse(subtitle.is_untouched())
+
+        other_line_end = "\r\n" if os.linesep == "\n" else "\n"
+        data = "".join(SRT_SUBTITLES).replace("\n", other_line_end).encode('utf-8')
+        self.assertFalse(any(subtitle.is_untouched() for subtitle in MappedSubtitle.subtitles_from_data(data)))
+
+    def test_subtitles_from_file(self):
+        expected = [subtitle.to_lines() for subtitle in Subtitle.subtitles_from_lines(SRT_SUBTITLES)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.srt")
+
+            for data in [SRT_DATA, "".join(SRT_SUBTITLES).replace("\n", "\r").encode('utf-8'),
+                         "".join(SRT_SUBTITLES).encode('utf-16'), b""]:
+                with open(path, 'wb') as srt_file:
+                    srt_file.write(data)
+
+                subtitles = MappedSubtitle.subtitles_from_file(path)
+                self.assertEqual([subtitle.to_lines() for subtitle in subtitles], expected if data else [])
+
+            with open(path, 'wb') as srt_file:
+                srt_file.write(b"\n" * ENCODING_SAMPLE_SIZE +
+                               "".join(SRT_SUBTITLES).replace("1.", "é").encode('cp1252'))
+
+            subtitles = MappedSubtitle.subtitles_from_file(path)
+            self.assertEqual(subtitles[0].get_lines(), ["Test 1 line é\n", "Test 1 line 2.\n"])
@@ -115,6 +115,61 @@ class TestSubtitle(unittest.TestCase):
         with self.assertRaises(ValueError):
             Subtitle.subtitles_from_lines(BAD_ENCODING_SUBTITLE)
 
+    def test_subtitles_from_stream(self):
+        srt_parsed = Subtitle.subtitles_from_stream(iter(SRT_SUBTITLES))
+        self.assertEqual(next(srt_parsed).get_lines(), ["Test 1 line 1.\n", "Test 1 line 2.\n"])
+        self.assertEqual(next(srt_parsed).get_lines(), ["Test 2 line 1.\n"])
+        self.assertEqual(next(srt_parsed).get_lines(), ["Test 3 line 1.\n", "2.\n", "Test 3 line 3.\n"])
+        self.assertIsNone(next(srt_parsed, None))
+        self.assertEqual(len(list(Subtitle.subtitles_from_stream(SRT_SUBTITLES + ["4\n"]))), 3)
+        self.assertEqual(list(Subtitle.subtitles_from_stream([])), [])
+
+    def test_add_stream_line(self):
+        found_lines = []
+        Subtitle.add_stream_line(None, SRT_SUBTITLES[1], found_lines)
+        Subtitle.add_stream_line("\n", SRT_SUBTITLES[1], found_lines)
+        Subtitle.add_stream_line("Test\n", SRT_SUBTITLES[1], found_lines)
+        Subtitle.add_stream_line("Ignored\n", None, found_lines)
+        self.assertEqual(found_lines, ["Test\n"])
+        with self.assertRaises(ValueError):
+            Subtitle.add_stream_line(BAD_ENCODING_SUBTITLE[0], None, found_lines)
+
+    def test_milliseconds_from_match(self):
+        match = TIME_CODE_REGEX.match("01:02:17,440 --> 01:02:20,005\n")
+        self.assertEqual(Subtitle.milliseconds_from_match(match), (3737440, 3740005))
+
+    def test_time_from_milliseconds(self):
+        self.assertEqual(Subtitle.time_from_milliseconds(0), "00:00:00,000")
+        self.assertEqual(Subtitle.time_from_milliseconds(3740005), "01:02:20,005")
+
+    def test_non_canonical_time_code(self):
+        # Time codes are stored as milliseconds, so out of range fields are written back normalized
+        subtitle = Subtitle("1\n", "00:75:00,000 --> 00:75:61,500\n", ["Test.\n"])
+        self.assertEqual(subtitle.get_start(), 4500000)
+        self.assertEqual(subtitle.get_time_code(), "01:15:00,000 --> 01:16:01,500\n")
+
+    def test_time_index(self):
+        srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        starts, sorted_subtitles, longest_duration = Subtitle.time_index(list(reversed(srt_parsed)))
+        self.assertEqual(starts, [137440, 140476, 143741])
+        self.assertEqual(sorted_subtitles, srt_parsed)
+        self.assertEqual(longest_duration, 2935)
+        self.assertEqual(Subtitle.time_index([]), ([], [], 0))
+
+    def test_find_in_time_index(self):
+        srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        time_index = Subtitle.time_index(srt_parsed)
+        self.assertEqual(Subtitle.find_in_time_index(time_index, Subtitle(None, (140476, 142501), None)),
+                         [srt_parsed[1]])
+        self.assertEqual(Subtitle.find_in_time_index(time_index, Subtitle(None, (140476, 142500), None)), [])
+        self.assertEqual(Subtitle.find_in_time_index(time_index, Subtitle(None, (140476, 142500), None), 0),
+                         [srt_parsed[1]])
+        self.assertEqual(Subtitle.find_in_time_index(time_index, Subtitle(None, (140000, 143000), None), 0),
+                         [srt_parsed[0], srt_parsed[1]])
+        self.assertEqual(Subtitle.find_in_time_index(time_index, Subtitle(None, (142600, 143700), None), 0), [])
+        self.assertEqual(Subtitle.find_in_time_index(time_index, Subtitle(None, (142600, 143700), None), 100),
+                         [srt_parsed[1], srt_parsed[2]])
+
     def test_setters_getters(self):
         srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
         srt_subtitle_0 = Subtitle(None, None, None)
@@ -124,6 +179,25 @@ class TestSubtitle(unittest.TestCase):
         self.assertEqual(srt_parsed[0].get_number(), srt_subtitle_0.get_number())
         self.assertEqual(srt_parsed[0].get_time_code(), srt_subtitle_0.get_time_code())
         self.assertEqual(srt_parsed[0].get_lines(), srt_subtitle_0.get_lines())
+        self.assertEqual(srt_parsed[0].get_start(), 137440)
+        self.assertEqual(srt_parsed[0].get_end(), 140375)
+        srt_subtitle_0.set_start(1000)
+        srt_subtitle_0.set_end(2000)
+        self.assertEqual(srt_subtitle_0.get_time_code(), "00:00:01,000 --> 00:00:02,000\n")
+        self.assertIsNone(Subtitle(None, None, None).get_time_code())
+        with self.assertRaises(ValueError):
+            srt_subtitle_0.set_time_code("00:02:17 --> 00:02:20\n")
+
+    def test_has_same_time_code(self):
+        srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        self.assertTrue(srt_parsed[0].has_same_time_code(Subtitle(None, (137440, 140375), None)))
+        self.assertFalse(srt_parsed[0].has_same_time_code(srt_parsed[1]))
+
+    def test_overlaps(self):
+        srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        self.assertTrue(srt_parsed[0].overlaps(Subtitle(None, (140000, 150000), None)))
+        self.assertFalse(srt_parsed[0].overlaps(srt_parsed[1]))
+        self.assertTrue(srt_parsed[0].overlaps(srt_parsed[1], 200))
 
     def test_to_lines(self):
         srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
@@ -133,11 +207,20 @@ class TestSubtitle(unittest.TestCase):
             printed_lines += "\n"
         self.assertEqual(printed_lines, SRT_SUBTITLES)
 
+    def test_to_data(self):
+        srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        data = b"".join(subtitle.to_data() for subtitle in srt_parsed)
+        self.assertEqual(data, "".join(SRT_SUBTITLES).replace("\n", os.linesep).encode('utf-8'))
+
     def test_pretty_print(self):
         srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
         for i in range(0, len(srt_parsed)):
             self.assertEqual(srt_parsed[i].pretty_print(), SRT_SUBTITLES_PRETTY_PRINT[i])
 
+    def test_lt(self):
+        srt_parsed = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        self.assertEqual(sorted(reversed(srt_parsed)), srt_parsed)
+
 
 if __name__ == '__main__':
     unittest.main()
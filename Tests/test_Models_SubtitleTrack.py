@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+from Corrector.Models.SubtitleTrack import *
+from Tests.test_Models_Subtitle import SRT_SUBTITLES
+
+
+class TestSubtitleTrack(unittest.TestCase):
+
+    def test_from_subtitles(self):
+        subtitles = Subtitle.subtitles_from_lines(SRT_SUBTITLES)
+        track = SubtitleTrack.from_subtitles(subtitles)
+
+        self.assertEqual(len(track), 3)
+        self.assertEqual(list(track.numbers), [1, 2, 2])
+        self.assertEqual(track.text, "".join(line for subtitle in subtitles for line in subtitle.get_lines()))
+        self.assertEqual([cue.to_lines() for cue in track], [subtitle.to_lines() for subtitle in subtitles])
+
+    def test_from_stream(self):
+        track = SubtitleTrack.from_stream(iter(SRT_SUBTITLES))
+        self.assertEqual(track.get_lines(2), ["Test 3 line 1.\n", "2.\n", "Test 3 line 3.\n"])
+        self.assertEqual(len(SubtitleTrack.from_stream(iter([]))), 0)
+
+    def test_get_item(self):
+        track = SubtitleTrack.from_stream(iter(SRT_SUBTITLES))
+
+        self.assertEqual(track[-1].get_lines(), track[2].get_lines())
+        self.assertRaises(IndexError, track.__getitem__, 3)
+        self.assertFalse(hasattr(track[0], "__dict__"))
+
+    def test_cue(self):
+        cue = SubtitleTrack.from_stream(iter(SRT_SUBTITLES))[1]
+
+        self.assertEqual(cue.get_number(), "2\n")
+        self.assertEqual(cue.get_time_code(), "00:02:20,476 --> 00:02:22,501\n")
+        self.assertEqual((cue.get_start(), cue.get_end()), (140476, 142501))
+        self.assertEqual(cue.get_lines(), ["Test 2 line 1.\n"])
+        self.assertTrue(Subtitle.subtitles_from_lines(SRT_SUBTITLES)[1].has_same_time_code(cue))
+
+        subtitle = cue.to_subtitle()
+        subtitle.set_lines([])
+        self.assertEqual(cue.get_lines(), ["Test 2 line 1.\n"])
+
+    def test_to_subtitles(self):
+        subtitles = SubtitleTrack.from_stream(iter(SRT_SUBTITLES)).to_subtitles()
+        self.assertEqual([subtitle.to_lines() for subtitle in subtitles],
+                         [subtitle.to_lines() for subtitle in Subtitle.subtitles_from_lines(SRT_SUBTITLES)])
+
+    def test_lt(self):
+        track = SubtitleTrack.from_stream(iter(SRT_SUBTITLES))
+        self.assertTrue(track[0] < track[1])
+        self.assertEqual(sorted([track[2], track[0]])[0].get_number(), "1\n")
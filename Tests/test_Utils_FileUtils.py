@@ -0,0 +1,175 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import codecs
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+from unittest.mock import patch
+
+from Corrector.Utils import FileUtils
+
+CONTENT = "1\n00:00:01,000 --> 00:00:02,000\nÇa été\n\n"
+
+
+class TestFileUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.srt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_bytes(self, data):
+        with open(self.path, 'wb') as srt_file:
+            srt_file.write(data)
+
+    def read_bytes(self):
+        with open(self.path, 'rb') as srt_file:
+            return srt_file.read()
+
+    def test_open_file(self):
+        for encoding in ["utf-8-sig", "utf-8", "utf-16", "utf-16-le", "utf-16-be", "cp1252"]:
+            self.write_bytes(CONTENT.encode(encoding))
+            with FileUtils.open_file(self.path) as srt_file:
+                self.assertEqual(srt_file.read(), CONTENT, encoding)
+
+    def test_read_text_file(self):
+        content = "a" * FileUtils.ENCODING_SAMPLE_SIZE + CONTENT
+        self.write_bytes(content.encode("cp1252"))
+
+        self.assertEqual(FileUtils.detect_file_encoding(self.path), "utf-8-sig")
+        self.assertEqual(FileUtils.read_text_file(self.path, lambda srt_file: srt_file.read()), content)
+        self.assertEqual(FileUtils.get_file_text(self.path, True)[-2:], ["Ça été\n", "\n"])
+
+    def test_detect_file_encoding(self):
+        expected_encodings = {"utf-8-sig": "utf-8-sig", "utf-8": "utf-8-sig", "utf-16": "utf-16",
+                              "utf-16-le": "utf-16-le", "utf-16-be": "utf-16-be", "cp1252": "cp1252"}
+
+        for encoding, expected_encoding in expected_encodings.items():
+            self.write_bytes(CONTENT.encode(encoding))
+            self.assertEqual(FileUtils.detect_file_encoding(self.path), expected_encoding, encoding)
+
+        self.write_bytes(b"a" * 15 + "é".encode("utf-8") + b"\xe9")
+        self.assertEqual(FileUtils.detect_file_encoding(self.path, 16), "utf-8-sig")
+
+    def test_detect_encoding(self):
+        self.assertEqual(FileUtils.detect_encoding(codecs.BOM_UTF8 + b"\xe9"), "utf-8-sig")
+        self.assertEqual(FileUtils.detect_encoding(CONTENT.encode("cp1252")), "cp1252")
+        self.assertEqual(FileUtils.detect_encoding(b"a" * 15 + "é".encode("utf-8")[:1], 16), "utf-8-sig")
+        self.assertEqual(FileUtils.detect_encoding(b"a" * 14 + "é".encode("utf-8")[:1], 16), "cp1252")
+
+    def test_clean_space_in_filename(self):
+        self.write_bytes(b"")
+        path = os.path.join(self.directory.name, "my movie.srt")
+        os.rename(self.path, path)
+
+        self.assertEqual(FileUtils.clean_space_in_filename(path), os.path.join(self.directory.name, "my_movie.srt"))
+        self.assertEqual(os.listdir(self.directory.name), ["my_movie.srt"])
+        self.assertEqual(FileUtils.clean_space_in_filename(self.path), self.path)
+
+    def test_is_backup_file(self):
+        self.assertTrue(FileUtils.is_backup_file(FileUtils.get_bak_file_name(self.path)))
+        self.assertTrue(FileUtils.is_backup_file("movie (Avant SRAH 2.3).srt"))
+        self.assertFalse(FileUtils.is_backup_file(self.path))
+
+    def test_walk_files_with_type(self):
+        sub_directory = os.path.join(self.directory.name, "season", "episodes")
+        os.makedirs(sub_directory)
+        paths = [self.path, FileUtils.get_bak_file_name(self.path), os.path.join(self.directory.name, "notes.txt"),
+                 os.path.join(self.directory.name, "season", "episode.srt"), os.path.join(sub_directory, "deep.srt")]
+        for path in paths:
+            with open(path, 'wb'):
+                pass
+
+        self.assertEqual(sorted(FileUtils.walk_files_with_type(self.directory.name, 0, "srt")), [self.path])
+        self.assertEqual(sorted(FileUtils.walk_files_with_type(self.directory.name, 1, "srt")),
+                         sorted([paths[0], paths[3]]))
+        self.assertEqual(sorted(FileUtils.walk_files_with_type(self.directory.name, 2, "srt")),
+                         sorted([paths[0], paths[3], paths[4]]))
+        self.assertEqual(list(FileUtils.walk_files_with_type(self.directory.name, 2, "txt")), [paths[2]])
+
+    def test_walk_files_with_type_closed(self):
+        for name in ("first.srt", "second.srt"):
+            with open(os.path.join(self.directory.name, name), 'wb'):
+                pass
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            files = FileUtils.walk_files_with_type(self.directory.name, 0, "srt")
+            next(files)
+            files.close()
+            del files
+            gc.collect()
+        self.assertEqual([warning for warning in caught if issubclass(warning.category, ResourceWarning)], [])
+
+    def test_write_file(self):
+        self.assertTrue(FileUtils.write_file(self.path, ["Line\n"]))
+        self.assertEqual(self.read_bytes(), ("Line" + os.linesep).encode("utf-8-sig"))
+
+        self.assertFalse(FileUtils.write_file(self.path, ["Line\n"]))
+        self.assertTrue(FileUtils.write_file(self.path, ["Other\n"]))
+        self.assertEqual(os.listdir(self.directory.name), ["test.srt"])
+
+        with patch('os.fsync', side_effect=OSError("disk full")):
+            self.assertRaises(OSError, FileUtils.write_file, self.path, ["Lost\n"])
+        self.assertEqual(self.read_bytes(), ("Other" + os.linesep).encode("utf-8-sig"))
+        self.assertEqual(os.listdir(self.directory.name), ["test.srt"])
+
+    def test_write_file_data(self):
+        self.assertTrue(FileUtils.write_file_data(self.path, b"Line\r\n"))
+        self.assertEqual(self.read_bytes(), b"Line\r\n")
+        self.assertFalse(FileUtils.write_file_data(self.path, b"Line\r\n"))
+
+    def test_pickle_file(self):
+        self.assertEqual(FileUtils.load_pickle_file(self.path, {}), {})
+
+        FileUtils.save_pickle_file(self.path, {"files": [["Il"]]})
+        self.assertEqual(FileUtils.load_pickle_file(self.path, {}), {"files": [["Il"]]})
+        self.assertEqual(os.listdir(self.directory.name), ["test.srt"])
+
+        self.write_bytes(b"corrupted")
+        self.assertEqual(FileUtils.load_pickle_file(self.path, {}), {})
+
+    def test_ansi_to_utf8(self):
+        content = "a" * FileUtils.ENCODING_SAMPLE_SIZE + CONTENT + "Déjà\n"
+        self.write_bytes(content.encode("cp1252"))
+        FileUtils.ansi_to_utf8(self.path)
+
+        with open(self.path, 'r', encoding='utf-8-sig') as srt_file:
+            self.assertEqual(srt_file.read(), content)
+        self.assertEqual(os.listdir(self.directory.name), ["test.srt"])
+
+    @unittest.skipIf(os.name == "nt", "only read-only is kept on Windows")
+    def test_replaced_file_mode(self):
+        self.write_bytes(CONTENT.encode("cp1252"))
+        os.chmod(self.path, 0o644)
+
+        FileUtils.ansi_to_utf8(self.path)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+        FileUtils.save_pickle_file(self.path, {"files": []})
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o644)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,9 +17,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import json
+import os
+import random
+import re
+import tempfile
 import unittest
 from unittest.mock import patch
 
+from Corrector.Models.Subtitle import Subtitle
+from Corrector.Settings import Settings
 from Corrector.Utils import StringsUtils
 
 TEST_LINES = {}
@@ -171,6 +178,20 @@ populate_multi_line_test_dict()
 
 class TestStringsUtils(unittest.TestCase):
 
+    # region Settings
+
+    def test_apply_settings(self):
+        settings = Settings(os.path.join(os.path.dirname(__file__), "missing.ini"))
+        settings.sections = {"PARAMETERS": {"line_cache_size": "10", "fix_sdh_tags": "true"}}
+
+        with patch.multiple(StringsUtils, conf_line_cache_size=0, conf_fix_sdh_tags=False, conf_csv_flush_size=20):
+            StringsUtils.apply_settings(settings)
+            self.assertEqual(StringsUtils.conf_line_cache_size, 10)
+            self.assertTrue(StringsUtils.conf_fix_sdh_tags)
+            self.assertEqual(StringsUtils.conf_csv_flush_size, 1)
+
+    # endregion Settings
+
     # region Utils
 
     def test_remove_all_uppercase_words(self):
@@ -195,8 +216,306 @@ class TestStringsUtils(unittest.TestCase):
     #     print("results : " + str(results))
     #     self.assertEqual(lines, results)
 
+    def test_get_regex(self):
+        regex = StringsUtils.get_regex(r"\btest_get_regex\b")
+        self.assertIs(StringsUtils.get_regex(r"\btest_get_regex\b"), regex)
+        self.assertTrue(regex.search("a test_get_regex b"))
+
+    def test_get_regex_cache_stats(self):
+        stats = StringsUtils.get_regex_cache_stats()
+        StringsUtils.get_regex(r"\btest_get_regex_cache_stats\b")
+        StringsUtils.get_regex(r"\btest_get_regex_cache_stats\b")
+        new_stats = StringsUtils.get_regex_cache_stats()
+        self.assertEqual(new_stats["misses"], stats["misses"] + 1)
+        self.assertEqual(new_stats["hits"], stats["hits"] + 1)
+        self.assertEqual(new_stats["size"], stats["size"] + 1)
+
+    def test_find_words_with_char(self):
+        self.assertEqual(StringsUtils.find_words_with_char("Clean line\n", "I", "fr"), [])
+        self.assertEqual(StringsUtils.find_words_with_char("Il II IIs AIbert\n", "I", "fr"), ["IIs", "AIbert"])
+
+    def test_get_trusted_words_with_language(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file_path = os.path.join(directory, "I_trusted.csv")
+            StringsUtils.put_csv_word(csv_file_path, "Il", None)
+
+            trusted_words = StringsUtils.get_trusted_words_with_language(csv_file_path, "fr")
+            self.assertIsInstance(trusted_words, frozenset)
+            self.assertIs(StringsUtils.get_trusted_words_with_language(csv_file_path, "fr"), trusted_words)
+            self.assertEqual(trusted_words, {"Il", "II"})
+
+            StringsUtils.put_csv_word(os.path.join(directory, "I_trusted.fr.csv"), "Ils", None)
+            self.assertEqual(StringsUtils.get_trusted_words_with_language(csv_file_path, "fr"), {"Il", "Ils", "II"})
+            self.assertEqual(StringsUtils.get_trusted_words_with_language(csv_file_path, "eng"), {"Il", "II"})
+            StringsUtils.flush_csv_words()
+
+    def test_get_capital_i_lexicon(self):
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(StringsUtils, 'LETTERS_MAPS_DIRECTORY', directory + os.sep):
+            StringsUtils.put_csv_word(os.path.join(directory, "I_trusted.csv"), "Il", None)
+            StringsUtils.put_csv_word(os.path.join(directory, "l_trusted.fr.csv"), "la", None)
+
+            lexicon = StringsUtils.get_capital_i_lexicon("fr")
+            self.assertEqual(lexicon, {"Il": "I", "Ia": "l"})
+            self.assertEqual(StringsUtils.get_capital_i_lexicon("eng"), {"Il": "I"})
+
+            StringsUtils.put_csv_word(os.path.join(directory, "l_trusted.csv"), "ll", None)
+            StringsUtils.put_csv_word(os.path.join(directory, "I_trusted.fr.csv"), "Ia", None)
+            self.assertIs(StringsUtils.get_capital_i_lexicon("fr"), lexicon)
+            self.assertEqual(lexicon, {"Il": "I", "Ia": "I"})
+            self.assertEqual(StringsUtils.fix_capital_i_to_l("Ia vie, Il", "fr"), "Ia vie, Il")
+            StringsUtils.flush_csv_words()
+
+    def test_fix_capital_i_to_l_lexicon(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(StringsUtils, 'LETTERS_MAPS_DIRECTORY', directory + os.sep), \
+                patch.object(StringsUtils, 'prompt_user', return_value=":q") as prompt_user, \
+                patch.object(StringsUtils, 'get_capital_i_lexicon',
+                             wraps=StringsUtils.get_capital_i_lexicon) as get_capital_i_lexicon:
+            self.assertEqual(StringsUtils.fix_capital_i_to_l("Iu, Iu et Iu", "fr"), "lu, lu et lu")
+            self.assertEqual(prompt_user.call_count, 1)
+            self.assertEqual(get_capital_i_lexicon.call_count, 2)
+
+            self.assertEqual(StringsUtils.fix_capital_i_to_l("Iu, Iu", "fr"), "lu, lu")
+            self.assertEqual(get_capital_i_lexicon.call_count, 3)
+            StringsUtils.flush_csv_words()
+
+    def test_preload_strings_maps(self):
+        StringsUtils.preload_strings_maps(["fr"])
+        self.assertIn(StringsUtils.STRINGS_MAPS_DIRECTORY + "common_misspells.fr.csv", StringsUtils.FILE_CACHE)
+        self.assertIn(StringsUtils.LETTERS_MAPS_DIRECTORY + "I_trusted.csv", StringsUtils.FILE_CACHE)
+        misspells_file = StringsUtils.STRINGS_MAPS_DIRECTORY + "common_misspells.csv"
+        self.assertIn((misspells_file, "fr"), StringsUtils.MISSPELLS_CACHE)
+
+    def test_strings_maps_snapshot(self):
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(StringsUtils, 'STRINGS_MAPS_SNAPSHOT_PATH', os.path.join(directory, "snapshot.pickle")), \
+                patch.object(StringsUtils, 'conf_strings_maps_snapshot', True), \
+                patch.dict(StringsUtils.FILE_CACHE, clear=True), \
+                patch.dict(StringsUtils.TRUSTED_WORDS_CACHE, clear=True), \
+                patch.dict(StringsUtils.STRINGS_MAPS_SNAPSHOT_STATE, {"used": False}):
+            fingerprint = StringsUtils.get_strings_maps_stat_fingerprint()
+            self.assertFalse(StringsUtils.load_strings_maps_snapshot(fingerprint))
+
+            StringsUtils.preload_strings_maps(languages=())
+            self.assertTrue(os.path.isfile(StringsUtils.STRINGS_MAPS_SNAPSHOT_PATH))
+            files = dict(StringsUtils.FILE_CACHE)
+
+            StringsUtils.FILE_CACHE.clear()
+            StringsUtils.TRUSTED_WORDS_CACHE.clear()
+            self.assertTrue(StringsUtils.load_strings_maps_snapshot(fingerprint))
+            self.assertEqual(StringsUtils.FILE_CACHE, files)
+            csv_file_path = StringsUtils.LETTERS_MAPS_DIRECTORY + "I_trusted.csv"
+            trusted_words = StringsUtils.TRUSTED_WORDS_CACHE[(csv_file_path, "fr")][2]
+            self.assertIs(StringsUtils.get_trusted_words_with_language(csv_file_path, "fr"), trusted_words)
+            self.assertIn("Il", trusted_words)
+
+            fingerprint[1][2] += 1
+            self.assertFalse(StringsUtils.load_strings_maps_snapshot(fingerprint))
+
+            # Loaded on the first CSV file read, without preload
+            StringsUtils.FILE_CACHE.clear()
+            StringsUtils.TRUSTED_WORDS_CACHE.clear()
+            StringsUtils.STRINGS_MAPS_SNAPSHOT_STATE["used"] = False
+            with patch('csv.reader', side_effect=AssertionError):
+                self.assertEqual(StringsUtils.get_csv_words(csv_file_path), files[csv_file_path])
+            self.assertEqual(StringsUtils.FILE_CACHE, files)
+
+    def test_get_strings_maps_fingerprint(self):
+        fingerprint = StringsUtils.get_strings_maps_fingerprint()
+        self.assertEqual(StringsUtils.get_strings_maps_fingerprint(), fingerprint)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(StringsUtils, 'STRINGS_MAPS_DIRECTORY', directory + "/"), \
+                    patch.object(StringsUtils, 'LETTERS_MAPS_DIRECTORY', directory + "/"):
+                StringsUtils.put_csv_word(os.path.join(directory, "I_trusted.csv"), "Il", None)
+                StringsUtils.flush_csv_words()
+                empty_fingerprint = StringsUtils.get_strings_maps_fingerprint()
+                StringsUtils.put_csv_word(os.path.join(directory, "I_trusted.csv"), "Ils", None)
+                StringsUtils.flush_csv_words()
+                self.assertNotEqual(StringsUtils.get_strings_maps_fingerprint(), empty_fingerprint)
+                self.assertNotEqual(empty_fingerprint, fingerprint)
+
+    def test_get_misspells_engine(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file_path = os.path.join(directory, "misspells.csv")
+            StringsUtils.put_csv_word(csv_file_path, "Seinfelf", "Seinfeld")
+
+            engine = StringsUtils.get_misspells_engine(csv_file_path, "fr")
+            self.assertIs(StringsUtils.get_misspells_engine(csv_file_path, "fr"), engine)
+            self.assertTrue(engine[0].search("Seinfelf\n"))
+            self.assertFalse(engine[0].search("Raymonf\n"))
+
+            StringsUtils.put_csv_word(csv_file_path, "Raymonf", "Raymond")
+            engine = StringsUtils.get_misspells_engine(csv_file_path, "fr")
+            self.assertTrue(engine[0].search("Raymonf\n"))
+
+            StringsUtils.put_csv_word(os.path.join(directory, "misspells.fr.csv"), "Rockforf", "Rockford")
+            engine = StringsUtils.get_misspells_engine(csv_file_path, "fr")
+            self.assertTrue(engine[0].search("Rockforf\n"))
+            self.assertFalse(StringsUtils.get_misspells_engine(csv_file_path, "eng")[0].search("Rockforf\n"))
+            StringsUtils.flush_csv_words()
+
+    def test_get_cache_state(self):
+        words = ["a", "b"]
+        localized_words = []
+
+        self.assertEqual(StringsUtils.get_cache_state([words, localized_words], [words, localized_words], [2, 0]),
+                         "unchanged")
+        self.assertEqual(StringsUtils.get_cache_state([words, localized_words], [words, localized_words], [1, 0]),
+                         "extended")
+        self.assertEqual(StringsUtils.get_cache_state([list(words), localized_words], [words, localized_words], [2, 0]),
+                         "rebuilt")
+        self.assertEqual(StringsUtils.get_cache_state([words, localized_words], [words, localized_words], [3, 0]),
+                         "rebuilt")
+
+    def test_build_block_engine(self):
+        regexes = [r"\ba\b", r"\bb\b", r"\bc\b"]
+        rules = [(re.compile(regex), regex[2]) for regex in regexes]
+
+        regex, blocks = StringsUtils.build_block_engine(regexes, rules, 2)
+        self.assertTrue(regex.search("x c"))
+        self.assertFalse(regex.search("abc"))
+        self.assertEqual([block_rules for block_regex, block_rules in blocks], [rules[:2], rules[2:]])
+        self.assertTrue(blocks[1][0].search("c"))
+        self.assertFalse(blocks[1][0].search("a b"))
+        self.assertEqual(StringsUtils.build_block_engine([], [], 2), (None, []))
+
+    def test_get_letter_space_engine(self):
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(StringsUtils, 'LETTERS_MAPS_DIRECTORY', directory + os.sep):
+            StringsUtils.put_csv_word(os.path.join(directory, "f_space_upp.csv"), "bef ore", None)
+
+            regex, blocks = StringsUtils.get_letter_space_engine("f", "eng")
+            self.assertIs(StringsUtils.get_letter_space_engine("f", "eng")[0], regex)
+            self.assertTrue(regex.search("Bef ore !"))
+            self.assertFalse(regex.search("ref erral !"))
+            self.assertEqual(StringsUtils.fix_letter_followed_by_space("bef ore ref erral", "f", "eng"),
+                             "before ref erral")
+
+            StringsUtils.put_csv_word(os.path.join(directory, "f_space_plural.eng.csv"), "ref erral", None)
+            self.assertEqual(StringsUtils.fix_letter_followed_by_space("Bef ore ref errals", "f", "eng"),
+                             "Before referrals")
+            self.assertEqual(StringsUtils.fix_letter_followed_by_space("ref erral", "f", "fr"), "ref erral")
+            self.assertIsNone(StringsUtils.get_letter_space_engine("C", "eng")[0])
+            StringsUtils.flush_csv_words()
+
+    def test_put_csv_word(self):
+
+        with tempfile.TemporaryDirectory() as directory, patch.object(StringsUtils, 'conf_csv_flush_size', 3):
+            csv_file_path = os.path.join(directory, "trusted.csv")
+            version = StringsUtils.STRINGS_MAPS_STATE["version"]
+
+            StringsUtils.put_csv_word(csv_file_path, "Ils", None)
+            StringsUtils.put_csv_word(csv_file_path, "Ils", None)
+            StringsUtils.put_csv_word(csv_file_path, "Il", None)
+            self.assertEqual(StringsUtils.get_csv_words(csv_file_path), ["Ils", "Il"])
+            self.assertEqual(StringsUtils.STRINGS_MAPS_STATE["version"], version + 2)
+            self.assertFalse(os.path.exists(csv_file_path))
+
+            StringsUtils.put_csv_word(os.path.join(directory, "misspells.csv"), "Seinfelf", "Seinfeld")
+            self.assertEqual(StringsUtils.CSV_PENDING_ROWS, {})
+            with open(csv_file_path, encoding='utf-8-sig') as csv_file:
+                self.assertEqual(csv_file.read(), "Ils\nIl\n")
+
+    def test_flush_csv_words(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_file_path = os.path.join(directory, "misspells.csv")
+            StringsUtils.put_csv_word(csv_file_path, "Seinfelf", "Seinfeld")
+            StringsUtils.put_csv_word(csv_file_path, "Raymonf", "Raymond")
+            StringsUtils.flush_csv_words()
+            StringsUtils.flush_csv_words()
+
+            with open(csv_file_path, encoding='utf-8-sig') as csv_file:
+                self.assertEqual(csv_file.read(), "Seinfelf:Seinfeld\nRaymonf:Raymond\n")
+
+            trusted_file_path = os.path.join(directory, "trusted.csv")
+            for words in [["Ils", "Il"], ["Elle"]]:
+                for word in words:
+                    StringsUtils.put_csv_word(trusted_file_path, word, None)
+                StringsUtils.flush_csv_words()
+
+            with open(trusted_file_path, encoding='utf-8-sig') as csv_file:
+                self.assertEqual(csv_file.read().split(), StringsUtils.get_csv_words(trusted_file_path))
+
+    def test_prompt_user(self):
+        count = StringsUtils.PROMPT_STATS["count"]
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True):
+            self.assertEqual(StringsUtils.prompt_user("Found : ", ":q"), ":q")
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', False), patch('builtins.input', return_value=":x"):
+            self.assertEqual(StringsUtils.prompt_user("Found : ", ":q"), ":x")
+
+        self.assertEqual(StringsUtils.PROMPT_STATS["count"], count + 2)
+
+        decision = {"kind": "number", "line": "1, 5\n", "candidate": ", ", "offset": 1}
+        with patch.object(StringsUtils, 'conf_queue_decisions', True), patch.object(StringsUtils, 'DECISIONS', []), \
+                patch.dict(StringsUtils.DECISION_CONTEXT, {"file": "test.srt", "cue": "3", "language": "fr"}):
+            self.assertEqual(StringsUtils.prompt_user("Found : ", ":q", decision), ":q")
+            self.assertEqual(StringsUtils.DECISIONS, [{"file": "test.srt", "cue": "3", "language": "fr",
+                                                       "kind": "number", "line": "1, 5\n", "candidate": ", ",
+                                                       "offset": 1}])
+
+    def test_apply_word_answer(self):
+        with patch.object(StringsUtils, 'put_csv_word') as put_csv_word, patch('builtins.print'):
+            self.assertEqual(StringsUtils.apply_word_answer("AIbert AIbert\n", "AIbert", ":q", "", "I_trusted.csv",
+                                                            "fr"), "AIbert AIbert\n")
+            self.assertEqual(StringsUtils.apply_word_answer("AIbert\n", "AIbert", ":x", "", "I_trusted.csv", "fr"),
+                             "AIbert\n")
+            put_csv_word.assert_called_with(StringsUtils.LETTERS_MAPS_DIRECTORY + "I_trusted.fr.csv", "AIbert", None)
+
+            self.assertEqual(StringsUtils.apply_word_answer("AIbert AIbert\n", "AIbert", "Albert", ":x!",
+                                                            "I_trusted.csv", "fr"), "Albert Albert\n")
+            put_csv_word.assert_called_with(StringsUtils.STRINGS_MAPS_DIRECTORY + "common_misspells.csv", "AIbert",
+                                            "Albert")
+
     # endregion Utils
 
+    # region Profiling
+
+    def test_run_fixer(self):
+        with patch.object(StringsUtils, 'FIXERS_STATS', {}), patch.object(StringsUtils, 'conf_profile_fixers', True):
+            self.assertEqual(StringsUtils.run_fixer(StringsUtils.fix_degree_symbol, "10 °C\n"), "10°C\n")
+            StringsUtils.run_fixer(StringsUtils.fix_degree_symbol, "Clean line\n")
+            StringsUtils.run_fixer(StringsUtils.fix_empty_lines, ["Line\n", "\n"])
+            StringsUtils.run_fixer(StringsUtils.fix_letter_followed_by_space, "f oo\n", "f", "fr", name="letter f")
+
+            self.assertEqual(StringsUtils.FIXERS_STATS["fix_degree_symbol"][:2], [2, 1])
+            self.assertEqual(StringsUtils.FIXERS_STATS["fix_empty_lines"][:2], [1, 1])
+            self.assertEqual(sorted(StringsUtils.FIXERS_STATS), ["fix_degree_symbol", "fix_empty_lines", "letter f"])
+
+        with patch.object(StringsUtils, 'FIXERS_STATS', {}), patch.object(StringsUtils, 'conf_profile_fixers', False):
+            StringsUtils.run_fixer(StringsUtils.fix_degree_symbol, "10 °C\n")
+            self.assertEqual(StringsUtils.FIXERS_STATS, {})
+
+    def test_merge_fixers_stats(self):
+        with patch.object(StringsUtils, 'FIXERS_STATS', {"fix_numbers": [1, 0, 0.5]}):
+            StringsUtils.merge_fixers_stats({"fix_numbers": [2, 1, 0.25], "fix_quotes": [1, 1, 0.125]})
+            self.assertEqual(StringsUtils.FIXERS_STATS, {"fix_numbers": [3, 1, 0.75], "fix_quotes": [1, 1, 0.125]})
+
+    def test_get_fixers_report(self):
+        with patch.object(StringsUtils, 'FIXERS_STATS', {"fix_numbers": [3, 1, 0.75], "fix_quotes": [1, 1, 1.0]}):
+            self.assertEqual(StringsUtils.get_fixers_report(),
+                             [{"name": "fix_quotes", "calls": 1, "changed": 1, "seconds": 1.0},
+                              {"name": "fix_numbers", "calls": 3, "changed": 1, "seconds": 0.75}])
+
+    def test_export_fixers_report(self):
+        with patch.object(StringsUtils, 'FIXERS_STATS', {"fix_numbers": [3, 1, 0.75]}), \
+                tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "report.json")
+            StringsUtils.export_fixers_report(path)
+
+            with open(path, 'r', encoding='utf-8') as report_file:
+                self.assertEqual(json.load(report_file), StringsUtils.get_fixers_report())
+
+    # endregion Profiling
+
     # region Single-line
 
     def test_fix_accentuated_capital_a(self):
@@ -286,6 +605,11 @@ class TestStringsUtils(unittest.TestCase):
 
             self.assert_list_equals(corrected_line, key, "fix_common_misspells")
 
+    def test_fix_common_misspells_order(self):
+        # Chained misspells have to be applied in the CSV order : "lncroyable" => "Incoyable" => "Incroyable"
+        self.assertEqual(StringsUtils.fix_common_misspells("lncroyable. Iorsque\n", "fr"), "Incroyable. lorsque\n")
+        self.assertEqual(StringsUtils.fix_common_misspells("Clean line.\n", "fr"), "Clean line.\n")
+
     def test_fix_numbers(self):
         for key in TEST_LINES:
             corrected_line = []
@@ -313,6 +637,15 @@ class TestStringsUtils(unittest.TestCase):
 
             self.assert_list_equals(corrected_line, key, "fix_capital_i_to_l")
 
+    def test_apply_capital_i_answer(self):
+        with patch.object(StringsUtils, 'put_csv_word') as put_csv_word:
+            self.assertFalse(StringsUtils.apply_capital_i_answer("Ils", ":x", "fr"))
+            put_csv_word.assert_called_with(StringsUtils.LETTERS_MAPS_DIRECTORY + "I_trusted.fr.csv", "Ils", None)
+            self.assertTrue(StringsUtils.apply_capital_i_answer("Ia", ":q!", "fr"))
+            put_csv_word.assert_called_with(StringsUtils.LETTERS_MAPS_DIRECTORY + "l_trusted.csv", "la", None)
+            self.assertFalse(StringsUtils.apply_capital_i_answer("Ia", "", "fr"))
+            self.assertEqual(put_csv_word.call_count, 2)
+
     def test_fix_l_to_capital_i(self):
         for key in TEST_LINES:
             corrected_line = []
@@ -321,6 +654,17 @@ class TestStringsUtils(unittest.TestCase):
 
             self.assert_list_equals(corrected_line, key, "fix_l_to_capital_i")
 
+    def test_fix_l_between_uppercase(self):
+        self.assertEqual(StringsUtils.fix_l_between_uppercase("llAB lAlBC", True), "IIAB IAIBC")
+        self.assertEqual(StringsUtils.fix_l_between_uppercase("ABll ABlCl", False), "ABII ABICI")
+        self.assertEqual(StringsUtils.fix_l_between_uppercase("lA Al", True), "lA Al")
+
+    def test_group_thousands(self):
+        self.assertEqual(StringsUtils.group_thousands("1234"), "1234")
+        self.assertEqual(StringsUtils.group_thousands("12345"), "12 345")
+        self.assertEqual(StringsUtils.group_thousands("1234567"), "1234 567")
+        self.assertEqual(StringsUtils.group_thousands("12345678"), "12 345 678")
+
     def test_fix_acronyms(self):
         for key in TEST_LINES:
             corrected_line = []
@@ -430,6 +774,72 @@ class TestStringsUtils(unittest.TestCase):
         populate_single_line_test_dict()
         populate_multi_line_test_dict()
 
+    def test_get_gated_lines(self):
+        lines = ["Il a dit\n", "no\n", "", "'a\n", "b'", "c A\n"]
+
+        self.assertEqual(StringsUtils.get_gated_lines(re.compile(r"A|I"), lines), [0, 5])
+        self.assertEqual(StringsUtils.get_gated_lines(re.compile(r"'\s"), lines), [4])
+        self.assertEqual(StringsUtils.get_gated_lines(re.compile(r"z"), lines), [])
+
+    def test_fix_track(self):
+        subtitles = [Subtitle(str(index + 1) + "\n", "00:00:01,000 --> 00:00:02,000\n", TEST_LINES[key])
+                     for index, key in enumerate(sorted(TEST_LINES))]
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True), \
+                patch.object(StringsUtils, 'conf_line_cache_size', 0):
+            for language in ["fr", "eng"]:
+                expected_lines = [[StringsUtils.fix_single_line_errors(line, language) for line in subtitle.get_lines()]
+                                  for subtitle in subtitles]
+                track = [Subtitle(subtitle.number, "00:00:01,000 --> 00:00:02,000\n", list(subtitle.get_lines()))
+                         for subtitle in subtitles]
+                StringsUtils.fix_track(track, language)
+                self.assertEqual([subtitle.get_lines() for subtitle in track], expected_lines)
+
+    def test_fix_track_profile(self):
+        lines = ["Yes .\n", "1 0 0\n", "Il a dit\n", "No\n"]
+
+        with patch.object(StringsUtils, 'conf_auto_skip_everything', True), \
+                patch.object(StringsUtils, 'conf_line_cache_size', 0), \
+                patch.object(StringsUtils, 'conf_profile_fixers', True), patch('builtins.print'):
+            with patch.object(StringsUtils, 'FIXERS_STATS', {}):
+                for line in lines:
+                    StringsUtils.fix_single_line_errors(line, "eng")
+                expected_stats = {name: stats[:2] for name, stats in StringsUtils.FIXERS_STATS.items()}
+
+            with patch.object(StringsUtils, 'FIXERS_STATS', {}):
+                StringsUtils.fix_track([Subtitle("1\n", "00:00:01,000 --> 00:00:02,000\n", list(lines))], "eng")
+                self.assertEqual({name: stats[:2] for name, stats in StringsUtils.FIXERS_STATS.items()},
+                                 expected_stats)
+
+    def test_fix_single_line_errors_cache(self):
+        with patch.object(StringsUtils, 'conf_line_cache_size', 2), \
+                patch.object(StringsUtils, 'conf_auto_skip_everything', True), \
+                patch.object(StringsUtils, 'LINE_CACHE', StringsUtils.collections.OrderedDict()), \
+                patch.object(StringsUtils, 'LINE_CACHE_STATS', {"hits": 0, "misses": 0, "bypassed": 0}), \
+                patch('builtins.print'):
+
+            for line in ["Yes .\n", "Yes .\n", "What ?\n", "Yes .\n", "No .\n", "What ?\n", "1,5\n"]:
+                self.assertEqual(StringsUtils.fix_single_line_errors(line, "eng"),
+                                 StringsUtils.apply_single_line_fixes(line, "eng"))
+
+            version = StringsUtils.STRINGS_MAPS_STATE["version"]
+            self.assertEqual(list(StringsUtils.LINE_CACHE), [("No .\n", "eng", version), ("What ?\n", "eng", version)])
+            self.assertEqual(StringsUtils.get_line_cache_stats(),
+                             {"hits": 2, "misses": 4, "bypassed": 1, "size": 2, "hit_rate": 2 / 7})
+
+    def test_fix_single_line_errors_cache_profiled(self):
+        with patch.object(StringsUtils, 'conf_line_cache_size', 2), \
+                patch.object(StringsUtils, 'conf_profile_fixers', True), \
+                patch.object(StringsUtils, 'LINE_CACHE', StringsUtils.collections.OrderedDict()), \
+                patch.object(StringsUtils, 'FIXERS_STATS', {}), patch('builtins.print'):
+
+            for line in ["Yes .\n", "Yes .\n"]:
+                StringsUtils.fix_single_line_errors(line, "eng")
+
+            self.assertFalse(StringsUtils.is_line_cache_enabled())
+            self.assertEqual(len(StringsUtils.LINE_CACHE), 0)
+            self.assertEqual(StringsUtils.FIXERS_STATS["fix_common_errors"][0], 2)
+
     def assert_list_equals(self, corrected_lines, key, tag):
         if tag in key:
             self.assertListEqual(corrected_lines, RESULT_LINES[key])
@@ -437,5 +847,130 @@ class TestStringsUtils(unittest.TestCase):
             self.assertListEqual(corrected_lines, TEST_LINES[key])
 
 
+
+# region Fixpoint loops references, former fixers bodies
+
+def reference_fix_zero_to_o(string):
+    lower_case = StringsUtils.LOWER_CASE
+    upper_case = StringsUtils.UPPER_CASE
+
+    while re.search(r"" + lower_case + "0", string):
+        string = re.sub(r"(?<=" + lower_case + r")0", "o", string)
+
+    while re.search(r"" + upper_case + "0" + lower_case, string):
+        string = re.sub(r"(?<=" + upper_case + r")0(?=" + lower_case + r")", "o", string)
+
+    while re.search(r"" + lower_case + r"\s0" + lower_case, string):
+        string = re.sub(r"(?<=" + lower_case + r"\s)0(?=" + lower_case + r")", "o", string)
+
+    while re.search(r",\s0" + lower_case, string):
+        string = re.sub(r"(?<=,\s)0(?=" + lower_case + r")", "o", string)
+
+    while re.search(r"'0" + lower_case, string):
+        string = re.sub(r"(?<=')0(?=" + lower_case + r")", "o", string)
+
+    if "0" in string:
+        print(StringsUtils.SHELL_COLOR_WARNING + "Zero in : " + string[:-1] + StringsUtils.SHELL_COLOR_END)
+
+    return string
+
+
+def reference_fix_capital_i_to_l(string, language):
+    """Former fix_capital_i_to_l, with auto_skip_everything : its prompt branch is never reached."""
+    lower_case = StringsUtils.LOWER_CASE
+    upper_case = StringsUtils.UPPER_CASE
+    letters_maps_directory = StringsUtils.LETTERS_MAPS_DIRECTORY
+
+    while re.search(r"" + lower_case + "I", string):
+        string = re.sub(r"(?<=" + lower_case + r")I", "l", string)
+
+    while re.search(r"" + upper_case + "I" + lower_case, string):
+        string = re.sub(r"(?<=" + upper_case + r")I(?=" + lower_case + r")", "l", string)
+
+    matches = list(re.finditer(r"\bI.*?\b", string))
+    prompt_results = []
+
+    for result in matches:
+        trusted_capital_i_words = StringsUtils.get_csv_words_with_language(letters_maps_directory + "I_trusted.csv",
+                                                                           language)
+        trusted_l_words = StringsUtils.get_csv_words_with_language(letters_maps_directory + "l_trusted.csv", language)
+
+        if string[result.start():result.end()] in trusted_capital_i_words:
+            prompt_results.append(False)
+        elif "l" + string[result.start() + 1:result.end()] in trusted_l_words:
+            prompt_results.append(True)
+        else:
+            prompt_results.append(False)
+
+    for i in reversed(range(0, len(prompt_results))):
+        if prompt_results[i]:
+            string = string[:matches[i].start()] + "l" + string[matches[i].start() + 1:]
+
+    return string
+
+
+def reference_fix_l_to_capital_i(string):
+    lower_case_consonant = StringsUtils.LOWER_CASE_CONSONNANT
+    upper_case = StringsUtils.UPPER_CASE
+
+    while re.search(upper_case + r"l+" + upper_case, string):
+        string = re.sub(r"(?<=" + upper_case + r")l(?=l*" + upper_case + r")", "I", string)
+
+    regex_l_before_uppercase = r"l(?=" + upper_case + r"{2})"
+    while re.search(regex_l_before_uppercase, string):
+        string = re.sub(regex_l_before_uppercase, "I", string)
+
+    regex_l_after_two_uppercase = r"(?<=" + upper_case + r"{2})l"
+    while re.search(regex_l_after_two_uppercase, string):
+        string = re.sub(regex_l_after_two_uppercase, "I", string)
+
+    string = re.sub(r"\bl(?=" + lower_case_consonant + r"{2}|n|m)", "I", string)
+
+    roman_numbers_matches = [(m.start(0), m.end(0)) for m in re.finditer(r"\b[MLDCVXIl]{3,}\b", string)]
+    for match in roman_numbers_matches:
+        string = string[:match[0]] + string[match[0]:match[1]].replace("l", "I") + string[match[1]:]
+
+    return string
+
+
+def reference_thousands_loop(string):
+    while re.search(r"\b\d+\d\d\d\d\b", string):
+        string = re.sub(r"\b(\d+\d)(\d\d\d)\b", r"\1 \2", string)
+
+    return string
+
+
+def random_strings(alphabet, count, seed):
+    generator = random.Random(seed)
+    return ["".join(generator.choice(alphabet) for _ in range(generator.randint(0, 24))) + "\n" for _ in range(count)]
+
+# endregion Fixpoint loops references, former fixers bodies
+
+
+class TestStringsUtilsFixpointRewrites(unittest.TestCase):
+    """Compares single-pass rewrites with the former fixers, fixpoint loops included, on random strings."""
+
+    def test_fix_zero_to_o(self):
+        with patch('builtins.print'):
+            for string in random_strings("aA0 ,'éÉB1", 3000, 8):
+                self.assertEqual(StringsUtils.fix_zero_to_o(string), reference_fix_zero_to_o(string), string)
+
+    def test_fix_capital_i_to_l(self):
+        with patch('builtins.print'), patch('builtins.input', side_effect=AssertionError), \
+                patch.object(StringsUtils, 'conf_auto_skip_everything', True):
+            for string in random_strings("aAIl ,'éÉB", 3000, 8) + ["Il est Ià\n", "Ils Iui\n"]:
+                self.assertEqual(StringsUtils.fix_capital_i_to_l(string, "fr"),
+                                 reference_fix_capital_i_to_l(string, "fr"), string)
+
+    def test_fix_l_to_capital_i(self):
+        for string in random_strings("aAIlL ,'éÉBmnC", 3000, 8) + ["lls XlV lci\n"]:
+            self.assertEqual(StringsUtils.fix_l_to_capital_i(string), reference_fix_l_to_capital_i(string), string)
+
+    def test_group_thousands(self):
+        for string in random_strings("1234567890 a.", 3000, 8):
+            self.assertEqual(re.sub(r"\b\d{5,}\b", lambda match: StringsUtils.group_thousands(match.group()), string),
+                             reference_thousands_loop(string), string)
+
+
 if __name__ == '__main__':
     unittest.main()
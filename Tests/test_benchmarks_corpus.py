@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import unittest
+
+from Corrector.Models.Subtitle import Subtitle
+from benchmarks import corpus
+
+
+class TestBenchmarksCorpus(unittest.TestCase):
+
+    def test_add_ocr_errors(self):
+        generator = corpus.random.Random(0)
+        self.assertEqual(corpus.add_ocr_errors(generator, "hello", 0), "hello")
+        self.assertNotEqual([corpus.add_ocr_errors(generator, "follow.", 1) for _ in range(0, 20)], ["follow."] * 20)
+
+    def test_generate_srt_lines(self):
+        lines = corpus.generate_srt_lines("fr", 50, seed=3)
+
+        self.assertEqual(lines, corpus.generate_srt_lines("fr", 50, seed=3))
+        self.assertNotEqual(lines, corpus.generate_srt_lines("fr", 50, seed=4))
+        self.assertNotEqual(lines, corpus.generate_srt_lines("eng", 50, seed=3))
+
+        subtitles = Subtitle.subtitles_from_lines(lines)
+        self.assertEqual(len(subtitles), 50)
+        self.assertTrue(all(subtitles[i] < subtitles[i + 1] for i in range(0, 49)))
+
+    def test_format_time(self):
+        self.assertEqual(corpus.format_time(3723004), "01:02:03,004")
+
+
+if __name__ == '__main__':
+    unittest.main()
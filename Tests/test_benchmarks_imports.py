@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os
+import unittest
+
+from benchmarks import imports
+
+
+class TestBenchmarksImports(unittest.TestCase):
+
+    def test_measure_import(self):
+        result = imports.measure_import()
+
+        self.assertGreater(result["seconds"], 0)
+        self.assertEqual(result["loaded"], [])
+
+    @unittest.skipIf(os.environ.get("CI"), "import times of shared CI runners are not reliable")
+    def test_import_time_budget(self):
+        result = imports.run_import()
+
+        # Twice the budget, so a slow machine doesn't fail the suite
+        self.assertLess(result["seconds"], imports.IMPORT_TIME_BUDGET * 2)
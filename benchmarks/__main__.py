@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import argparse              # command line
+import json                  # reports
+import platform              # python version
+import subprocess            # git revision
+from benchmarks.end_to_end import run_end_to_end
+from benchmarks.imports import run_import
+from benchmarks.memory import run_memory
+from benchmarks.stages import run_stages
+
+
+def get_revision():
+    """Current git commit, to tell reports apart.
+
+    :return: string, or None out of a git repository
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(count, error_rate, seed, repeat):
+    """Runs every benchmark.
+
+    :return: dict, JSON serializable
+    """
+    return {"revision": get_revision(),
+            "python": platform.python_version(),
+            "parameters": {"count": count, "error_rate": error_rate, "seed": seed, "repeat": repeat},
+            "stages": run_stages(count, error_rate, seed, repeat),
+            "end_to_end": run_end_to_end(count, error_rate, seed, repeat),
+            "import": run_import(repeat),
+            "memory": run_memory(count, error_rate, seed)}
+
+
+def print_report(report, previous_report=None):
+    """Prints lines per second of every benchmark, and the speedup since the previous report, if any.
+
+    :param report: dict
+    :param previous_report: dict, or None
+    """
+    print("Revision " + str(report["revision"]) + ", Python " + report["python"] + ", " + str(report["parameters"]))
+
+    rows = [(language + " " + name, report["stages"][language][name], previous_report
+             and previous_report["stages"].get(language, {}).get(name))
+            for language in sorted(report["stages"]) for name in report["stages"][language]]
+    rows.append(("end to end", report["end_to_end"], previous_report and previous_report["end_to_end"]))
+
+    for name, result, previous_result in rows:
+        row = "%-20s %12.0f lines/s" % (name, result["lines_per_second"])
+        if previous_result:
+            row += "   x%.2f" % (result["lines_per_second"] / previous_result["lines_per_second"])
+        print(row)
+
+    for name in sorted(report["memory"]):
+        row = "%-20s %12.0f bytes/cue" % ("memory " + name, report["memory"][name]["bytes_per_cue"])
+        if previous_report and name in previous_report.get("memory", {}):
+            row += "   x%.2f" % (report["memory"][name]["bytes_per_cue"] /
+                                 previous_report["memory"][name]["bytes_per_cue"])
+        print(row)
+
+    import_result = report["import"]
+    row = "%-20s %12.1f ms, budget %.0f ms" % ("import", import_result["seconds"] * 1000,
+                                              import_result["budget"] * 1000)
+    if import_result["seconds"] > import_result["budget"]:
+        row += "   OVER BUDGET"
+    if import_result["loaded"]:
+        row += "   loads " + ", ".join(import_result["loaded"])
+    print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Synthetic subtitles benchmarks.")
+    parser.add_argument("--count", type=int, default=500, help="subtitles count of each language file")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="OCR error probability of each word")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs count, only the best one is kept")
+    parser.add_argument("--output", help="JSON report path")
+    parser.add_argument("--compare", help="previous JSON report path, from another commit")
+    args = parser.parse_args()
+
+    previous_report = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as report_file:
+            previous_report = json.load(report_file)
+        if previous_report["parameters"] != {"count": args.count, "error_rate": args.error_rate,
+                                             "seed": args.seed, "repeat": args.repeat}:
+            print("Warning : previous report was run with " + str(previous_report["parameters"]))
+
+    report = build_report(args.count, args.error_rate, args.seed, args.repeat)
+    print_report(report, previous_report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import os                    # corpus directory
+import random                # deterministic generator
+
+
+WORDS = {"fr": ["Il", "elle", "le", "la", "les", "un", "une", "pas", "pour", "avec", "dans", "mais", "nous", "vous",
+                "allez", "long", "loin", "lire", "voilà", "déjà", "été", "très", "où", "ça", "aller", "oui", "non",
+                "Paris", "bonjour", "merci", "toujours", "demain", "maison", "Olivier", "Isabelle", "voiture"],
+         "eng": ["I", "you", "he", "she", "it", "the", "a", "all", "will", "tell", "look", "follow", "hello", "yes",
+                 "no", "what", "where", "London", "little", "I'll", "I'm", "well", "still", "only", "Isaac", "Lily",
+                 "office", "often", "after", "if", "of", "car", "tomorrow", "house", "thanks", "always"],
+         "ger": ["Ich", "ist", "ein", "eine", "nicht", "Hallo", "Liebe", "Leben", "will", "alle", "viel", "Berlin",
+                 "Haus", "Auto", "morgen", "immer", "danke", "bitte", "Welt", "Zeit", "Frau", "Mann", "offen",
+                 "fallen", "hell", "Ilse", "Lukas", "wohl", "Film", "Wolf", "Zoll", "Wagen", "Gold", "Vogel"]}
+PUNCTUATION = [".", ".", ",", "?", "!", "...", ":"]
+SDH_TAGS = ["[MUSIC]", "(SIGHS)", "[DOOR OPENS]", "(LAUGHS)", "♪", "MAN:", "JOHN :", "WOMAN:"]
+OCR_ERRORS = [("l", "I"), ("I", "l"), ("o", "0"), ("O", "0"), ("f", "f "), ("à", "a"), ("é", "e"), (".", " ."),
+              ("'", "’"), ("?", " ?"), ("A", "À")]
+LANGUAGE_SUFFIXES = {"fr": "[fre]", "eng": "[eng]", "ger": "[ger]"}
+
+
+def add_ocr_errors(generator, word, error_rate):
+    """Randomly applies OCR errors on the given word.
+
+    :param generator: random.Random
+    :param word: string
+    :param error_rate: float, the probability of an error on each word
+    :return: string
+    """
+    if generator.random() >= error_rate:
+        return word
+
+    right, wrong = generator.choice(OCR_ERRORS)
+    if right not in word:
+        return word
+
+    return word.replace(right, wrong, 1)
+
+
+def generate_line(generator, language, error_rate):
+    """Random sentence, with OCR errors.
+
+    :param generator: random.Random
+    :param language: string, fr, eng or ger
+    :param error_rate: float, the probability of an error on each word
+    :return: string, with its line feed
+    """
+    words = [add_ocr_errors(generator, generator.choice(WORDS[language]), error_rate)
+             for _ in range(generator.randint(2, 8))]
+
+    if generator.random() < error_rate / 2:
+        words.append(str(generator.randint(10000, 9999999)))
+
+    return " ".join(words) + generator.choice(PUNCTUATION) + "\n"
+
+
+def generate_cue_lines(generator, language, error_rate, sdh_rate, italic_rate, doubles_rate):
+    """Random subtitle text lines.
+
+    :param generator: random.Random
+    :param language: string, fr, eng or ger
+    :param error_rate: float, the probability of an OCR error on each word
+    :param sdh_rate: float, the probability of a SDH tag on each line
+    :param italic_rate: float, the probability of italic lines
+    :param doubles_rate: float, the probability of 3D doubled lines
+    :return: list of string
+    """
+    lines = [generate_line(generator, language, error_rate) for _ in range(generator.randint(1, 2))]
+
+    if len(lines) > 1 and generator.random() < 0.3:
+        lines = ["- " + line for line in lines]
+
+    for i in range(0, len(lines)):
+        if generator.random() < sdh_rate:
+            lines[i] = generator.choice(SDH_TAGS) + " " + lines[i]
+
+    if generator.random() < italic_rate:
+        lines[0] = "<i>" + lines[0]
+        lines[-1] = lines[-1][:-1] + "</i>\n"
+
+    if generator.random() < doubles_rate:
+        lines = lines + lines
+
+    return lines
+
+
+def generate_srt_lines(language, count, error_rate=0.1, sdh_rate=0.05, italic_rate=0.1, doubles_rate=0.02, seed=0):
+    """Deterministic synthetic subtitles file content.
+
+    :param language: string, fr, eng or ger
+    :param count: int, the subtitles count
+    :param error_rate: float, the probability of an OCR error on each word
+    :param sdh_rate: float, the probability of a SDH tag on each line
+    :param italic_rate: float, the probability of italic lines
+    :param doubles_rate: float, the probability of 3D doubled lines
+    :param seed: int, the same seed always gives the same content
+    :return: list of string
+    """
+    generator = random.Random(str(seed) + language)
+    lines = []
+    start = 0
+
+    for number in range(1, count + 1):
+        start += generator.randint(500, 4000)
+        end = start + generator.randint(800, 5000)
+        lines.append(str(number) + "\n")
+        lines.append(format_time(start) + " --> " + format_time(end) + "\n")
+        lines += generate_cue_lines(generator, language, error_rate, sdh_rate, italic_rate, doubles_rate)
+        lines.append("\n")
+        start = end
+
+    return lines
+
+
+def format_time(milliseconds):
+    """SRT time code.
+
+    :param milliseconds: int
+    :return: string
+    """
+    return "%02d:%02d:%02d,%03d" % (milliseconds // 3600000, milliseconds // 60000 % 60, milliseconds // 1000 % 60,
+                                    milliseconds % 1000)
+
+
+def write_corpus(directory, count, error_rate=0.1, seed=0):
+    """Writes one synthetic subtitles file per language.
+
+    :param directory: string, created if needed
+    :param count: int, the subtitles count in each file
+    :param error_rate: float, the probability of an OCR error on each word
+    :param seed: int
+    :return: list of string, the written file paths
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+
+    for language in sorted(LANGUAGE_SUFFIXES):
+        path = os.path.join(directory, "benchmark" + LANGUAGE_SUFFIXES[language] + ".srt")
+        with open(path, 'w', encoding='utf-8-sig') as srt_file:
+            srt_file.writelines(generate_srt_lines(language, count, error_rate, seed=seed))
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import shutil                # corpus cleaning
+import tempfile              # corpus directory
+import time                  # timers
+from Corrector.Settings import Settings
+from benchmarks import corpus
+from benchmarks.stages import prepare_strings_utils, silenced
+
+
+def run_end_to_end(count, error_rate=0.1, seed=0, repeat=3):
+    """Times the whole correction of every language synthetic file, from parsing to writing.
+
+    :param count: int, the subtitles count of each file
+    :param error_rate: float, the probability of an OCR error on each word
+    :param seed: int
+    :param repeat: int, the runs count, only the best one is kept
+    :return: dict, with lines, seconds and lines per second
+    """
+    from Corrector import main
+
+    main.configure(Settings())
+    prepare_strings_utils()
+    directory = tempfile.mkdtemp(prefix="sub-titles-benchmark-")
+    times = []
+    lines_count = 0
+
+    try:
+        for _ in range(0, repeat):
+            files = corpus.write_corpus(directory, count, error_rate, seed)
+            lines_count = sum(len(corpus.generate_srt_lines(language, count, error_rate, seed=seed))
+                              for language in corpus.LANGUAGE_SUFFIXES)
+
+            start = time.perf_counter()
+            with silenced():
+                for file in files:
+                    main.correct_file(file)
+            times.append(time.perf_counter() - start)
+    finally:
+        shutil.rmtree(directory)
+
+    seconds = min(times)
+    return {"lines": lines_count, "seconds": seconds, "lines_per_second": lines_count / seconds}
@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import json                  # child process report
+import os                    # project directory
+import subprocess            # fresh interpreters
+import sys                   # current interpreter
+import tempfile              # foreign working directory
+
+
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIBRARY_MODULE = "Corrector.Utils.StringsUtils"
+IMPORT_TIME_BUDGET = 0.1
+DEFERRED_MODULES = ["tkinter", "subprocess", "configparser", "concurrent.futures"]
+IMPORT_SCRIPT = """import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {deferred!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import(module=LIBRARY_MODULE):
+    """Times the import of a module in a fresh interpreter, out of the project directory, without any config.ini.
+
+    :param module: string, the module to import
+    :return: dict, with seconds and the already loaded deferred modules
+    """
+    script = IMPORT_SCRIPT.format(module=module, deferred=DEFERRED_MODULES)
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_DIRECTORY,
+                                                                         os.environ.get("PYTHONPATH")])))
+
+    with tempfile.TemporaryDirectory() as directory:
+        output = subprocess.check_output([sys.executable, "-c", script], cwd=directory, env=environment)
+
+    return json.loads(output.decode())
+
+
+def run_import(repeat=3):
+    """Times the correction engine import, as a library.
+
+    :param repeat: int, the runs count, only the best one is kept
+    :return: dict, with seconds, the budget, and the deferred modules loaded anyway
+    """
+    results = [measure_import() for _ in range(0, repeat)]
+    seconds = min(result["seconds"] for result in results)
+
+    return {"module": LIBRARY_MODULE, "seconds": seconds, "budget": IMPORT_TIME_BUDGET,
+            "loaded": results[0]["loaded"]}
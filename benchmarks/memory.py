@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import gc                    # stable measures
+import io                    # in memory files
+import tracemalloc           # allocated memory
+from Corrector.Models.Subtitle import Subtitle
+from Corrector.Models.SubtitleTrack import SubtitleTrack
+from benchmarks import corpus
+
+
+def measure_memory(parse, text):
+    """Memory still allocated by a parsed file, once parsing is done.
+
+    :param parse: function, from an opened file to the parsed content
+    :param text: string, the file content
+    :return: int, bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        stream = io.StringIO(text)
+        stream.readline()
+        stream.seek(0)
+        start = tracemalloc.get_traced_memory()[0]
+        content = parse(stream)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    del content
+    return size
+
+
+def run_memory(count, error_rate=0.1, seed=0):
+    """Memory per cue of every language synthetic file, as a list of Subtitle and as a SubtitleTrack.
+
+    :param count: int, the subtitles count of each file
+    :param error_rate: float, the probability of an OCR error on each word
+    :param seed: int
+    :return: dict, container name to bytes per cue
+    """
+    parsers = [("subtitles", lambda stream: list(Subtitle.subtitles_from_stream(stream))),
+               ("track", SubtitleTrack.from_stream)]
+    sizes = {name: 0 for name, _ in parsers}
+    cues_count = 0
+
+    for language in sorted(corpus.LANGUAGE_SUFFIXES):
+        text = "".join(corpus.generate_srt_lines(language, count, error_rate, seed=seed))
+        cues_count += count
+
+        for name, parse in parsers:
+            sizes[name] += measure_memory(parse, text)
+
+    return {name: {"bytes_per_cue": size / cues_count} for name, size in sizes.items()}
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+# -*-coding:utf8 -*
+
+# sub-titles-auto-correct
+# Copyright (C) 2014-2018
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import contextlib            # silenced prints
+import io                    # silenced prints
+import sys                   # silenced prints
+import time                  # timers
+from Corrector.Models.Subtitle import Subtitle
+from Corrector.Models.MappedSubtitle import MappedSubtitle
+from Corrector.Settings import Settings
+from Corrector.Utils import StringsUtils
+from benchmarks import corpus
+
+
+LINE_CACHE_BENCHMARK_SIZE = 10000
+
+
+@contextlib.contextmanager
+def silenced():
+    """Swallows every print of the fixers, that would be timed too."""
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+
+
+def prepare_strings_utils():
+    """Reads config.ini, disables every prompt and the line memo, and loads StringsMaps,
+    so only the fixes themselves are timed : with the memo, every run but the first would time memo hits."""
+    StringsUtils.apply_settings(Settings())
+    StringsUtils.conf_auto_skip_everything = True
+    StringsUtils.conf_line_cache_size = 0
+    StringsUtils.preload_strings_maps()
+
+
+def best_time(function, repeat):
+    """Best wall time of several runs, the least disturbed by the system.
+
+    :param function: callable, without parameters
+    :param repeat: int, the runs count
+    :return: float, seconds
+    """
+    times = []
+
+    for _ in range(0, repeat):
+        start = time.perf_counter()
+        with silenced():
+            function()
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+# region Stages
+
+
+def parse_stage(srt_lines, language):
+    return Subtitle.subtitles_from_lines(srt_lines)
+
+
+def multi_line_stage(srt_lines, language):
+    for subtitle in Subtitle.subtitles_from_lines(srt_lines):
+        StringsUtils.fix_multi_line_errors(subtitle.get_lines())
+
+
+def single_line_stage(srt_lines, language):
+    for subtitle in Subtitle.subtitles_from_lines(srt_lines):
+        for line in subtitle.get_lines():
+            StringsUtils.fix_single_line_errors(line, language)
+
+
+def single_line_cached_stage(srt_lines, language):
+    """single_line, with a line memo of LINE_CACHE_BENCHMARK_SIZE lines, emptied first :
+    only the lines repeated in the file are memo hits."""
+    StringsUtils.LINE_CACHE.clear()
+    StringsUtils.conf_line_cache_size = LINE_CACHE_BENCHMARK_SIZE
+
+    try:
+        single_line_stage(srt_lines, language)
+    finally:
+        StringsUtils.conf_line_cache_size = 0
+        StringsUtils.LINE_CACHE.clear()
+
+
+def track_stage(srt_lines, language):
+    StringsUtils.fix_track(Subtitle.subtitles_from_lines(srt_lines), language)
+
+
+def to_lines_stage(srt_lines, language):
+    for subtitle in Subtitle.subtitles_from_lines(srt_lines):
+        subtitle.to_lines()
+
+
+def parse_data_stage(srt_lines, language):
+    return MappedSubtitle.subtitles_from_data("".join(srt_lines).encode('utf-8'))
+
+
+def to_data_stage(srt_lines, language):
+    for subtitle in MappedSubtitle.subtitles_from_data("".join(srt_lines).encode('utf-8')):
+        subtitle.to_data()
+
+
+# endregion Stages
+
+
+STAGES = [("parse", parse_stage),
+          ("multi_line", multi_line_stage),
+          ("single_line", single_line_stage),
+          ("single_line_cached", single_line_cached_stage),
+          ("track", track_stage),
+          ("to_lines", to_lines_stage),
+          ("parse_data", parse_data_stage),
+          ("to_data", to_data_stage)]
+
+
+def run_stages(count, error_rate=0.1, seed=0, repeat=3):
+    """Times every stage, on each language synthetic file.
+    Every stage but parse also parses its input again : parse time has to be subtracted to compare them.
+
+    :param count: int, the subtitles count of each file
+    :param error_rate: float, the probability of an OCR error on each word
+    :param seed: int
+    :param repeat: int, the runs count of each stage, only the best one is kept
+    :return: dict, language to stage name to seconds and lines per second
+    """
+    prepare_strings_utils()
+    results = {}
+
+    for language in sorted(corpus.LANGUAGE_SUFFIXES):
+        srt_lines = corpus.generate_srt_lines(language, count, error_rate, seed=seed)
+        results[language] = {}
+
+        for name, stage in STAGES:
+            seconds = best_time(lambda: stage(srt_lines, language), repeat)
+            results[language][name] = {"seconds": seconds, "lines_per_second": len(srt_lines) / seconds}
+
+    return results